@@ -3,14 +3,30 @@ Job Application Tracker
 A Streamlit app for tracking job applications with Supabase backend
 """
 
+import importlib
 import streamlit as st
-from pages import add_application, view_applications, dashboard, login, signup
-from utils.database import SupabaseClient
+from utils.database import get_db_client
 from utils.logger_config import setup_logger
 from utils.auth import init_session_state, is_authenticated, logout_user
 
 logger = setup_logger()
 
+# Page name -> module, imported on first visit so that anonymous visitors on the
+# Login page never load pandas, plotly or the company search stack
+PAGES = {
+    "Login": "pages.login",
+    "Signup": "pages.signup",
+    "Dashboard": "pages.dashboard",
+    "Add Application": "pages.add_application",
+    "View Applications": "pages.view_applications",
+    "Import Applications": "pages.import_applications",
+}
+
+
+def load_page(name: str):
+    """Import a page module on first use; later calls return the already-loaded module"""
+    return importlib.import_module(PAGES[name])
+
 st.set_page_config(
     page_title="Job Application Tracker",
     page_icon=":briefcase:",
@@ -78,15 +94,15 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 def main():
-    if 'db_client' not in st.session_state:
-        try:
-            st.session_state.db_client = SupabaseClient()
-            logger.info("Database client initialized")
-        except Exception as e:
-            st.error(f"Failed to initialize database connection: {str(e)}")
-            logger.error(f"Database initialization error: {str(e)}")
-            st.stop()
+    try:
+        # Shared across sessions; only user identity lives in session state
+        st.session_state.db_client = get_db_client()
+    except Exception as e:
+        st.error(f"Failed to initialize database connection: {str(e)}")
+        logger.error(f"Database initialization error: {str(e)}")
+        st.stop()
     
+    st.session_state.db_client.log_cache_stats()
     init_session_state()
     
     if 'page' not in st.session_state:
@@ -119,7 +135,7 @@ def main():
         
         page = st.sidebar.radio(
             "Select Page",
-            ["Dashboard", "Add Application", "View Applications"],
+            ["Dashboard", "Add Application", "View Applications", "Import Applications"],
             index=0
         )
         
@@ -137,16 +153,7 @@ def main():
             st.session_state.page = "Login"
             st.rerun()
     
-    if page == "Login":
-        login.show()
-    elif page == "Signup":
-        signup.show()
-    elif page == "Dashboard":
-        dashboard.show()
-    elif page == "Add Application":
-        add_application.show()
-    elif page == "View Applications":
-        view_applications.show()
+    load_page(page).show()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,86 @@
+"""
+Login throughput through the bounded bcrypt pool
+Simulates many sessions verifying passwords at once and reports logins per second, latency
+percentiles and how many attempts were turned away with AuthBusyError:
+
+    python -m benchmarks.auth_throughput --logins 200 --sessions 32 --rounds 10
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from types import SimpleNamespace
+import bcrypt
+from utils import auth
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark and print a summary, returns the measured figures"""
+    parser = argparse.ArgumentParser(description="Measure login throughput through the bcrypt pool")
+    parser.add_argument("--logins", type=int, default=200, help="password checks in total")
+    parser.add_argument("--sessions", type=int, default=32, help="concurrent sessions issuing them")
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost factor of the stored hashes")
+    args = parser.parse_args(argv)
+
+    streamlit = auth.st
+    auth.st = SimpleNamespace(secrets={"auth": {"bcrypt_rounds": args.rounds}})
+    try:
+        return _run(args)
+    finally:
+        auth.st = streamlit
+
+
+def _run(args) -> dict:
+    stored = auth.hash_password("correct horse battery staple")
+
+    # Baseline: the same checks one after another on the calling thread, as before the pool
+    began = time.perf_counter()
+    for _ in range(max(1, args.logins // 10)):
+        bcrypt.checkpw(b"correct horse battery staple", stored.encode("utf-8"))
+    serial_rate = max(1, args.logins // 10) / (time.perf_counter() - began)
+
+    latencies, busy, lock = [], [0], threading.Lock()
+    per_session = [args.logins // args.sessions + (i < args.logins % args.sessions) for i in range(args.sessions)]
+
+    def session(count):
+        for _ in range(count):
+            started = time.perf_counter()
+            try:
+                auth.verify_password("correct horse battery staple", stored)
+            except auth.AuthBusyError:
+                with lock:
+                    busy[0] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=session, args=(count,)) for count in per_session]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+
+    results = {
+        "serial_per_second": round(serial_rate, 1),
+        "pooled_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else 0.0,
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "busy": busy[0]
+    }
+    print(f"{args.logins} logins from {args.sessions} sessions at cost {args.rounds} "
+          f"({auth.AUTH_WORKERS} workers, {auth.AUTH_MAX_PENDING} pending max)")
+    for name, value in results.items():
+        print(f"  {name}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Import cost of the Login path against the full app, measured with `python -X importtime`
+Each run is a fresh interpreter; the report lists total import time and the slowest packages the
+app's modules pull in directly:
+
+    python -m benchmarks.cold_start --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "login": ["utils.database", "utils.auth", "pages.login"],
+    "all_pages": ["utils.database", "utils.auth", "pages.login", "pages.signup", "pages.dashboard",
+                  "pages.add_application", "pages.view_applications", "pages.import_applications"],
+}
+
+
+def _import_times(modules: list) -> tuple:
+    """Total import microseconds from one fresh interpreter, and cumulative microseconds per direct dependency"""
+    script = "; ".join(f"import {name}" for name in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    total, dependencies = 0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        # Nested imports are indented two spaces per level under their parent
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            total += int(cumulative)
+        elif depth == 1:
+            dependencies[name.strip()] = int(cumulative)
+    return total, dependencies
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark and print a summary, returns the measured figures"""
+    parser = argparse.ArgumentParser(description="Measure import time of the Login path against every page")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per scenario, median is reported")
+    parser.add_argument("--top", type=int, default=5, help="slowest direct dependencies to list")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for scenario, modules in SCENARIOS.items():
+        runs = [_import_times(modules) for _ in range(args.runs)]
+        results[f"{scenario}_ms"] = round(statistics.median(total for total, _ in runs) / 1000, 1)
+        slowest = sorted(runs[-1][1].items(), key=lambda item: item[1], reverse=True)[:args.top]
+        print(f"{scenario}: {results[f'{scenario}_ms']} ms")
+        for name, micros in slowest:
+            print(f"  {name}: {micros / 1000:.1f} ms")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Dashboard aggregates on synthetic applications: the vectorized engine against a per-application loop
+Uses the same generator and reference loop as tests/test_analytics.py, checks both agree, then
+reports the best time of several runs for each:
+
+    python -m benchmarks.dashboard_aggregates --applications 100000
+"""
+
+import argparse
+import time
+from utils.analytics import compute_dashboard_aggregates
+from tests.test_analytics import random_dataset, reference_aggregates
+
+
+def _best_of(runs: int, fn, *args) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        began = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - began)
+    return best
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark and print a summary, returns the measured figures"""
+    parser = argparse.ArgumentParser(description="Time compute_dashboard_aggregates against a per-application loop")
+    parser.add_argument("--applications", type=int, default=100000, help="synthetic applications to aggregate")
+    parser.add_argument("--runs", type=int, default=3, help="timed runs per implementation, best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    applications, history = random_dataset(args.seed, args.applications)
+    if compute_dashboard_aggregates(applications, history) != reference_aggregates(applications, history):
+        raise SystemExit("vectorized and reference aggregates disagree")
+
+    vectorized = _best_of(args.runs, compute_dashboard_aggregates, applications, history)
+    loop = _best_of(args.runs, reference_aggregates, applications, history)
+    results = {
+        "vectorized_ms": round(vectorized * 1000, 1),
+        "loop_ms": round(loop * 1000, 1),
+        "speedup": round(loop / vectorized, 2)
+    }
+    print(f"{args.applications} applications, {sum(len(events) for events in history.values())} history events")
+    for name, value in results.items():
+        print(f"  {name}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Dashboard status-history load time against application count
+Builds the {application_id: [events]} map the dashboard needs, once with one get_status_history()
+request per application as before and once with get_status_history_bulk(), over the fake
+status_history table from tests/test_database.py with a fixed latency per request:
+
+    python -m benchmarks.dashboard_load --applications 100 500 1500 --latency-ms 5
+"""
+
+import argparse
+import time
+from tests.test_database import FakeStatusHistory, history_client
+from utils.constants import STATUS_HISTORY_PAGE_SIZE
+
+
+def _timed(table, load) -> tuple:
+    table.requests.clear()
+    began = time.perf_counter()
+    load()
+    return time.perf_counter() - began, len(table.requests)
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark and print a summary, returns the measured figures per application count"""
+    parser = argparse.ArgumentParser(description="Time the dashboard's status-history load against application count")
+    parser.add_argument("--applications", type=int, nargs="+", default=[100, 500, 1500], help="application counts to load")
+    parser.add_argument("--events", type=int, default=3, help="status_history rows per application")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="simulated round trip per request")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print(f"{args.events} events per application, {args.latency_ms} ms per request")
+    for count in args.applications:
+        table = FakeStatusHistory(max_rows=STATUS_HISTORY_PAGE_SIZE, latency=args.latency_ms / 1000)
+        ids = list(range(1, count + 1))
+        for application_id in ids:
+            table.add(application_id, args.events)
+        db = history_client(table)
+
+        per_app, per_app_requests = _timed(table, lambda: {i: db.get_status_history(i) for i in ids})
+        bulk, bulk_requests = _timed(table, lambda: db.get_status_history_bulk(ids))
+        results[count] = {
+            "per_application_ms": round(per_app * 1000, 1),
+            "per_application_requests": per_app_requests,
+            "bulk_ms": round(bulk * 1000, 1),
+            "bulk_requests": bulk_requests
+        }
+        print(f"  {count} applications: per-application {results[count]['per_application_ms']} ms "
+              f"({per_app_requests} requests), bulk {results[count]['bulk_ms']} ms ({bulk_requests} requests)")
+    return results
+
+
+if __name__ == "__main__":
+    main()
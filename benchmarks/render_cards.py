@@ -0,0 +1,67 @@
+"""
+Timeline HTML for a page of application cards: the cached renderer against the old per-card builder
+Uses the card generator and frozen old builder from tests/test_rendering.py and reports the best
+time of several runs, cold (caches cleared first) and warm (a rerun of the same page):
+
+    python -m benchmarks.render_cards --cards 1000
+"""
+
+import argparse
+import time
+from utils import rendering
+from tests.test_rendering import old_timeline, random_cards
+
+
+def _best_of(runs: int, fn, before=None) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        if before:
+            before()
+        began = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - began)
+    return best
+
+
+def _clear_caches():
+    rendering._render_timeline.cache_clear()
+    rendering.render_timeline_stage.cache_clear()
+
+
+def main(argv=None) -> dict:
+    """Run the benchmark and print a summary, returns the measured figures"""
+    parser = argparse.ArgumentParser(description="Time timeline rendering for a page of cards")
+    parser.add_argument("--cards", type=int, default=1000, help="cards on the page")
+    parser.add_argument("--runs", type=int, default=5, help="timed runs per variant, best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    cards = random_cards(args.seed, args.cards)
+    if any(rendering.render_timeline(*card) != old_timeline(*card) for card in cards):
+        raise SystemExit("cached and old timelines differ")
+
+    def old_page():
+        for card in cards:
+            old_timeline(*card)
+
+    def cached_page():
+        for card in cards:
+            rendering.render_timeline(*card)
+
+    old = _best_of(args.runs, old_page)
+    cold = _best_of(args.runs, cached_page, before=_clear_caches)
+    warm = _best_of(args.runs, cached_page)
+    results = {
+        "old_ms": round(old * 1000, 2),
+        "cached_cold_ms": round(cold * 1000, 2),
+        "cached_warm_ms": round(warm * 1000, 2),
+        "distinct_timelines": rendering._render_timeline.cache_info().currsize
+    }
+    print(f"{args.cards} cards")
+    for name, value in results.items():
+        print(f"  {name}: {value}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
 -- SQL Script for Job Tracker Database
 
--- Drop existing tables
+-- Drop existing views and tables
+DROP VIEW IF EXISTS stale_applications;
+DROP TABLE IF EXISTS daily_activity;
+DROP TABLE IF EXISTS user_metrics;
 DROP TABLE IF EXISTS status_history;
 DROP TABLE IF EXISTS applications;
 DROP TABLE IF EXISTS jobs;
 DROP TABLE IF EXISTS companies;
 DROP TABLE IF EXISTS users;
 
+-- Extensions
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create tables
 
 -- Table: users
@@ -34,6 +40,7 @@ CREATE TABLE IF NOT EXISTS jobs (
     job_type VARCHAR(20) CHECK (job_type IN ('Full-time', 'Part-time', 'Internship', 'Contract', 'Other')),
     location VARCHAR(100),
     posted_date DATE,
+    search_text TEXT,
     UNIQUE(company_id, title)
 );
 
@@ -56,13 +63,585 @@ CREATE TABLE IF NOT EXISTS status_history (
     notes TEXT
 );
 
+-- Table: user_metrics
+-- Per-user dashboard counters, kept current by the triggers below.
+-- weekday_counts is indexed by ISO day of week (1 = Monday) and, like the
+-- date range, only counts submitted (non-Saved) applications.
+CREATE TABLE IF NOT EXISTS user_metrics (
+    user_id INTEGER PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    saved_count INTEGER NOT NULL DEFAULT 0,
+    applied_count INTEGER NOT NULL DEFAULT 0,
+    interview_count INTEGER NOT NULL DEFAULT 0,
+    offer_count INTEGER NOT NULL DEFAULT 0,
+    rejected_count INTEGER NOT NULL DEFAULT 0,
+    weekday_counts INTEGER[] NOT NULL DEFAULT '{0,0,0,0,0,0,0}',
+    first_date DATE,
+    last_date DATE,
+    response_days_sum INTEGER NOT NULL DEFAULT 0,
+    response_days_count INTEGER NOT NULL DEFAULT 0
+);
+
+-- Table: daily_activity
+-- Per-user count of status history events by day and status, kept current by the triggers below.
+-- Buckets that drop to zero are deleted, so only days with activity have rows.
+CREATE TABLE IF NOT EXISTS daily_activity (
+    user_id INTEGER NOT NULL REFERENCES users(user_id) ON DELETE CASCADE ON UPDATE CASCADE,
+    day DATE NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    event_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, day, status)
+);
+
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_applications_user_id ON applications(user_id);
 CREATE INDEX IF NOT EXISTS idx_applications_job_id ON applications(job_id);
 CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(current_status);
 CREATE INDEX IF NOT EXISTS idx_applications_date ON applications(status_changed_date);
+CREATE INDEX IF NOT EXISTS idx_applications_user_page ON applications(user_id, status_changed_date DESC, application_id DESC);
 CREATE INDEX IF NOT EXISTS idx_status_history_app_id ON status_history(application_id);
 CREATE INDEX IF NOT EXISTS idx_status_history_date ON status_history(status_date);
+-- Staleness index: a user's applications in one status, longest waiting first
+CREATE INDEX IF NOT EXISTS idx_applications_staleness ON applications(user_id, current_status, status_changed_date, application_id);
+CREATE INDEX IF NOT EXISTS idx_jobs_job_type ON jobs(job_type);
+CREATE INDEX IF NOT EXISTS idx_jobs_search_text_trgm ON jobs USING gin (search_text gin_trgm_ops);
+
+-- Create views
+
+-- View: stale_applications
+-- Pending (Applied or Interview) applications and how long each has waited, read through idx_applications_staleness.
+-- days_waiting is computed on read because CURRENT_DATE can't be stored in a generated column.
+CREATE OR REPLACE VIEW stale_applications AS
+SELECT
+    a.application_id,
+    a.user_id,
+    a.current_status,
+    a.status_changed_date,
+    CURRENT_DATE - a.status_changed_date AS days_waiting,
+    j.title,
+    c.name AS company_name,
+    c.logo_url
+FROM applications a
+JOIN jobs j ON j.job_id = a.job_id
+JOIN companies c ON c.company_id = j.company_id
+WHERE a.current_status IN ('Applied', 'Interview');
+
+-- Create functions
+
+-- Function: application_applied_date
+-- Latest 'Applied' history date of an application, optionally ignoring one history row.
+CREATE OR REPLACE FUNCTION application_applied_date(p_application_id INTEGER, p_exclude_history_id INTEGER DEFAULT NULL)
+RETURNS DATE
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT MAX(status_date)
+    FROM status_history
+    WHERE application_id = p_application_id
+      AND status = 'Applied'
+      AND history_id IS DISTINCT FROM p_exclude_history_id;
+$$;
+
+-- Function: get_dashboard_aggregates
+-- Returns every raw aggregate the dashboard needs in one JSON payload, read from user_metrics.
+-- Must stay in sync with compute_aggregates() in utils/analytics.py.
+CREATE OR REPLACE FUNCTION get_dashboard_aggregates(p_user_id INTEGER)
+RETURNS JSON
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT json_build_object(
+        'by_status', json_build_object(
+            'Saved', COALESCE(m.saved_count, 0),
+            'Applied', COALESCE(m.applied_count, 0),
+            'Interview', COALESCE(m.interview_count, 0),
+            'Offer', COALESCE(m.offer_count, 0),
+            'Rejected', COALESCE(m.rejected_count, 0)
+        ),
+        'weekday_counts', (
+            SELECT json_object_agg(d.day_name, COALESCE(m.weekday_counts[d.day_number], 0) ORDER BY d.day_number)
+            FROM (VALUES (1, 'Monday'), (2, 'Tuesday'), (3, 'Wednesday'), (4, 'Thursday'),
+                         (5, 'Friday'), (6, 'Saturday'), (7, 'Sunday')) AS d(day_number, day_name)
+        ),
+        'first_date', m.first_date,
+        'last_date', m.last_date,
+        'response_days_sum', COALESCE(m.response_days_sum, 0),
+        'response_days_count', COALESCE(m.response_days_count, 0),
+        -- A minimum over a changing set can't be maintained by counters, so read it from the index
+        'oldest_pending_applied', (
+            SELECT MIN(application_applied_date(a.application_id))
+            FROM applications a
+            WHERE a.user_id = p_user_id AND a.current_status = 'Applied'
+        )
+    )
+    FROM (SELECT p_user_id AS user_id) u
+    LEFT JOIN user_metrics m ON m.user_id = u.user_id;
+$$;
+
+-- Function: apply_application_metrics
+-- Adds (p_sign = 1) or removes (p_sign = -1) one application's contribution to user_metrics.
+CREATE OR REPLACE FUNCTION apply_application_metrics(
+    p_user_id INTEGER,
+    p_application_id INTEGER,
+    p_status VARCHAR,
+    p_changed_date DATE,
+    p_applied_date DATE,
+    p_sign INTEGER
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_submitted BOOLEAN := p_status <> 'Saved';
+    v_responded BOOLEAN := p_status IN ('Interview', 'Offer', 'Rejected') AND p_applied_date IS NOT NULL;
+    v_weekday INTEGER := EXTRACT(ISODOW FROM p_changed_date);
+BEGIN
+    IF p_sign > 0 THEN
+        INSERT INTO user_metrics (user_id) VALUES (p_user_id) ON CONFLICT (user_id) DO NOTHING;
+    ELSIF NOT EXISTS (SELECT 1 FROM users WHERE user_id = p_user_id) THEN
+        -- The user is being deleted and their user_metrics row goes with them
+        RETURN;
+    END IF;
+
+    UPDATE user_metrics SET
+        saved_count = saved_count + CASE WHEN p_status = 'Saved' THEN p_sign ELSE 0 END,
+        applied_count = applied_count + CASE WHEN p_status = 'Applied' THEN p_sign ELSE 0 END,
+        interview_count = interview_count + CASE WHEN p_status = 'Interview' THEN p_sign ELSE 0 END,
+        offer_count = offer_count + CASE WHEN p_status = 'Offer' THEN p_sign ELSE 0 END,
+        rejected_count = rejected_count + CASE WHEN p_status = 'Rejected' THEN p_sign ELSE 0 END,
+        weekday_counts[v_weekday] = weekday_counts[v_weekday] + CASE WHEN v_submitted THEN p_sign ELSE 0 END,
+        first_date = CASE WHEN v_submitted AND p_sign > 0 THEN LEAST(first_date, p_changed_date) ELSE first_date END,
+        last_date = CASE WHEN v_submitted AND p_sign > 0 THEN GREATEST(last_date, p_changed_date) ELSE last_date END,
+        response_days_sum = response_days_sum + CASE WHEN v_responded THEN p_sign * (p_changed_date - p_applied_date) ELSE 0 END,
+        response_days_count = response_days_count + CASE WHEN v_responded THEN p_sign ELSE 0 END
+    WHERE user_id = p_user_id;
+
+    -- Removing the earliest or latest date can't be undone arithmetically, so rescan the other applications
+    IF p_sign < 0 AND v_submitted THEN
+        UPDATE user_metrics m SET
+            first_date = r.first_date,
+            last_date = r.last_date
+        FROM (
+            SELECT MIN(status_changed_date) AS first_date, MAX(status_changed_date) AS last_date
+            FROM applications
+            WHERE user_id = p_user_id AND current_status <> 'Saved' AND application_id <> p_application_id
+        ) r
+        WHERE m.user_id = p_user_id
+          AND (m.first_date = p_changed_date OR m.last_date = p_changed_date);
+    END IF;
+END;
+$$;
+
+-- Function: refresh_response_metrics
+-- Re-applies an application's response time after its 'Applied' date changed from p_before.
+CREATE OR REPLACE FUNCTION refresh_response_metrics(p_application_id INTEGER, p_before DATE)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_after DATE := application_applied_date(p_application_id);
+    v_user_id INTEGER;
+    v_changed_date DATE;
+BEGIN
+    IF p_before IS NOT DISTINCT FROM v_after THEN
+        RETURN;
+    END IF;
+
+    -- No row means the application is being deleted and its metrics were already removed
+    SELECT user_id, status_changed_date INTO v_user_id, v_changed_date
+    FROM applications
+    WHERE application_id = p_application_id
+      AND current_status IN ('Interview', 'Offer', 'Rejected');
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    UPDATE user_metrics SET
+        response_days_sum = response_days_sum
+            - COALESCE(v_changed_date - p_before, 0)
+            + COALESCE(v_changed_date - v_after, 0),
+        response_days_count = response_days_count
+            - (p_before IS NOT NULL)::INTEGER
+            + (v_after IS NOT NULL)::INTEGER
+    WHERE user_id = v_user_id;
+END;
+$$;
+
+-- Function: reconcile_user_metrics
+-- Recomputes user_metrics from scratch for one user (or all users when NULL),
+-- fixes any drifted rows and returns how many rows were corrected.
+CREATE OR REPLACE FUNCTION reconcile_user_metrics(p_user_id INTEGER DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_fixed INTEGER;
+BEGIN
+    WITH apps AS (
+        SELECT
+            a.user_id,
+            a.current_status,
+            a.status_changed_date,
+            EXTRACT(ISODOW FROM a.status_changed_date) AS weekday,
+            application_applied_date(a.application_id) AS applied_date
+        FROM applications a
+        WHERE p_user_id IS NULL OR a.user_id = p_user_id
+    ),
+    expected AS (
+        SELECT
+            u.user_id,
+            COUNT(a.user_id) FILTER (WHERE a.current_status = 'Saved')::INTEGER AS saved_count,
+            COUNT(a.user_id) FILTER (WHERE a.current_status = 'Applied')::INTEGER AS applied_count,
+            COUNT(a.user_id) FILTER (WHERE a.current_status = 'Interview')::INTEGER AS interview_count,
+            COUNT(a.user_id) FILTER (WHERE a.current_status = 'Offer')::INTEGER AS offer_count,
+            COUNT(a.user_id) FILTER (WHERE a.current_status = 'Rejected')::INTEGER AS rejected_count,
+            ARRAY(
+                SELECT COUNT(s.weekday)::INTEGER
+                FROM generate_series(1, 7) AS d(day_number)
+                LEFT JOIN apps s ON s.user_id = u.user_id AND s.current_status <> 'Saved' AND s.weekday = d.day_number
+                GROUP BY d.day_number
+                ORDER BY d.day_number
+            ) AS weekday_counts,
+            MIN(a.status_changed_date) FILTER (WHERE a.current_status <> 'Saved') AS first_date,
+            MAX(a.status_changed_date) FILTER (WHERE a.current_status <> 'Saved') AS last_date,
+            COALESCE(SUM(a.status_changed_date - a.applied_date)
+                FILTER (WHERE a.current_status IN ('Interview', 'Offer', 'Rejected')), 0)::INTEGER AS response_days_sum,
+            COUNT(a.applied_date)
+                FILTER (WHERE a.current_status IN ('Interview', 'Offer', 'Rejected'))::INTEGER AS response_days_count
+        FROM users u
+        LEFT JOIN apps a ON a.user_id = u.user_id
+        WHERE p_user_id IS NULL OR u.user_id = p_user_id
+        GROUP BY u.user_id
+        -- Users who never had an application don't need a row of zeros
+        HAVING COUNT(a.user_id) > 0 OR EXISTS (SELECT 1 FROM user_metrics um WHERE um.user_id = u.user_id)
+    ),
+    fixed AS (
+        INSERT INTO user_metrics AS m
+        SELECT * FROM expected
+        ON CONFLICT (user_id) DO UPDATE SET
+            saved_count = EXCLUDED.saved_count,
+            applied_count = EXCLUDED.applied_count,
+            interview_count = EXCLUDED.interview_count,
+            offer_count = EXCLUDED.offer_count,
+            rejected_count = EXCLUDED.rejected_count,
+            weekday_counts = EXCLUDED.weekday_counts,
+            first_date = EXCLUDED.first_date,
+            last_date = EXCLUDED.last_date,
+            response_days_sum = EXCLUDED.response_days_sum,
+            response_days_count = EXCLUDED.response_days_count
+        WHERE m IS DISTINCT FROM EXCLUDED
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO v_fixed FROM fixed;
+
+    RETURN v_fixed;
+END;
+$$;
+
+-- Function: apply_daily_activity
+-- Adds p_delta events to one (user, day, status) bucket, removing the bucket once it reaches zero.
+CREATE OR REPLACE FUNCTION apply_daily_activity(p_user_id INTEGER, p_day DATE, p_status VARCHAR, p_delta INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF p_user_id IS NULL OR p_day IS NULL OR p_delta = 0 THEN
+        RETURN;
+    ELSIF p_delta < 0 AND NOT EXISTS (SELECT 1 FROM users WHERE user_id = p_user_id) THEN
+        -- The user is being deleted and their daily_activity rows go with them
+        RETURN;
+    END IF;
+
+    IF p_delta > 0 THEN
+        INSERT INTO daily_activity (user_id, day, status, event_count)
+        VALUES (p_user_id, p_day, p_status, p_delta)
+        ON CONFLICT (user_id, day, status)
+        DO UPDATE SET event_count = daily_activity.event_count + EXCLUDED.event_count;
+    ELSE
+        UPDATE daily_activity SET event_count = event_count + p_delta
+        WHERE user_id = p_user_id AND day = p_day AND status = p_status;
+
+        DELETE FROM daily_activity
+        WHERE user_id = p_user_id AND day = p_day AND status = p_status AND event_count <= 0;
+    END IF;
+END;
+$$;
+
+-- Function: apply_application_activity
+-- Adds (p_sign = 1) or removes (p_sign = -1) all of one application's history from a user's daily_activity.
+CREATE OR REPLACE FUNCTION apply_application_activity(p_user_id INTEGER, p_application_id INTEGER, p_sign INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_bucket RECORD;
+BEGIN
+    FOR v_bucket IN
+        SELECT status_date, status, COUNT(*)::INTEGER AS events
+        FROM status_history
+        WHERE application_id = p_application_id
+        GROUP BY status_date, status
+    LOOP
+        PERFORM apply_daily_activity(p_user_id, v_bucket.status_date, v_bucket.status, p_sign * v_bucket.events);
+    END LOOP;
+END;
+$$;
+
+-- Function: backfill_daily_activity
+-- Rebuilds daily_activity from status_history for one user (or all users when NULL)
+-- and returns the number of rows written. Safe to re-run.
+CREATE OR REPLACE FUNCTION backfill_daily_activity(p_user_id INTEGER DEFAULT NULL)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_written INTEGER;
+BEGIN
+    -- Hold off history writes until the rebuild commits so their trigger deltas can't be lost
+    LOCK TABLE status_history IN SHARE MODE;
+
+    DELETE FROM daily_activity
+    WHERE p_user_id IS NULL OR user_id = p_user_id;
+
+    INSERT INTO daily_activity (user_id, day, status, event_count)
+    SELECT a.user_id, h.status_date, h.status, COUNT(*)::INTEGER
+    FROM status_history h
+    JOIN applications a ON a.application_id = h.application_id
+    WHERE p_user_id IS NULL OR a.user_id = p_user_id
+    GROUP BY a.user_id, h.status_date, h.status;
+
+    GET DIAGNOSTICS v_written = ROW_COUNT;
+    RETURN v_written;
+END;
+$$;
+
+-- Function: backfill_job_search_text
+-- Fills jobs.search_text for rows written before the trigger existed and returns the
+-- number of jobs updated. Only rows that differ are touched, so it is safe to re-run.
+CREATE OR REPLACE FUNCTION backfill_job_search_text()
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE jobs j
+    SET search_text = lower(c.name || ' ' || j.title)
+    FROM companies c
+    WHERE c.company_id = j.company_id
+      AND j.search_text IS DISTINCT FROM lower(c.name || ' ' || j.title);
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$;
+
+-- Function: create_application_full
+-- Upserts the company and job, inserts the application and its status history
+-- in one transaction, and returns the new application_id.
+CREATE OR REPLACE FUNCTION create_application_full(
+    p_user_id INTEGER,
+    p_company_name VARCHAR,
+    p_job_title VARCHAR,
+    p_status_date DATE,
+    p_current_status VARCHAR,
+    p_industry VARCHAR DEFAULT NULL,
+    p_company_location VARCHAR DEFAULT NULL,
+    p_logo_url VARCHAR DEFAULT NULL,
+    p_job_type VARCHAR DEFAULT NULL,
+    p_job_location VARCHAR DEFAULT NULL,
+    p_posted_date DATE DEFAULT NULL,
+    p_notes TEXT DEFAULT NULL
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_company_id INTEGER;
+    v_job_id INTEGER;
+    v_application_id INTEGER;
+BEGIN
+    -- The no-op DO UPDATE makes RETURNING yield the existing row's id on conflict
+    INSERT INTO companies (name, industry, location, logo_url)
+    VALUES (p_company_name, p_industry, p_company_location, p_logo_url)
+    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+    RETURNING company_id INTO v_company_id;
+
+    INSERT INTO jobs (company_id, title, job_type, location, posted_date)
+    VALUES (v_company_id, p_job_title, p_job_type, p_job_location, p_posted_date)
+    ON CONFLICT (company_id, title) DO UPDATE SET title = EXCLUDED.title
+    RETURNING job_id INTO v_job_id;
+
+    INSERT INTO applications (job_id, user_id, status_changed_date, current_status, notes)
+    VALUES (v_job_id, p_user_id, p_status_date, p_current_status, p_notes)
+    RETURNING application_id INTO v_application_id;
+
+    IF p_current_status = 'Saved' THEN
+        INSERT INTO status_history (application_id, status, status_date, notes)
+        VALUES (v_application_id, 'Saved', p_status_date, COALESCE(p_notes, ''));
+    ELSE
+        INSERT INTO status_history (application_id, status, status_date, notes)
+        VALUES (v_application_id, 'Saved', p_status_date, ''),
+               (v_application_id, p_current_status, p_status_date, COALESCE(p_notes, ''));
+    END IF;
+
+    RETURN v_application_id;
+END;
+$$;
+
+
+-- Create triggers
+
+-- Trigger: jobs.search_text
+-- Keeps a lowercase "company title" string on each job for server-side ILIKE search
+CREATE OR REPLACE FUNCTION set_job_search_text()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    NEW.search_text := lower((SELECT name FROM companies WHERE company_id = NEW.company_id) || ' ' || NEW.title);
+    RETURN NEW;
+END;
+$$;
+
+CREATE TRIGGER trg_jobs_search_text
+BEFORE INSERT OR UPDATE OF company_id, title ON jobs
+FOR EACH ROW EXECUTE FUNCTION set_job_search_text();
+
+CREATE OR REPLACE FUNCTION refresh_company_job_search_text()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE jobs
+    SET search_text = lower(NEW.name || ' ' || title)
+    WHERE company_id = NEW.company_id;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_companies_search_text
+AFTER UPDATE OF name ON companies
+FOR EACH ROW
+WHEN (OLD.name IS DISTINCT FROM NEW.name)
+EXECUTE FUNCTION refresh_company_job_search_text();
+
+-- Trigger: user_metrics from applications
+-- Removes the old row's contribution and adds the new one. Deletes run BEFORE so the
+-- status history needed for response times is still there when the row is removed.
+CREATE OR REPLACE FUNCTION track_application_metrics()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_application_metrics(
+            OLD.user_id, OLD.application_id, OLD.current_status, OLD.status_changed_date,
+            application_applied_date(OLD.application_id), -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_application_metrics(
+            NEW.user_id, NEW.application_id, NEW.current_status, NEW.status_changed_date,
+            application_applied_date(NEW.application_id), 1
+        );
+        RETURN NULL;
+    END IF;
+    RETURN OLD;
+END;
+$$;
+
+CREATE TRIGGER trg_applications_metrics
+AFTER INSERT OR UPDATE OF user_id, current_status, status_changed_date ON applications
+FOR EACH ROW EXECUTE FUNCTION track_application_metrics();
+
+CREATE TRIGGER trg_applications_metrics_delete
+BEFORE DELETE ON applications
+FOR EACH ROW EXECUTE FUNCTION track_application_metrics();
+
+-- Trigger: user_metrics from status_history
+-- Only 'Applied' rows affect metrics, through the application's response time
+CREATE OR REPLACE FUNCTION track_status_history_metrics()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.status = 'Applied' THEN
+        PERFORM refresh_response_metrics(
+            OLD.application_id,
+            GREATEST(
+                application_applied_date(OLD.application_id, CASE WHEN TG_OP = 'UPDATE' THEN NEW.history_id END),
+                OLD.status_date
+            )
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.status = 'Applied'
+       AND (TG_OP = 'INSERT' OR OLD.status <> 'Applied' OR OLD.application_id <> NEW.application_id) THEN
+        PERFORM refresh_response_metrics(
+            NEW.application_id,
+            application_applied_date(NEW.application_id, NEW.history_id)
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_status_history_metrics
+AFTER INSERT OR UPDATE OR DELETE ON status_history
+FOR EACH ROW EXECUTE FUNCTION track_status_history_metrics();
+
+-- Trigger: daily_activity from applications
+-- Deletes run BEFORE so the application's history is still there to subtract; the cascaded
+-- status_history deletes that follow find no application and leave daily_activity alone.
+-- Moving an application to another user moves its history with it.
+CREATE OR REPLACE FUNCTION track_application_activity()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM apply_application_activity(OLD.user_id, OLD.application_id, -1);
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    PERFORM apply_application_activity(NEW.user_id, NEW.application_id, 1);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_applications_activity
+AFTER UPDATE OF user_id ON applications
+FOR EACH ROW
+WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id)
+EXECUTE FUNCTION track_application_activity();
+
+CREATE TRIGGER trg_applications_activity_delete
+BEFORE DELETE ON applications
+FOR EACH ROW EXECUTE FUNCTION track_application_activity();
+
+-- Trigger: daily_activity from status_history
+CREATE OR REPLACE FUNCTION track_status_history_activity()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM apply_daily_activity(
+            (SELECT user_id FROM applications WHERE application_id = OLD.application_id),
+            OLD.status_date, OLD.status, -1
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM apply_daily_activity(
+            (SELECT user_id FROM applications WHERE application_id = NEW.application_id),
+            NEW.status_date, NEW.status, 1
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_status_history_activity
+AFTER INSERT OR DELETE OR UPDATE OF application_id, status, status_date ON status_history
+FOR EACH ROW EXECUTE FUNCTION track_status_history_activity();
 
 
 -- Insert sample users
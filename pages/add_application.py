@@ -4,11 +4,16 @@ Form to create new job applications
 """
 
 import streamlit as st
-from datetime import datetime, date
+from datetime import date
 import logging
+import uuid
 from streamlit_searchbox import st_searchbox
-from utils.constants import JOB_TYPES, DEFAULT_COMPANY_LOGO
-from utils.company_api import search_companies
+from utils.constants import JOB_TYPES, DEFAULT_COMPANY_LOGO, COMPANY_SEARCH_DEBOUNCE_MS
+from utils.company_api import find_companies, company_autocomplete
+from utils.company_index import company_index
+from utils.logo_cache import logo_cache
+from utils.records import format_date
+from utils.rendering import status_badge
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +23,8 @@ def search_company_autocomplete(search_term):
     if not search_term or len(search_term) < 2:
         return []
     
-    companies = search_companies(search_term)
+    caller = st.session_state.setdefault('company_search_caller', uuid.uuid4().hex)
+    companies = company_autocomplete.search(search_term, caller)
     return [company.get('name', 'Unknown') for company in companies[:10]]
 
 
@@ -29,6 +35,9 @@ def show():
     st.markdown("Fill in the details below to track a new job application.")
     
     db = st.session_state.db_client
+    
+    # The index is shared by every session, so only the first visit after startup loads the table
+    company_index.seed_once(db.get_all_companies)
 
     st.session_state.selected_company_name = ''
     st.session_state.selected_company_logo = ''
@@ -40,11 +49,12 @@ def show():
     selected_company_name = st_searchbox(
         search_company_autocomplete,
         placeholder="Start typing company name (e.g., Apple, Google)...",
+        debounce=COMPANY_SEARCH_DEBOUNCE_MS,
         key="company_searchbox"
     )
     
     if selected_company_name:
-        companies = search_companies(selected_company_name)
+        companies = find_companies(selected_company_name)
         if companies:
             selected_company = next(
                 (c for c in companies if c.get('name') == selected_company_name),
@@ -54,7 +64,7 @@ def show():
             col_logo, col_info = st.columns([1, 5])
             with col_logo:
                 if selected_company.get('logo'):
-                    st.image(selected_company['logo'], width=60)
+                    st.image(logo_cache.get(selected_company['logo']), width=60)
             with col_info:
                 st.markdown(
                     f"<div style='background-color: #d4edda; border-left: 4px solid #28a745; padding: 12px; border-radius: 4px; color: #155724;'>"
@@ -174,36 +184,22 @@ def show():
                         st.error("User session invalid. Please login again.")
                         return
                     
-                    company_id = db.get_or_create_company(
+                    application_id = db.create_application_full(
+                        user_id,
                         company_name.strip(),
-                        company_industry.strip() if company_industry else None,
-                        company_location.strip() if company_location else None,
-                        st.session_state.selected_company_logo or DEFAULT_COMPANY_LOGO
-                    )
-                    if not company_id:
-                        st.error("Failed to create/retrieve company")
-                        return
-                    
-                    job_id = db.get_or_create_job(
-                        company_id,
                         job_title.strip(),
-                        job_type if job_type else None,
-                        job_location.strip() if job_location else None,
-                        posted_date
-                    )
-                    if not job_id:
-                        st.error("Failed to create/retrieve job")
-                        return
-                    
-                    success = db.create_application(
-                        job_id,
-                        user_id,
                         status_date,
                         current_status,
-                        notes.strip() if notes else None
+                        industry=company_industry.strip() if company_industry else None,
+                        company_location=company_location.strip() if company_location else None,
+                        logo_url=st.session_state.selected_company_logo or DEFAULT_COMPANY_LOGO,
+                        job_type=job_type if job_type else None,
+                        job_location=job_location.strip() if job_location else None,
+                        posted_date=posted_date,
+                        notes=notes.strip() if notes else None
                     )
                     
-                    if success:
+                    if application_id:
                         action = "saved" if save_button else "added"
                         icon = ":material/save:" if save_button else ":material/check_circle:"
                         st.toast(f"Application {action} successfully!", icon=icon)
@@ -223,29 +219,19 @@ def show():
     
     user_id = st.session_state.get('user_id')
     try:
-        all_apps = db.get_all_applications(user_id)
+        all_apps = db.get_all_applications(user_id, limit=5, shape="dashboard")
         recent_apps = all_apps[:5] if all_apps else []
         
         if recent_apps:
             for app in recent_apps:
-                company = app['jobs']['companies']['name']
-                title = app['jobs']['title']
-                status = app['current_status']
-                status_changed = datetime.fromisoformat(app['status_changed_date'].replace('Z', '+00:00')).strftime('%m/%d/%y')
-                               
-                status_colors = {
-                    'Saved': 'background-color: #e3f2fd; color: #1976d2;',
-                    'Applied': 'background-color: #fff3e0; color: #f57c00;',
-                    'Interview': 'background-color: #f3e5f5; color: #7b1fa2;',
-                    'Offer': 'background-color: #e8f5e9; color: #388e3c;',
-                    'Rejected': 'background-color: #ffebee; color: #d32f2f;'
-                }
-                
-                color_style = status_colors.get(status, 'background-color: #f5f5f5; color: #666;')
+                company = app.company_name
+                title = app.title
+                status = app.current_status
+                status_changed = format_date(app.status_changed_date)
                 
                 st.markdown(
                     f"**{title}** at _{company}_ - "
-                    f"<span style='{color_style} padding: 3px 8px; border-radius: 4px; font-size: 0.85em; font-weight: 600;'>{status}</span> "
+                    f"{status_badge(status)} "
                     f"<span style='color: #999; font-size: 0.85em;'>({status_changed})</span>",
                     unsafe_allow_html=True
                 )
@@ -4,10 +4,13 @@ Overview and analytics with comprehensive metrics and Sankey visualization
 """
 
 import streamlit as st
-from datetime import datetime
 import logging
 import pandas as pd
 import plotly.graph_objects as go
+from datetime import date, timedelta
+from utils.constants import VALID_STATUSES, ACTIVITY_CHART_DAYS
+from utils.records import format_date
+from utils.rendering import status_badge
 
 logger = logging.getLogger(__name__)
 
@@ -21,23 +24,15 @@ def show():
     user_id = st.session_state.get('user_id')
     
     try:
-        applications = db.get_all_applications(user_id)
+        metrics = db.get_dashboard_metrics(user_id)
+        applications = db.get_all_applications(user_id, limit=10, shape="dashboard")
         
-        status_history_map = {}
-        for app in applications:
-            status_history_map[app['application_id']] = db.get_status_history(app['application_id'])
-        
-        stats = db.get_application_stats(user_id, applications)
-        applied_apps = [a for a in applications if a.get('current_status') != 'Saved']
-        
-        ghosted_count = sum(1 for a in applied_apps if a.get('current_status') in ['Applied', 'Interview'])
-        total_applied_apps = len(applied_apps)
-        ghost_rate = round((ghosted_count / total_applied_apps * 100), 1) if total_applied_apps > 0 else 0.0
-        
-        perf_metrics = db.get_performance_metrics(user_id, applied_apps, status_history_map)
-        volume_metrics = db.get_volume_metrics(user_id, applied_apps)
-        conversion = db.get_conversion_funnel(user_id, applied_apps)
-        sankey_data = db.get_sankey_data(user_id, applied_apps, status_history_map)
+        stats = metrics['stats']
+        ghost_rate = metrics['ghost_rate']
+        perf_metrics = metrics['performance']
+        volume_metrics = metrics['volume']
+        conversion = metrics['conversion']
+        sankey_data = metrics['sankey']
 
         css = """
         <style>
@@ -248,39 +243,67 @@ def show():
         
         st.markdown("---")
         
+        st.markdown("### Activity Over Time")
+        
+        activity = db.get_daily_activity(user_id, since=date.today() - timedelta(days=ACTIVITY_CHART_DAYS))
+        if activity:
+            # Weekly buckets starting on Monday, one stacked bar segment per status
+            weekly = {status: {} for status in VALID_STATUSES}
+            for row in activity:
+                week = row['day'] - timedelta(days=row['day'].weekday())
+                counts = weekly.setdefault(row['status'], {})
+                counts[week] = counts.get(week, 0) + row['count']
+        
+            ACTIVITY_COLORS = {
+                'Saved': '#90CAF9', 'Applied': '#5B8DEE', 'Interview': '#4DB6AC',
+                'Offer': '#7CB342', 'Rejected': '#FF6B6B'
+            }
+            fig = go.Figure(data=[
+                go.Bar(
+                    name=status,
+                    x=list(counts),
+                    y=list(counts.values()),
+                    marker_color=ACTIVITY_COLORS.get(status),
+                    hovertemplate='Week of %{x|%b %d}: %{y}<extra>' + status + '</extra>'
+                )
+                for status, counts in weekly.items() if counts
+            ])
+            fig.update_layout(
+                barmode='stack',
+                height=350,
+                plot_bgcolor='white',
+                paper_bgcolor='white',
+                margin=dict(l=20, r=20, t=20, b=20),
+                legend=dict(orientation='h', y=1.1),
+                xaxis=dict(title=None),
+                yaxis=dict(title='Status changes')
+            )
+        
+            st.plotly_chart(fig, width='stretch')
+        else:
+            st.info("No status changes in the last six months")
+        
+        st.markdown("---")
+        
         st.markdown("### Recent Activity")
         
         if applications:
             recent_apps = applications[:10]
             
-            status_colors = {
-                'Saved': 'background-color: #e3f2fd; color: #1976d2;',
-                'Applied': 'background-color: #fff3e0; color: #f57c00;',
-                'Interview': 'background-color: #f3e5f5; color: #7b1fa2;',
-                'Offer': 'background-color: #e8f5e9; color: #388e3c;',
-                'Rejected': 'background-color: #ffebee; color: #d32f2f;'
-            }
-            
             for app in recent_apps:
                 try:
-                    company = app['jobs']['companies']['name']
-                    title = app['jobs']['title']
-                    status = app['current_status']
-                    status_changed_dt = datetime.fromisoformat(
-                        app['status_changed_date'].replace('Z', '+00:00')
-                    )
-                    status_changed_date = status_changed_dt.strftime('%m/%d/%y')
+                    company = app.company_name
+                    title = app.title
+                    status = app.current_status
+                    status_changed_date = format_date(app.status_changed_date)
                     
                     status_display = status
                     if status in ['Applied', 'Interview']:
-                        days_since = (datetime.now(status_changed_dt.tzinfo) - status_changed_dt).days
-                        status_display = f"{status} (Ghosted {days_since}d)"
-                    
-                    color_style = status_colors.get(status, 'background-color: #f5f5f5; color: #666;')
+                        status_display = f"{status} (Ghosted {app.days_since_change}d)"
                     
                     st.markdown(
                         f"**{title}** at _{company}_ - "
-                        f"<span style='{color_style} padding: 3px 8px; border-radius: 4px; font-size: 0.85em; font-weight: 600;'>{status_display}</span> "
+                        f"{status_badge(status, status_display)} "
                         f"<span style='color: #999; font-size: 0.85em;'>({status_changed_date})</span>",
                         unsafe_allow_html=True
                     )
@@ -292,6 +315,22 @@ def show():
         
         st.markdown("---")
         
+        st.markdown("### Waiting Longest")
+        
+        stale_apps = db.get_stale_applications(user_id)
+        if stale_apps:
+            for app in stale_apps:
+                st.markdown(
+                    f"**{app.title}** at _{app.company_name}_ - "
+                    f"{status_badge(app.current_status, f'{app.current_status} ({app.days_since_change}d)')} "
+                    f"<span style='color: #999; font-size: 0.85em;'>(since {format_date(app.status_changed_date)})</span>",
+                    unsafe_allow_html=True
+                )
+        else:
+            st.info("Nothing pending. Every application has a response or hasn't been submitted yet")
+        
+        st.markdown("---")
+        
         # Insights & Tips
         st.markdown("### Insights & Tips")
         
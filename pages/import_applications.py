@@ -0,0 +1,71 @@
+"""
+Import Applications Page
+Bulk import applications from a CSV or JSON file
+"""
+
+import streamlit as st
+import logging
+from utils.constants import IMPORT_BATCH_SIZE
+from utils.importer import import_applications, SUPPORTED_FORMATS
+
+logger = logging.getLogger(__name__)
+
+
+def show():
+    """Display the Import Applications page"""
+
+    st.markdown("<h1 style='color: #1f77b4;'>Import Applications</h1>", unsafe_allow_html=True)
+    st.markdown("Upload a spreadsheet export to add many applications at once.")
+
+    db = st.session_state.db_client
+    user_id = st.session_state.get('user_id')
+
+    st.markdown(
+        "<div class='info-box'><i class='fas fa-info-circle'></i> "
+        "Required columns: <strong>Company</strong>, <strong>Title</strong>. "
+        "Optional: Status, Status Date, Industry, Location, Job Type, Job Location, Posted Date, Notes. "
+        "Files exported from View Applications can be imported as-is.</div>",
+        unsafe_allow_html=True
+    )
+
+    uploaded_file = st.file_uploader("Applications file", type=SUPPORTED_FORMATS)
+
+    batch_size = st.number_input(
+        "Batch size",
+        min_value=50,
+        max_value=5000,
+        value=IMPORT_BATCH_SIZE,
+        step=50,
+        help="Rows written per database request"
+    )
+
+    if st.button("Import", type="primary", disabled=uploaded_file is None):
+        if not user_id:
+            st.error("User session invalid. Please login again.")
+            return
+
+        file_format = uploaded_file.name.rsplit('.', 1)[-1].lower()
+        progress = st.progress(0.0, text="Starting import...")
+        total_bytes = max(uploaded_file.size, 1)
+
+        def on_progress(processed, imported):
+            fraction = min(uploaded_file.tell() / total_bytes, 1.0)
+            progress.progress(fraction, text=f"Processed {processed} rows, imported {imported}")
+
+        try:
+            result = import_applications(db, user_id, uploaded_file, file_format, int(batch_size), on_progress)
+        except Exception as e:
+            progress.empty()
+            st.error(f"Could not read file: {str(e)}")
+            logger.error(f"Import failed: {str(e)}", exc_info=True)
+            return
+
+        progress.progress(1.0, text="Import complete")
+
+        if result['imported']:
+            st.success(f":material/task_alt: Imported {result['imported']} of {result['processed']} rows")
+        if result['errors']:
+            st.warning(f"{len(result['errors'])} rows were skipped")
+            st.dataframe(result['errors'], width='stretch', hide_index=True)
+        elif not result['imported']:
+            st.info("No rows found in file")
@@ -5,7 +5,7 @@ User authentication and login
 
 import streamlit as st
 import logging
-from utils.auth import verify_password, login_user, init_session_state
+from utils.auth import verify_password, login_user, init_session_state, allow_login_attempt, AuthBusyError
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +50,10 @@ def show():
 
         email = email.strip().lower()
 
+        if not allow_login_attempt(email):
+            st.error("Too many login attempts. Please wait a minute and try again.")
+            return
+
         try:
             with st.spinner("Authenticating..."):
                 user = db.get_user_by_email(email)
@@ -64,6 +68,9 @@ def show():
                     st.error("Invalid email or password")
                     logger.warning(f"Failed login: {email}")
 
+        except AuthBusyError as e:
+            st.warning(str(e))
+            logger.warning(f"Login queue full: {email}")
         except Exception as e:
             st.error(f"Login error: {str(e)}")
             logger.error(f"Login error: {str(e)}", exc_info=True)
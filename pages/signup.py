@@ -5,7 +5,7 @@ User registration
 
 import streamlit as st
 import logging
-from utils.auth import hash_password, login_user, init_session_state
+from utils.auth import hash_password_async, login_user, init_session_state, allow_login_attempt, AuthBusyError
 
 logger = logging.getLogger(__name__)
 
@@ -81,15 +81,23 @@ def show():
         name = name.strip()
         email = email.strip().lower()
         
+        # Signup hashes a password too, so it shares the login throttle
+        if not allow_login_attempt(email):
+            st.error("Too many attempts. Please wait a minute and try again.")
+            return
+        
         try:
             with st.spinner("Creating account..."):
-                if db.get_user_by_email(email):
+                # Hash on the bcrypt pool while the cheap duplicate check runs here
+                password_hash = hash_password_async(password)
+                if db.email_exists(email):
+                    password_hash.cancel()
                     st.error("Email already exists. Please login instead.")
                     logger.warning(f"Duplicate email: {email}")
                     return
                 
-                password_hash = hash_password(password)
-                user_id = db.create_user_with_password(name, email, password_hash)
+                # The insert ignores conflicts, so a signup racing this one still can't create a duplicate
+                user_id = db.create_user_with_password(name, email, password_hash.result())
                 
                 if user_id:
                     st.success(f"Account created! Welcome, {name}!")
@@ -97,10 +105,16 @@ def show():
                     login_user(user_id, name, email)
                     st.balloons()
                     st.rerun()
+                elif db.email_exists(email):
+                    st.error("Email already exists. Please login instead.")
+                    logger.warning(f"Duplicate email: {email}")
                 else:
                     st.error("Failed to create account. Try again.")
                     logger.error("User creation failed")
                     
+        except AuthBusyError as e:
+            st.warning(str(e))
+            logger.warning(f"Signup queue full: {email}")
         except Exception as e:
             st.error(f"Signup error: {str(e)}")
             logger.error(f"Signup error: {str(e)}", exc_info=True)
@@ -0,0 +1,42 @@
+"""
+Shared pytest setup: make the project root importable so tests can import utils and pages,
+and provide a scratch Postgres schema for the tests that exercise database_setup.sql
+"""
+
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def pg_cursor():
+    """Cursor on a throwaway schema loaded with database_setup.sql, skipped unless TEST_DATABASE_URL is set
+
+        TEST_DATABASE_URL=postgresql://localhost/postgres python -m pytest
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    psycopg2 = pytest.importorskip("psycopg2")
+
+    conn = psycopg2.connect(url)
+    conn.autocommit = True
+    cur = conn.cursor()
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    cur.execute(f"CREATE SCHEMA {schema}")
+    try:
+        # Only the new schema is on the path, so the setup script's DROP ... IF EXISTS can't reach real tables.
+        # pg_trgm would have to be on the path too; it only backs a search index these tests don't use
+        cur.execute(f"SET search_path TO {schema}")
+        setup_sql = (ROOT / "database_setup.sql").read_text()
+        cur.execute("\n".join(line for line in setup_sql.splitlines() if "trgm" not in line))
+        yield cur
+    finally:
+        cur.execute(f"DROP SCHEMA {schema} CASCADE")
+        conn.close()
@@ -0,0 +1,120 @@
+"""
+Parity tests for the vectorized dashboard aggregates against a plain per-application loop
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from utils.analytics import compute_dashboard_aggregates
+from utils.constants import VALID_STATUSES, WEEKDAYS
+from utils.database import build_dashboard_metrics
+from utils.records import Application, StatusEvent
+
+
+def reference_aggregates(applications, status_history_map):
+    """The get_dashboard_aggregates contract, one application at a time"""
+    by_status, weekday_counts = {}, {}
+    changed_dates, response_days, pending = [], [], []
+    for app in applications:
+        by_status[app.current_status] = by_status.get(app.current_status, 0) + 1
+        if app.current_status == "Saved":
+            continue
+
+        changed = app.status_changed_date
+        if changed is not None:
+            changed_dates.append(changed)
+            day = WEEKDAYS[changed.weekday()]
+            weekday_counts[day] = weekday_counts.get(day, 0) + 1
+
+        applied_dates = [
+            e.status_date for e in status_history_map.get(app.application_id, [])
+            if e.status == "Applied" and e.status_date is not None
+        ]
+        applied = max(applied_dates) if applied_dates else None
+        if applied is None:
+            continue
+        if app.current_status in ("Interview", "Offer", "Rejected") and changed is not None:
+            response_days.append((changed - applied).days)
+        elif app.current_status == "Applied":
+            pending.append(applied)
+
+    return {
+        "by_status": by_status,
+        "weekday_counts": weekday_counts,
+        "first_date": min(changed_dates).isoformat() if changed_dates else None,
+        "last_date": max(changed_dates).isoformat() if changed_dates else None,
+        "response_days_sum": sum(response_days),
+        "response_days_count": len(response_days),
+        "oldest_pending_applied": min(pending).isoformat() if pending else None
+    }
+
+
+def random_dataset(seed, size):
+    rng = random.Random(seed)
+
+    def some_date():
+        return None if rng.random() < 0.05 else date(2025, 1, 1) + timedelta(days=rng.randint(0, 300))
+
+    applications, history = [], {}
+    for application_id in range(1, size + 1):
+        applications.append(Application(application_id, rng.choice(VALID_STATUSES), some_date()))
+        events = [
+            StatusEvent(application_id, rng.choice(["Applied", "Applied", "Interview", "Saved"]), some_date())
+            for _ in range(rng.randint(0, 4))
+        ]
+        # Applications with no history at all are left out of the map, as the bulk loader does
+        if events:
+            history[application_id] = events
+    return applications, history
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_vectorized_aggregates_match_reference_loop(seed):
+    applications, history = random_dataset(seed, size=400)
+    assert compute_dashboard_aggregates(applications, history) == reference_aggregates(applications, history)
+
+
+@pytest.mark.parametrize("applications, history", [
+    ([], {}),
+    ([Application(1, "Saved", date(2025, 3, 1))], {}),
+    ([Application(1, "Applied", None)], {1: [StatusEvent(1, "Applied", None)]}),
+])
+def test_edge_cases_match_reference_loop(applications, history):
+    assert compute_dashboard_aggregates(applications, history) == reference_aggregates(applications, history)
+
+
+def test_dashboard_metrics_from_aggregates():
+    applications = [
+        Application(1, "Saved", date(2025, 3, 3)),
+        Application(2, "Applied", date(2025, 3, 3)),
+        Application(3, "Interview", date(2025, 3, 10)),
+        Application(4, "Offer", date(2025, 3, 12)),
+        Application(5, "Rejected", date(2025, 3, 5))
+    ]
+    history = {
+        2: [StatusEvent(2, "Applied", date(2025, 3, 3))],
+        3: [StatusEvent(3, "Applied", date(2025, 3, 4)), StatusEvent(3, "Interview", date(2025, 3, 10))],
+        4: [StatusEvent(4, "Applied", date(2025, 3, 2))],
+        5: [StatusEvent(5, "Applied", date(2025, 3, 3))]
+    }
+    metrics = build_dashboard_metrics(compute_dashboard_aggregates(applications, history))
+
+    assert metrics["stats"] == {"total": 5, "by_status": {"Saved": 1, "Applied": 1, "Interview": 1, "Offer": 1, "Rejected": 1}}
+    assert metrics["ghost_rate"] == 50.0
+    # Responses took 6, 10 and 2 days
+    assert metrics["performance"]["response_time"] == 6.0
+    assert metrics["performance"]["longest_waiting"] == (date.today() - date(2025, 3, 3)).days
+    assert metrics["volume"]["total_applications"] == 4
+    assert metrics["volume"]["most_active_day"] == "Monday"
+    assert metrics["volume"]["most_active_count"] == 2
+    assert metrics["volume"]["rate_per_day"] == 0.4
+    assert metrics["conversion"] == {"applied_to_interview": 50.0, "interview_to_offer": 50.0}
+
+
+def test_dashboard_metrics_without_submissions():
+    metrics = build_dashboard_metrics(compute_dashboard_aggregates([Application(1, "Saved", date(2025, 3, 3))], {}))
+    assert metrics["stats"]["total"] == 1
+    assert metrics["volume"]["total_applications"] == 0
+    assert metrics["performance"] == {"response_time": 0.0, "longest_waiting": 0}
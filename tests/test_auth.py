@@ -0,0 +1,146 @@
+"""
+Tests for password hashing on the bounded bcrypt pool and for login throttling
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import auth
+from utils.constants import AUTH_WORKERS
+
+
+@pytest.mark.parametrize("header, hops, expected", [
+    ("203.0.113.7", 1, "203.0.113.7"),
+    # A client-supplied entry on the left must not win over what our proxy appended
+    ("1.2.3.4, 203.0.113.7", 1, "203.0.113.7"),
+    ("1.2.3.4, 203.0.113.7, 10.0.0.2", 2, "203.0.113.7"),
+    ("203.0.113.7", 2, ""),
+    ("1.2.3.4", 0, ""),
+    ("", 1, ""),
+    (" , 203.0.113.7 ", 1, "203.0.113.7"),
+])
+def test_forwarded_client_trusts_only_proxy_hops(header, hops, expected):
+    assert auth.forwarded_client(header, hops) == expected
+
+
+def _fake_streamlit(monkeypatch, headers, ip_address, secrets=None):
+    context = SimpleNamespace(headers=headers, ip_address=ip_address)
+    monkeypatch.setattr(auth, "st", SimpleNamespace(context=context, secrets=secrets or {}))
+
+
+def test_client_ip_prefers_proxy_appended_address(monkeypatch):
+    _fake_streamlit(monkeypatch, {"X-Forwarded-For": "6.6.6.6, 203.0.113.7"}, "10.0.0.2")
+    assert auth.client_ip() == "203.0.113.7"
+
+
+def test_client_ip_falls_back_to_socket_address(monkeypatch):
+    _fake_streamlit(monkeypatch, {"X-Forwarded-For": "6.6.6.6"}, "198.51.100.9",
+                    secrets={"auth": {"trusted_proxy_hops": 0}})
+    assert auth.client_ip() == "198.51.100.9"
+
+    _fake_streamlit(monkeypatch, {}, "198.51.100.9")
+    assert auth.client_ip() == "198.51.100.9"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def low_rounds(monkeypatch):
+    # The cheapest cost bcrypt accepts keeps these tests fast while still running the real pool
+    monkeypatch.setattr(auth, "st", SimpleNamespace(secrets={"auth": {"bcrypt_rounds": 4}}))
+
+
+def test_hash_and_verify_round_trip(low_rounds):
+    hashed = auth.hash_password("hunter2")
+    assert hashed.startswith("$2b$04$")
+    assert auth.verify_password("hunter2", hashed)
+    assert not auth.verify_password("hunter3", hashed)
+    assert not auth.verify_password("hunter2", "not a hash")
+
+
+def test_pool_runs_at_most_auth_workers_hashes_at_once(low_rounds, monkeypatch):
+    running, peak, lock = [0], [0], threading.Lock()
+    real_hashpw = auth.bcrypt.hashpw
+
+    def tracked_hashpw(password, salt):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.02)
+        try:
+            return real_hashpw(password, salt)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    monkeypatch.setattr(auth.bcrypt, "hashpw", tracked_hashpw)
+    futures = [auth.hash_password_async(f"password {i}") for i in range(AUTH_WORKERS * 4)]
+    hashes = [future.result() for future in futures]
+
+    assert peak[0] == AUTH_WORKERS
+    assert len(set(hashes)) == len(hashes)
+
+
+def test_full_queue_raises_auth_busy_and_recovers(low_rounds, monkeypatch):
+    monkeypatch.setattr(auth, "_hash_slots", threading.BoundedSemaphore(2))
+    monkeypatch.setattr(auth, "AUTH_QUEUE_TIMEOUT", 0.05)
+    release = threading.Event()
+    blocked = [auth._submit(release.wait, 5) for _ in range(2)]
+
+    with pytest.raises(auth.AuthBusyError):
+        auth.hash_password("too many")
+
+    release.set()
+    for future in blocked:
+        future.result()
+    # Slots come back as the queued calls finish
+    assert auth.verify_password("pw", auth.hash_password("pw"))
+
+
+def test_token_bucket_drains_and_refills(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(auth, "time", clock)
+    bucket = auth.TokenBucket(burst=3, refill_seconds=10.0)
+
+    assert [bucket.consume("a") for _ in range(4)] == [True, True, True, False]
+    assert bucket.consume("b")
+
+    clock.now += 9.9
+    assert not bucket.consume("a")
+    clock.now += 0.2
+    assert bucket.consume("a") and not bucket.consume("a")
+
+    # Refill never exceeds the burst size
+    clock.now += 1000
+    assert [bucket.consume("a") for _ in range(4)] == [True, True, True, False]
+
+
+def test_token_bucket_forgets_least_recent_keys(monkeypatch):
+    monkeypatch.setattr(auth, "time", FakeClock())
+    bucket = auth.TokenBucket(burst=1, refill_seconds=60.0, max_keys=2)
+    assert bucket.consume("a") and bucket.consume("b") and bucket.consume("c")
+    # "a" was evicted, so it starts over with a full bucket; "c" is still tracked
+    assert bucket.consume("a")
+    assert not bucket.consume("c")
+
+
+def test_ip_limit_is_checked_before_the_email_bucket(monkeypatch):
+    monkeypatch.setattr(auth, "time", FakeClock())
+    monkeypatch.setattr(auth, "_ip_buckets", auth.TokenBucket(burst=2, refill_seconds=60.0))
+    monkeypatch.setattr(auth, "_email_buckets", auth.TokenBucket(burst=2, refill_seconds=60.0))
+
+    assert auth.allow_login_attempt("victim@example.com", ip="6.6.6.6")
+    assert auth.allow_login_attempt("other@example.com", ip="6.6.6.6")
+    # The attacker's IP is exhausted, and its attempts no longer cost the victim's email any tokens
+    assert not auth.allow_login_attempt("victim@example.com", ip="6.6.6.6")
+    assert auth.allow_login_attempt("victim@example.com", ip="203.0.113.7")
+    assert not auth.allow_login_attempt("victim@example.com", ip="203.0.113.8")
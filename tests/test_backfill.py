@@ -0,0 +1,74 @@
+"""
+Tests for the backfill CLI and the search_text backfill it runs
+"""
+
+import pytest
+
+from utils import backfill
+
+
+class FakeDB:
+    """Records the backfill calls SupabaseClient would make"""
+
+    def __init__(self, search_text=3, activity=10, metrics=0):
+        self.results = {"search_text": search_text, "activity": activity, "metrics": metrics}
+        self.calls = []
+
+    def backfill_job_search_text(self):
+        self.calls.append(("search_text",))
+        return self.results["search_text"]
+
+    def backfill_daily_activity(self, user_id):
+        self.calls.append(("activity", user_id))
+        return self.results["activity"]
+
+    def reconcile_user_metrics(self, user_id):
+        self.calls.append(("metrics", user_id))
+        return self.results["metrics"]
+
+    def close(self):
+        self.calls.append(("close",))
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeDB()
+    monkeypatch.setattr(backfill, "SupabaseClient", lambda: db)
+    monkeypatch.setattr(backfill, "setup_logger", lambda: None)
+    return db
+
+
+def test_search_text_is_backfilled_even_for_one_user(fake_db, capsys):
+    assert backfill.main(["--user-id", "7", "--metrics"]) == 0
+    assert fake_db.calls == [("search_text",), ("activity", 7), ("metrics", 7), ("close",)]
+    assert "jobs.search_text: 3 rows updated" in capsys.readouterr().out
+
+
+def test_failed_search_text_backfill_stops_with_an_error(fake_db):
+    fake_db.results["search_text"] = None
+    assert backfill.main([]) == 1
+    assert fake_db.calls == [("search_text",), ("close",)]
+
+
+def test_search_text_backfill_fills_jobs_written_before_the_trigger(pg_cursor):
+    cur = pg_cursor
+    cur.execute("INSERT INTO companies (name) VALUES ('Acme') RETURNING company_id")
+    company_id = cur.fetchone()[0]
+    cur.execute("INSERT INTO jobs (company_id, title) VALUES (%s, 'Data Engineer'), (%s, 'Analyst')", (company_id, company_id))
+    # Simulate rows that predate the trigger
+    cur.execute("ALTER TABLE jobs DISABLE TRIGGER trg_jobs_search_text")
+    cur.execute("UPDATE jobs SET search_text = NULL")
+    cur.execute("ALTER TABLE jobs ENABLE TRIGGER trg_jobs_search_text")
+
+    cur.execute("SELECT COUNT(*) FROM jobs")
+    job_count = cur.fetchone()[0]
+    cur.execute("SELECT backfill_job_search_text()")
+    assert cur.fetchone()[0] == job_count
+    cur.execute("SELECT COUNT(*) FROM jobs WHERE search_text IS NULL")
+    assert cur.fetchone()[0] == 0
+    cur.execute("SELECT search_text FROM jobs WHERE company_id = %s ORDER BY title", (company_id,))
+    assert [row[0] for row in cur.fetchall()] == ["acme analyst", "acme data engineer"]
+
+    # Nothing left to change on a second run
+    cur.execute("SELECT backfill_job_search_text()")
+    assert cur.fetchone()[0] == 0
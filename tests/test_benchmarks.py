@@ -0,0 +1,31 @@
+"""
+Smoke runs of the scripts in benchmarks/ at tiny sizes, so they keep working as the code changes
+"""
+
+from benchmarks import auth_throughput, cold_start, dashboard_aggregates, dashboard_load, render_cards
+
+
+def test_auth_throughput_runs():
+    results = auth_throughput.main(["--logins", "8", "--sessions", "4", "--rounds", "4"])
+    assert results["busy"] == 0 and results["pooled_per_second"] > 0
+
+
+def test_dashboard_aggregates_runs():
+    results = dashboard_aggregates.main(["--applications", "200", "--runs", "1"])
+    assert results["vectorized_ms"] > 0 and results["loop_ms"] > 0
+
+
+def test_cold_start_runs():
+    results = cold_start.main(["--runs", "1", "--top", "1"])
+    assert 0 < results["login_ms"] <= results["all_pages_ms"]
+
+
+def test_render_cards_runs():
+    results = render_cards.main(["--cards", "50", "--runs", "1"])
+    assert results["distinct_timelines"] > 0 and results["cached_warm_ms"] > 0
+
+
+def test_dashboard_load_runs():
+    results = dashboard_load.main(["--applications", "20", "300", "--latency-ms", "0"])
+    assert results[20]["per_application_requests"] == 20
+    assert results[300]["bulk_requests"] == 2
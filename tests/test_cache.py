@@ -0,0 +1,120 @@
+"""
+Tests for the TTL/LRU cache behind the per-user application lists
+"""
+
+import threading
+
+import pytest
+
+from utils import cache as cache_module
+from utils.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(maxsize=4, ttl=10.0)
+    cache.set("a", 1)
+
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_get_or_load_reloads_expired_entries(clock):
+    cache = TTLCache(maxsize=4, ttl=10.0)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return len(loads)
+
+    assert cache.get_or_load("a", load) == 1
+    assert cache.get_or_load("a", load) == 1
+    clock.now += 10.0
+    assert cache.get_or_load("a", load) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(maxsize=2, ttl=60.0)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") == 1 and cache.peek("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidation_during_load_keeps_the_result_out_of_the_cache(clock):
+    cache = TTLCache(maxsize=4, ttl=60.0)
+
+    def load_racing_a_write():
+        # A write for this user lands while the query is in flight
+        cache.invalidate(lambda key: key == "a")
+        return "stale"
+
+    assert cache.get_or_load("a", load_racing_a_write) == "stale"
+    assert cache.peek("a") is None
+    assert cache.get_or_load("a", lambda: "fresh") == "fresh"
+    assert cache.peek("a") == "fresh"
+
+
+def test_clear_during_load_keeps_the_result_out_of_the_cache(clock):
+    cache = TTLCache(maxsize=4, ttl=60.0)
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def slow_load():
+        started.set()
+        release.wait(5)
+        return "stale"
+
+    loader = threading.Thread(target=lambda: results.append(cache.get_or_load("a", slow_load)))
+    loader.start()
+    assert started.wait(5)
+    cache.clear()
+    release.set()
+    loader.join()
+
+    assert results == ["stale"]
+    assert cache.peek("a") is None
+
+
+def test_invalidate_drops_only_matching_keys(clock):
+    cache = TTLCache(maxsize=8, ttl=60.0)
+    for user_id in (1, 2, None):
+        cache.set(("applications", user_id), user_id)
+    cache.set(("companies", 1), "x")
+
+    assert cache.invalidate(lambda key: key[0] == "applications" and key[1] in (1, None)) == 2
+    assert cache.peek(("applications", 2)) == 2
+    assert cache.peek(("companies", 1)) == "x"
+
+
+def test_stats_report_hit_rate(clock):
+    cache = TTLCache(maxsize=4, ttl=60.0)
+    assert cache.stats()["hit_rate"] == 0.0
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 0.667, "evictions": 0, "size": 1, "maxsize": 4}
@@ -0,0 +1,26 @@
+"""
+Checks that the Login path stays light: a fresh interpreter importing only what app.py loads for
+an anonymous visitor must not pull in the libraries the signed-in pages need
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LOGIN_PATH = ["utils.database", "utils.auth", "pages.login"]
+DEFERRED = ["pandas", "streamlit_searchbox", "requests", "dateutil"]
+
+
+def test_login_path_does_not_import_deferred_libraries():
+    script = (
+        "import importlib, json, sys\n"
+        f"for name in {LOGIN_PATH!r}:\n"
+        "    importlib.import_module(name)\n"
+        f"print(json.dumps([name for name in {DEFERRED!r} if name in sys.modules]))\n"
+    )
+    # A subprocess, since this test session has long since imported all of them
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,211 @@
+"""
+Tests for company search: the pooled API client, autocomplete merging and local index seeding
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from utils.company_api import AutocompleteSearch, CompanySearchClient, merge_results
+from utils.company_index import CompanyIndex
+from utils.constants import COMPANY_API_PAGE_SIZE
+
+
+class StubAPI:
+    """Simplify-shaped company search served over http.server, counting requests per query"""
+
+    def __init__(self, companies, delay=0.0):
+        self.companies = companies
+        self.delay = delay
+        self.fail = False
+        self.hits = {}
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                value = parse_qs(urlsplit(self.path).query)["value"][0]
+                api.hits[value] = api.hits.get(value, 0) + 1
+                time.sleep(api.delay)
+                if api.fail:
+                    self.send_error(500)
+                    return
+                matches = [{"name": n} for n in api.companies if value.strip().lower() in n.lower()]
+                body = json.dumps({"items": matches[:COMPANY_API_PAGE_SIZE]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def api():
+    api = StubAPI(["Google", "Golden Corp", "GoDaddy", "Gojek", "Amazon"])
+    yield api
+    api.close()
+
+
+@pytest.fixture
+def client(api):
+    client = CompanySearchClient(base_url=api.url, index=CompanyIndex())
+    yield client
+    client.session.close()
+
+
+def test_concurrent_identical_queries_share_one_request(api, client):
+    api.delay = 0.2
+    results = [None] * 8
+    barrier = threading.Barrier(8)
+
+    def worker(i):
+        barrier.wait()
+        # Differently spelled forms of one query normalize to the same request
+        results[i] = client.search(" GOOGLE " if i % 2 else "google")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(api.hits.values()) == 1
+    assert all(_names(r) == ["Google"] for r in results)
+    assert _names(client.index.search("goog")) == ["Google"]
+
+
+def test_longer_query_reuses_a_complete_prefix_result(api, client):
+    assert len(client.search("go")) == 4
+    assert _names(client.search("gol")) == ["Golden Corp"]
+    assert _names(client.cached_results("goo")) == ["Google"]
+    assert api.hits == {"go": 1}
+
+
+def test_full_prefix_page_is_not_reused(api, client):
+    api.companies = [f"Go {i}" for i in range(COMPANY_API_PAGE_SIZE + 5)]
+    assert len(client.search("go")) == COMPANY_API_PAGE_SIZE
+    # The API may have truncated "go", so "go 2" could include companies it never returned
+    client.search("go 2")
+    assert api.hits == {"go": 1, "go 2": 1}
+
+
+def test_failures_are_not_cached(api, client):
+    api.fail = True
+    assert client.search("amazon") == []
+    api.fail = False
+    assert _names(client.search("amazon")) == ["Amazon"]
+    assert api.hits == {"amazon": 2}
+
+
+class FakeClient:
+    """Stands in for CompanySearchClient with fixed API answers per query"""
+
+    def __init__(self, index, answers, delay=0.0):
+        self.index = index
+        self.answers = answers
+        self.delay = delay
+        self.calls = []
+        self.cache = {}
+
+    def cached_results(self, query):
+        return self.cache.get(query)
+
+    def search(self, query, page=0):
+        self.calls.append(query)
+        time.sleep(self.delay)
+        return self.answers.get(query, [])
+
+
+def _names(companies):
+    return [c["name"] for c in companies]
+
+
+def test_merge_results_keeps_primary_order_and_drops_duplicates():
+    merged = merge_results(
+        [{"name": "Google"}],
+        [{"name": "google "}, {"name": "GoDaddy"}, {"name": "Gojek"}],
+        limit=2
+    )
+    assert _names(merged) == ["Google", "GoDaddy"]
+
+
+def test_partial_local_match_still_consults_the_api():
+    # Selecting "Golden Corp" indexes it, which must not hide every other "go" company
+    index = CompanyIndex()
+    index.add("Golden Corp")
+    client = FakeClient(index, {"go": [{"name": "Google"}, {"name": "Golden Corp"}, {"name": "GoDaddy"}]})
+    search = AutocompleteSearch(client, latency_budget=5)
+
+    assert _names(search.search("go", "caller")) == ["Golden Corp", "Google", "GoDaddy"]
+    assert client.calls == ["go"]
+
+
+def test_full_local_page_skips_the_api():
+    index = CompanyIndex()
+    index.add_many({"name": f"Go {i}"} for i in range(3))
+    client = FakeClient(index, {})
+    search = AutocompleteSearch(client, latency_budget=5)
+
+    assert len(search.search("go", "caller", limit=3)) == 3
+    assert client.calls == []
+
+
+def test_cached_results_fill_after_local_matches():
+    index = CompanyIndex()
+    index.add("Golden Corp")
+    client = FakeClient(index, {})
+    client.cache["go"] = [{"name": "Google"}]
+    search = AutocompleteSearch(client, latency_budget=5)
+
+    assert _names(search.search("go", "caller")) == ["Golden Corp", "Google"]
+    assert client.calls == []
+
+
+def test_slow_api_falls_back_to_local_matches():
+    index = CompanyIndex()
+    index.add("Golden Corp")
+    client = FakeClient(index, {"go": [{"name": "Google"}]}, delay=0.5)
+    search = AutocompleteSearch(client, latency_budget=0.05)
+
+    assert _names(search.search("go", "caller")) == ["Golden Corp"]
+
+
+def test_seed_once_retries_after_a_failed_read():
+    index = CompanyIndex()
+    assert index.seed_once(lambda: None) is False
+    assert not index.seeded
+
+    assert index.seed_once(lambda: [{"name": "Acme"}]) is True
+    assert index.seeded
+    assert _names(index.search("acme")) == ["Acme"]
+
+
+def test_seed_once_reads_the_table_once_under_concurrency():
+    index = CompanyIndex()
+    reads = []
+
+    def load():
+        reads.append(1)
+        time.sleep(0.05)
+        return [{"name": "Acme"}]
+
+    threads = [threading.Thread(target=index.seed_once, args=(load,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(reads) == 1 and index.seeded
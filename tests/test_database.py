@@ -0,0 +1,321 @@
+"""
+Tests for SupabaseClient that need no live database
+"""
+
+import threading
+import time
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from utils import database
+from utils.constants import DB_HEALTH_CHECK_INTERVAL
+
+
+@pytest.fixture
+def db(monkeypatch):
+    # Nothing listens on port 9; these tests never reach the network unless a check is forced
+    monkeypatch.setattr(database, "st", SimpleNamespace(secrets={"supabase": {"url": "http://127.0.0.1:9", "key": "x"}}))
+    client = database.SupabaseClient()
+    yield client
+    client.close()
+
+
+def test_new_client_does_not_check_health_immediately(db, monkeypatch):
+    monkeypatch.setattr(db, "health_check", lambda: pytest.fail("health check ran on a fresh client"))
+    assert db.is_healthy()
+
+
+def test_callers_get_cached_health_while_a_check_runs(db, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    checks = []
+
+    def slow_check():
+        checks.append(1)
+        started.set()
+        release.wait(5)
+        return False
+
+    monkeypatch.setattr(db, "health_check", slow_check)
+    db._last_health_check -= DB_HEALTH_CHECK_INTERVAL
+
+    checker = threading.Thread(target=db.is_healthy)
+    checker.start()
+    assert started.wait(5)
+
+    began = time.monotonic()
+    assert db.is_healthy() is True
+    assert time.monotonic() - began < 0.5
+
+    release.set()
+    checker.join()
+    assert checks == [1]
+    assert db.is_healthy() is False
+
+
+class FakeTable:
+    """In-memory table with PostgREST insert-or-ignore and select semantics, counting requests"""
+
+    def __init__(self, id_column, key_columns, defaults=None):
+        self.id_column = id_column
+        self.key_columns = key_columns
+        self.defaults = defaults or {}
+        self.rows = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def upsert(self, data, on_conflict, ignore_duplicates, default_to_null):
+        assert on_conflict.split(",") == self.key_columns and ignore_duplicates and not default_to_null
+
+        def execute():
+            with self.lock:
+                self.requests += 1
+                key = tuple(data[c] for c in self.key_columns)
+                time.sleep(0.001)
+                if key in self.rows:
+                    # ON CONFLICT DO NOTHING returns no row and leaves the existing one alone
+                    return SimpleNamespace(data=[])
+                self.rows[key] = {**self.defaults, **data, self.id_column: len(self.rows) + 1}
+                return SimpleNamespace(data=[dict(self.rows[key])])
+        return SimpleNamespace(execute=execute)
+
+    def select(self, columns):
+        table, filters = self, []
+
+        class Query:
+            def eq(self, column, value):
+                filters.append(lambda row: row.get(column) == value)
+                return self
+
+            def limit(self, count):
+                return self
+
+            def execute(self):
+                with table.lock:
+                    table.requests += 1
+                    matched = [row for row in table.rows.values() if all(f(row) for f in filters)]
+                    return SimpleNamespace(data=[dict(row) for row in matched[:1]])
+        return Query()
+
+
+@pytest.fixture
+def tables(db, monkeypatch):
+    tables = {
+        "companies": FakeTable("company_id", ["name"], {"industry": None, "location": None,
+                                                        "logo_url": database.DEFAULT_COMPANY_LOGO}),
+        "jobs": FakeTable("job_id", ["company_id", "title"], {"job_type": None, "location": None, "posted_date": None})
+    }
+    monkeypatch.setattr(db, "client", SimpleNamespace(table=tables.__getitem__))
+    monkeypatch.setattr(database, "company_index", database.company_index.__class__())
+    return tables
+
+
+def _run_concurrently(fn, count):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        results[i] = fn(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_new_company_takes_one_request(db, tables):
+    company_id = db.get_or_create_company("Acme", industry="Software", location="Berlin", logo_url="logo.png")
+    assert tables["companies"].requests == 1
+
+    row = tables["companies"].rows[("Acme",)]
+    assert (row["company_id"], row["industry"], row["location"], row["logo_url"]) == (company_id, "Software", "Berlin", "logo.png")
+    assert database.company_index.search("acme")[0]["logo"] == "logo.png"
+
+
+def test_existing_company_is_looked_up_and_left_alone(db, tables):
+    company_id = db.get_or_create_company("Acme")
+    assert db.get_or_create_company("Acme", industry="Retail", location="Berlin", logo_url="logo.png") == company_id
+    assert tables["companies"].requests == 3
+
+    # Like the create_application_full RPC and the bulk import, a conflict never changes the shared row
+    row = tables["companies"].rows[("Acme",)]
+    assert (row["industry"], row["location"], row["logo_url"]) == (None, None, database.DEFAULT_COMPANY_LOGO)
+
+
+def test_concurrent_get_or_create_company_shares_one_row(db, tables):
+    ids = _run_concurrently(
+        lambda i: db.get_or_create_company("Acme", industry=f"industry {i}", location=f"city {i}", logo_url=f"logo {i}"),
+        8
+    )
+    assert len(set(ids)) == 1 and None not in ids
+
+    (row,) = tables["companies"].rows.values()
+    # The caller whose insert won supplied every field
+    winner = row["industry"].split()[-1]
+    assert row["location"] == f"city {winner}" and row["logo_url"] == f"logo {winner}"
+
+
+def test_concurrent_get_or_create_job_shares_one_row(db, tables):
+    ids = _run_concurrently(lambda i: db.get_or_create_job(1, "Engineer", job_type=f"type {i}"), 8)
+    assert len(set(ids)) == 1 and None not in ids
+
+    (row,) = tables["jobs"].rows.values()
+    job_type = row["job_type"]
+    assert db.get_or_create_job(1, "Engineer", job_type="Contract", location="Remote") == ids[0]
+    assert (row["job_type"], row["location"]) == (job_type, None)
+
+
+class FakeJobLookup:
+    """jobs table answering bulk upserts and in_() lookups, recording each lookup's list sizes"""
+
+    def __init__(self, max_rows):
+        self.max_rows = max_rows
+        self.rows = {}
+        self.lookups = []
+
+    def upsert(self, rows, on_conflict, ignore_duplicates, default_to_null):
+        for row in rows:
+            self.rows.setdefault((row["company_id"], row["title"]), len(self.rows) + 1)
+        return SimpleNamespace(execute=lambda: SimpleNamespace(data=[]))
+
+    def select(self, columns):
+        table, filters = self, {}
+
+        class Query:
+            def in_(self, column, values):
+                filters[column] = list(values)
+                return self
+
+            def order(self, column):
+                return self
+
+            def range(self, start, end):
+                filters["range"] = (start, end)
+                return self
+
+            def execute(self):
+                table.lookups.append((len(filters["company_id"]), len(filters["title"])))
+                companies, titles = set(filters["company_id"]), set(filters["title"])
+                matched = sorted(
+                    (job_id, company_id, title) for (company_id, title), job_id in table.rows.items()
+                    if company_id in companies and title in titles
+                )
+                start, end = filters["range"]
+                matched = matched[start:min(end + 1, start + table.max_rows)]
+                return SimpleNamespace(data=[{"job_id": j, "company_id": c, "title": t} for j, c, t in matched])
+        return Query()
+
+
+def test_bulk_job_lookup_keeps_every_in_list_short(db, monkeypatch):
+    jobs_table = FakeJobLookup(max_rows=database.IMPORT_LOOKUP_PAGE_SIZE)
+    monkeypatch.setattr(db, "client", SimpleNamespace(table=lambda name: jobs_table))
+    # Rows already present under the same titles at other companies must not leak into the result
+    for company_id in range(1000, 1300):
+        for title in range(20):
+            jobs_table.rows[(company_id, f"Title {title}")] = len(jobs_table.rows) + 1
+
+    jobs = [{"company_id": i % 300, "title": f"Title {i // 300}"} for i in range(5000)]
+    job_ids = db.get_or_create_jobs_bulk(jobs)
+
+    assert job_ids == {(j["company_id"], j["title"]): jobs_table.rows[(j["company_id"], j["title"])] for j in jobs}
+    limit = database.IMPORT_LOOKUP_CHUNK_SIZE
+    assert all(companies <= limit and titles <= limit for companies, titles in jobs_table.lookups)
+
+
+class FakeStatusHistory:
+    """status_history table answering eq() and in_() selects, capping every response at max_rows like PostgREST"""
+
+    def __init__(self, max_rows, latency=0.0):
+        self.max_rows = max_rows
+        self.latency = latency
+        self.rows = {}
+        self.requests = []
+        self.next_id = 1
+
+    def add(self, application_id, count, start=date(2025, 1, 1)):
+        rows = self.rows.setdefault(application_id, [])
+        for i in range(count):
+            rows.append({"history_id": self.next_id, "application_id": application_id,
+                         "status": "Applied", "status_date": (start + timedelta(days=i)).isoformat()})
+            self.next_id += 1
+
+    def select(self, columns):
+        table, filters = self, {}
+
+        class Query:
+            def eq(self, column, value):
+                filters[column] = [value]
+                return self
+
+            def in_(self, column, values):
+                filters[column] = list(values)
+                return self
+
+            def order(self, column, desc=False):
+                return self
+
+            def range(self, start, end):
+                filters["range"] = (start, end)
+                return self
+
+            def execute(self):
+                time.sleep(table.latency)
+                ids = set(filters["application_id"])
+                table.requests.append(len(filters["application_id"]))
+                matched = sorted((row for i in ids for row in table.rows.get(i, [])),
+                                 key=lambda row: (row["status_date"], row["history_id"]), reverse=True)
+                start, end = filters.get("range", (0, len(matched)))
+                return SimpleNamespace(data=matched[start:min(end + 1, start + table.max_rows)])
+        return Query()
+
+
+def history_client(table):
+    """A SupabaseClient over a fake status_history table, without any connection setup"""
+    db = object.__new__(database.SupabaseClient)
+    db.client = SimpleNamespace(table=lambda name: table)
+    return db
+
+
+def test_bulk_status_history_chunks_ids_and_pages_past_max_rows():
+    table = FakeStatusHistory(max_rows=database.STATUS_HISTORY_PAGE_SIZE)
+    application_ids = list(range(1, 1001))
+    # Eight events each puts 1,600 rows behind every 200-id chunk, more than one response can carry
+    for application_id in application_ids:
+        table.add(application_id, 8)
+    table.add(5000, 3)
+
+    history = history_client(table).get_status_history_bulk(application_ids + [1001])
+
+    assert set(history) == set(application_ids) | {1001}
+    assert all(len(history[application_id]) == 8 for application_id in application_ids)
+    assert history[1001] == []
+    assert sum(len(events) for events in history.values()) == len(application_ids) * 8
+    assert max(table.requests) <= database.STATUS_HISTORY_CHUNK_SIZE
+    # Five full chunks needing a second page each, and the one leftover id in a chunk of its own
+    assert len(table.requests) == 5 * 2 + 1
+    events = history[1]
+    assert [e.status_date for e in events] == sorted((e.status_date for e in events), reverse=True)
+
+
+def test_bulk_status_history_failure_returns_empty_lists():
+    db = object.__new__(database.SupabaseClient)
+    db.client = SimpleNamespace(table=lambda name: 1 / 0)
+    assert db.get_status_history_bulk([1, 2, 2]) == {1: [], 2: []}
+
+
+def test_cache_stats_are_logged_at_most_once_per_interval(db, caplog):
+    db._app_cache.get_or_load(("applications", 1), lambda: [])
+    db._app_cache.get_or_load(("applications", 1), lambda: [])
+
+    with caplog.at_level("INFO", logger=database.__name__):
+        assert not db.log_cache_stats()
+        db._last_stats_log -= database.APPLICATION_CACHE_STATS_INTERVAL
+        assert db.log_cache_stats()
+        assert not db.log_cache_stats()
+
+    messages = [record.getMessage() for record in caplog.records if record.name == database.__name__]
+    assert messages == ["Application cache: 1 hits, 1 misses (hit rate 0.5), 0 evictions, 1/512 entries"]
@@ -0,0 +1,98 @@
+"""
+Tests for on-demand application export
+"""
+
+import csv
+import io
+import json
+from datetime import date
+
+import pyarrow.parquet as pq
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from utils.constants import EXPORT_FORMATS
+from utils.exporter import build_export
+from utils.records import Application, StatusEvent
+
+
+class FakeDB:
+    """Serves fixed pages the way SupabaseClient.iter_application_pages does"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def iter_application_pages(self, user_id, shape="export", include_history=False):
+        self.calls.append((user_id, shape, include_history))
+        yield from self.pages
+
+
+def make_app(app_id, status="Applied"):
+    return Application(
+        application_id=app_id,
+        current_status=status,
+        status_changed_date=date(2025, 1, 5),
+        title=f'Engineer "{app_id}", Senior',
+        company_name="Acme",
+        notes="line one\nline two",
+        status_history=[
+            StatusEvent(app_id, "Applied", date(2025, 1, 5), 2),
+            StatusEvent(app_id, "Saved", date(2025, 1, 1), 1, "bookmarked")
+        ]
+    )
+
+
+PAGES = [[make_app(3), make_app(2)], [make_app(1, "Saved")]]
+
+
+def download(file_format, include_history):
+    """Run the export exactly as the page's deferred download_button callable does"""
+    db = FakeDB(PAGES)
+    callable_data = lambda: build_export(db, 7, file_format, include_history)
+    data, _ = convert_data_to_bytes_and_infer_mime(callable_data(), unsupported_error=TypeError("unsupported"))
+    assert db.calls == [(7, "export", include_history)]
+    return data
+
+
+@pytest.mark.parametrize("file_format", list(EXPORT_FORMATS))
+@pytest.mark.parametrize("include_history", [False, True])
+def test_export_is_accepted_by_download_button(file_format, include_history):
+    assert download(file_format, include_history)
+
+
+def test_csv_export_rows_and_history():
+    rows = list(csv.DictReader(io.StringIO(download("CSV", True).decode("utf-8"))))
+    assert [row["Status"] for row in rows] == ["Applied", "Applied", "Saved"]
+    assert rows[0]["Title"] == 'Engineer "3", Senior'
+    assert rows[0]["Notes"] == "line one\nline two"
+    assert rows[0]["Status Date"] == "2025-01-05"
+    assert rows[0]["Status History"] == "Saved 2025-01-01; Applied 2025-01-05"
+
+
+def test_jsonl_export_keeps_history_oldest_first():
+    lines = download("JSONL", True).decode("utf-8").splitlines()
+    assert len(lines) == 3
+    first = json.loads(lines[0])
+    assert first["Status Date"] == "2025-01-05"
+    assert first["Status History"] == [
+        {"status": "Saved", "date": "2025-01-01", "notes": "bookmarked"},
+        {"status": "Applied", "date": "2025-01-05", "notes": None}
+    ]
+
+
+def test_parquet_export_writes_one_row_group_per_page():
+    parquet = pq.ParquetFile(io.BytesIO(download("Parquet", False)))
+    assert parquet.metadata.num_rows == 3
+    assert parquet.metadata.num_row_groups == len(PAGES)
+    assert "Status History" not in parquet.schema_arrow.names
+
+
+def test_export_failure_propagates():
+    class FailingDB:
+        def iter_application_pages(self, *args, **kwargs):
+            yield [make_app(1)]
+            raise RuntimeError("page read failed")
+
+    with pytest.raises(RuntimeError):
+        build_export(FailingDB(), 7, "CSV")
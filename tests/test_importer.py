@@ -0,0 +1,163 @@
+"""
+Tests for bulk import: row validation, streaming readers, and per-row error reporting across batches
+"""
+
+import io
+import json
+from datetime import date
+
+import pytest
+
+from utils import importer
+
+
+def _file(text: str):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+def test_parse_row_normalizes_headers_and_values():
+    record = importer.parse_row({
+        " Company ": " Acme ", "Role": "Engineer", "status": "interview", "Date": "2025-03-04",
+        "Job Type": "full-time", "Posted Date": "03/01/2025", "Notes": "", "unknown": "ignored"
+    })
+    assert record == {
+        "company_name": "Acme", "industry": None, "company_location": None, "logo_url": None,
+        "job_title": "Engineer", "job_type": "Full-time", "job_location": None, "posted_date": "2025-03-01",
+        "status_date": "2025-03-04", "current_status": "Interview", "notes": None
+    }
+
+
+def test_parse_row_defaults_status_and_date():
+    record = importer.parse_row({"company": "Acme", "title": "Engineer"})
+    assert record["current_status"] == "Applied"
+    assert record["status_date"] == date.today().isoformat()
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"title": "Engineer"}, "Company name is required"),
+    ({"company": "Acme", "title": "  "}, "Job title is required"),
+    ({"company": "A" * 201, "title": "Engineer"}, "company_name exceeds 200 characters"),
+    ({"company": "Acme", "title": "Engineer", "status": "Ghosted"}, "Invalid status: Ghosted"),
+    ({"company": "Acme", "title": "Engineer", "type": "Gig"}, "Invalid job type: Gig"),
+    ({"company": "Acme", "title": "Engineer", "date": "not a date"}, "Invalid date"),
+    ({"company": "Acme", "title": "Engineer", "date": "2025-01-01", "posted_date": "2025-02-01"},
+     "Job posted date cannot be after the application date"),
+])
+def test_parse_row_rejects_invalid_rows(row, message):
+    with pytest.raises(ValueError, match=message):
+        importer.parse_row(row)
+
+
+def test_read_rows_supports_every_format():
+    rows = [{"company": "Acme", "title": "Engineer"}, {"company": "Globex", "title": "Analyst"}]
+    csv_text = "﻿company,title\nAcme,Engineer\nGlobex,Analyst\n"
+    jsonl_text = "\n".join(json.dumps(row) for row in rows) + "\n\n"
+
+    assert list(importer.read_rows(_file(csv_text), "csv")) == rows
+    assert list(importer.read_rows(_file(jsonl_text), "jsonl")) == rows
+    assert list(importer.read_rows(_file(json.dumps(rows)), "json")) == rows
+    assert list(importer.read_rows(_file(json.dumps(rows[0])), "json")) == rows[:1]
+    with pytest.raises(ValueError, match="Unsupported"):
+        list(importer.read_rows(_file(""), "xlsx"))
+
+
+def test_json_array_is_decoded_incrementally(monkeypatch):
+    monkeypatch.setattr(importer, "IMPORT_JSON_READ_SIZE", 16)
+    rows = [{"company": f"Company {i}", "title": "Engineer", "notes": "] , [ {"} for i in range(1000)]
+    data = _file(" [\n" + ",\n".join(json.dumps(row) for row in rows) + "\n] \n")
+
+    reader = importer.read_rows(data, "json")
+    assert next(reader) == rows[0]
+    # Only the first few chunks have been read, not the whole array
+    assert data.tell() < len(data.getvalue()) // 2
+    assert [rows[0]] + list(reader) == rows
+
+
+@pytest.mark.parametrize("text, message", [
+    ('[{"company": "Acme"} {"company": "Globex"}]', "Expected ','"),
+    ('[{"company": "Acme"}', "Expected ','"),
+    ('[{"company": "Acme"}] trailing', "Unexpected data"),
+    ('[{"company": ', "Expecting value"),
+])
+def test_malformed_json_arrays_raise(text, message):
+    with pytest.raises(ValueError, match=message):
+        list(importer.read_rows(_file(text), "json"))
+
+
+def test_oversized_json_row_is_rejected(monkeypatch):
+    monkeypatch.setattr(importer, "IMPORT_JSON_READ_SIZE", 64)
+    monkeypatch.setattr(importer, "IMPORT_JSON_MAX_ROW_CHARS", 256)
+    text = json.dumps([{"company": "Acme", "title": "Engineer"}, {"company": "Acme", "notes": "x" * 1000}])
+
+    reader = importer.read_rows(_file(text), "json")
+    assert next(reader)["company"] == "Acme"
+    with pytest.raises(ValueError, match="exceeds 256 characters"):
+        next(reader)
+
+
+class FakeImportDB:
+    """Bulk create methods that assign ids, optionally failing to create a company or a whole batch"""
+
+    def __init__(self, missing_companies=(), reject_batches=()):
+        self.missing_companies = set(missing_companies)
+        self.reject_batches = set(reject_batches)
+        self.company_calls = []
+        self.application_batches = []
+
+    def get_or_create_companies_bulk(self, companies):
+        self.company_calls.append([company["name"] for company in companies])
+        return {c["name"]: hash(c["name"]) for c in companies if c["name"] not in self.missing_companies}
+
+    def get_or_create_jobs_bulk(self, jobs):
+        return {(job["company_id"], job["title"]): i for i, job in enumerate(jobs, start=1)}
+
+    def create_applications_bulk(self, user_id, applications):
+        self.application_batches.append(len(applications))
+        if len(self.application_batches) in self.reject_batches:
+            return []
+        return list(range(len(applications)))
+
+
+def _csv(rows):
+    return _file("company,title,status\n" + "".join(f"{c},{t},{s}\n" for c, t, s in rows))
+
+
+def test_errors_carry_one_based_row_numbers_across_batches():
+    rows = [("Acme", f"Job {i}", "Applied") for i in range(7)]
+    rows[1] = ("", "Job 1", "Applied")
+    rows[4] = ("Acme", "Job 4", "Ghosted")
+    rows[6] = ("Initech", "Job 6", "Applied")
+    db = FakeImportDB(missing_companies=["Initech"])
+    progress = []
+
+    result = importer.import_applications(db, 1, _csv(rows), "csv", batch_size=3,
+                                          on_progress=lambda processed, imported: progress.append((processed, imported)))
+
+    assert result["processed"] == 7 and result["imported"] == 4
+    assert result["errors"] == [
+        {"row": 2, "error": "Company name is required"},
+        {"row": 5, "error": "Invalid status: Ghosted"},
+        {"row": 7, "error": "Could not create company or job"},
+    ]
+    assert progress == [(3, 2), (6, 4), (7, 4)]
+    # Each company is resolved once, not once per row or per batch
+    assert db.company_calls == [["Acme"], ["Initech"]]
+
+
+def test_rejected_batch_reports_every_row_in_it():
+    rows = [("Acme", f"Job {i}", "Applied") for i in range(5)]
+    db = FakeImportDB(reject_batches=[2])
+
+    result = importer.import_applications(db, 1, _csv(rows), "csv", batch_size=2)
+
+    assert result["imported"] == 3
+    assert result["errors"] == [{"row": 3, "error": "Database rejected this batch"},
+                                {"row": 4, "error": "Database rejected this batch"}]
+    assert db.application_batches == [2, 2, 1]
+
+
+def test_non_object_json_elements_are_row_errors():
+    text = json.dumps([{"company": "Acme", "title": "Engineer"}, 42, ["Acme"]])
+    result = importer.import_applications(FakeImportDB(), 1, _file(text), "json")
+    assert result["imported"] == 1
+    assert [error["row"] for error in result["errors"]] == [2, 3]
@@ -0,0 +1,175 @@
+"""
+Tests for the logo thumbnail cache's guards against untrusted logo URLs
+"""
+
+import io
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from utils import logo_cache
+from utils.constants import DEFAULT_COMPANY_LOGO, LOGO_MAX_DOWNLOAD_BYTES
+from utils.logo_cache import LogoCache
+
+
+def _png(width, height):
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), "navy").save(out, format="PNG")
+    return out.getvalue()
+
+
+SMALL_PNG = _png(200, 100)
+# Over LOGO_MAX_IMAGE_PIXELS but under Pillow's own default limit, so only the cache's check stops it
+WIDE_PNG = _png(5000, 5000)
+
+
+def _serve(host):
+    """Start a logo server on host, returns (server, list of request paths it received)"""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            if self.path == "/logo.png":
+                self._send(SMALL_PNG)
+            elif self.path == "/wide.png":
+                self._send(WIDE_PNG)
+            elif self.path == "/big.png":
+                self._send(b"\0" * (LOGO_MAX_DOWNLOAD_BYTES + 1))
+            elif self.path == "/big-undeclared.png":
+                # No Content-Length, so only the streaming cap can stop it
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.end_headers()
+                self.close_connection = True
+                chunk = b"\0" * 65536
+                for _ in range(LOGO_MAX_DOWNLOAD_BYTES // len(chunk) + 2):
+                    self.wfile.write(chunk)
+            elif self.path.startswith("/redirect?to="):
+                self.send_response(302)
+                self.send_header("Location", self.path.split("=", 1)[1])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            else:
+                self.send_error(404)
+
+        def _send(self, body):
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(ThreadingHTTPServer):
+        def handle_error(self, request, client_address):
+            # The cache hangs up mid-body on oversized responses, which is the point
+            pass
+
+    server = Server((host, 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, hits
+
+
+@pytest.fixture
+def server():
+    server, hits = _serve("127.0.0.1")
+    yield f"http://127.0.0.1:{server.server_address[1]}", hits
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = LogoCache(directory=str(tmp_path), timeout=5)
+    yield cache
+    cache._executor.shutdown()
+    cache.session.close()
+
+
+@pytest.fixture
+def allow_loopback(monkeypatch):
+    monkeypatch.setattr(logo_cache, "is_public_address", lambda address: address == "127.0.0.1")
+
+
+def test_public_address_check():
+    assert logo_cache.is_public_address("93.184.216.34")
+    assert logo_cache.is_public_address("2606:2800:220:1:248:1893:25c8:1946")
+    for address in ["127.0.0.1", "10.0.0.5", "172.16.0.1", "192.168.1.1", "169.254.169.254",
+                    "0.0.0.0", "::1", "fe80::1", "fc00::1", "::ffff:127.0.0.1"]:
+        assert not logo_cache.is_public_address(address), address
+
+
+def test_loopback_is_refused_before_any_request(server, cache):
+    base, hits = server
+    url = f"{base}/logo.png"
+    assert cache.get(url) == url
+    assert hits == []
+    assert not os.listdir(cache.directory)
+
+
+def test_public_logo_is_cached_as_thumbnail(server, cache, allow_loopback):
+    base, _ = server
+    path = cache.get(f"{base}/logo.png")
+    assert path.startswith(cache.directory) and path.endswith(".png")
+    with Image.open(path) as image:
+        assert max(image.size) == cache.thumbnail_size
+
+
+def test_redirect_to_private_address_is_refused(cache, allow_loopback):
+    try:
+        internal, internal_hits = _serve("127.0.0.2")
+    except OSError:
+        pytest.skip("127.0.0.2 is not routable here")
+    public, public_hits = _serve("127.0.0.1")
+    try:
+        target = f"http://127.0.0.2:{internal.server_address[1]}/logo.png"
+        url = f"http://127.0.0.1:{public.server_address[1]}/redirect?to={target}"
+        assert cache.get(url) == url
+        assert public_hits and internal_hits == []
+    finally:
+        for s in (internal, public):
+            s.shutdown()
+            s.server_close()
+
+
+@pytest.mark.parametrize("name", ["big.png", "big-undeclared.png", "wide.png"])
+def test_oversized_logos_are_refused(server, cache, allow_loopback, name):
+    base, _ = server
+    url = f"{base}/{name}"
+    assert cache.get(url) == url
+    assert not [f for f in os.listdir(cache.directory) if f.endswith(".png")]
+
+
+def test_pillow_pixel_limit_is_left_at_its_default():
+    # Pillow's documented default; other image code in the process must not inherit the logo cap
+    assert Image.MAX_IMAGE_PIXELS == int(1024 * 1024 * 1024 // 4 // 3)
+
+
+def test_concurrent_gets_fetch_a_logo_once(server, cache, allow_loopback):
+    base, hits = server
+    url = f"{base}/logo.png"
+    paths = list(cache._executor.map(lambda _: cache.get(url), range(8)))
+    assert len(set(paths)) == 1 and paths[0].startswith(cache.directory)
+    assert hits == ["/logo.png"]
+
+
+def test_url_locks_do_not_grow_with_distinct_urls(cache, monkeypatch):
+    monkeypatch.setattr(cache, "_download", lambda url, path: False)
+    locks = list(cache._url_locks)
+    for i in range(500):
+        cache.get(f"https://example.com/{i}.png")
+    assert cache._url_locks == locks
+
+
+@pytest.mark.parametrize("url", ["file:///etc/passwd", "/etc/passwd", "ftp://example.com/logo.png"])
+def test_non_web_urls_fall_back_to_default_logo(cache, monkeypatch, url):
+    fetched = []
+    monkeypatch.setattr(cache, "_download", lambda u, path: fetched.append(u) or False)
+    assert cache.get(url) == DEFAULT_COMPANY_LOGO
+    assert fetched == [DEFAULT_COMPANY_LOGO]
@@ -0,0 +1,138 @@
+"""
+Payload budgets and column allowlists for the named read shapes in PROJECTIONS
+"""
+
+import json
+import re
+from datetime import date, timedelta
+
+import pytest
+
+from utils.constants import PROJECTIONS
+from utils.database import SupabaseClient
+
+APPLICATION_COUNT = 1000
+
+# Bytes per application with history embedded, about 7% above what each shape serializes to today
+# (select * is about 1,310). A column added to a shape shows up here as a budget failure
+BYTE_BUDGETS = {
+    "card": 620,
+    "dashboard": 490,
+    "export": 890
+}
+
+
+def _parse_select(select: str) -> dict:
+    """PostgREST select string -> {column: None or nested spec}, embeds keyed by table without hints"""
+    spec, stack, token = {}, [], ""
+    current = spec
+    for char in select + ",":
+        if char == "(":
+            nested = {}
+            current[token.strip().split("!")[0]] = nested
+            stack.append(current)
+            current, token = nested, ""
+        elif char in ",)":
+            if token.strip():
+                current[token.strip()] = None
+            token = ""
+            if char == ")":
+                current = stack.pop()
+        else:
+            token += char
+    return spec
+
+
+def _project(row, spec):
+    if isinstance(row, list):
+        return [_project(item, spec) for item in row]
+    return {column: row[column] if nested is None else _project(row[column], nested) for column, nested in spec.items()}
+
+
+def _full_row(i):
+    """Every column of an application with its job, company and three status changes"""
+    day = date(2025, 1, 1) + timedelta(days=i % 365)
+    return {
+        "application_id": i,
+        "user_id": 1,
+        "job_id": i,
+        "current_status": "Interview",
+        "status_changed_date": day.isoformat(),
+        "notes": f"Recruiter call scheduled, prepare system design and behavioural stories #{i} " * 2,
+        "created_at": f"{day.isoformat()}T09:30:00.000000+00:00",
+        "updated_at": f"{day.isoformat()}T09:30:00.000000+00:00",
+        "jobs": {
+            "job_id": i,
+            "company_id": i % 200,
+            "title": "Senior Software Engineer, Platform",
+            "job_type": "Full-time",
+            "location": "Berlin, Germany",
+            "posted_date": day.isoformat(),
+            "search_text": f"company {i % 200} senior software engineer, platform",
+            "companies": {
+                "company_id": i % 200,
+                "name": f"Company {i % 200}",
+                "industry": "Software",
+                "location": "Berlin, Germany",
+                "logo_url": f"https://storage.googleapis.com/simplify-imgs/company/{i % 200:08d}/logo.png",
+                "created_at": "2024-06-01T00:00:00+00:00"
+            }
+        },
+        "status_history": [
+            {
+                "history_id": i * 3 + k,
+                "application_id": i,
+                "status": status,
+                "status_date": day.isoformat(),
+                "notes": f"Moved to {status}",
+                "created_at": f"{day.isoformat()}T09:30:00+00:00"
+            }
+            for k, status in enumerate(["Saved", "Applied", "Interview"])
+        ]
+    }
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return [_full_row(i) for i in range(APPLICATION_COUNT)]
+
+
+def _select(shape):
+    client = object.__new__(SupabaseClient)
+    return client._application_columns(shape, include_history=True, inner=False)
+
+
+def _bytes_per_row(rows, shape):
+    payload = rows if shape == "full" else _project(rows, _parse_select(_select(shape)))
+    return len(json.dumps(payload, separators=(",", ":"))) / len(rows)
+
+
+@pytest.mark.parametrize("shape", list(BYTE_BUDGETS))
+def test_shape_payload_within_budget(rows, shape):
+    size = _bytes_per_row(rows, shape)
+    assert size <= BYTE_BUDGETS[shape], f"{shape}: {size:.0f} bytes per application"
+
+
+def test_card_and_dashboard_are_much_smaller_than_select_star(rows):
+    full = _bytes_per_row(rows, "full")
+    assert _bytes_per_row(rows, "card") < full * 0.5
+    assert _bytes_per_row(rows, "dashboard") < full * 0.4
+
+
+def _columns(shape):
+    return {column.strip() for columns in PROJECTIONS[shape].values() for column in columns.split(",")}
+
+
+def test_only_auth_reads_password_hashes():
+    assert [shape for shape in PROJECTIONS if "password_hash" in _columns(shape)] == ["auth"]
+
+
+def test_only_export_reads_notes():
+    assert [shape for shape in PROJECTIONS if "notes" in _columns(shape)] == ["export"]
+
+
+@pytest.mark.parametrize("shape", [s for s in PROJECTIONS if "applications" in PROJECTIONS[s]])
+def test_application_shapes_keep_keyset_columns(shape):
+    select = _parse_select(_select(shape))
+    assert {"application_id", "status_changed_date"} <= set(select)
+    assert re.fullmatch(r"[\w\s,!()]+", _select(shape))
@@ -0,0 +1,133 @@
+"""
+Checks that the cached timeline and badge fragments are byte-identical to the builders they replaced
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from utils import rendering
+from utils.constants import VALID_STATUSES
+from utils.records import format_date
+
+OLD_BADGE_COLORS = {
+    'Saved': 'background-color: #e3f2fd; color: #1976d2;',
+    'Applied': 'background-color: #fff3e0; color: #f57c00;',
+    'Interview': 'background-color: #f3e5f5; color: #7b1fa2;',
+    'Offer': 'background-color: #e8f5e9; color: #388e3c;',
+    'Rejected': 'background-color: #ffebee; color: #d32f2f;'
+}
+
+
+def old_timeline_stage(stage_name, is_active, date=None, is_first=False, is_last=False, next_is_active=False, is_rejected=False):
+    """render_timeline_stage as it was in pages/view_applications.py, uncached"""
+    if is_rejected:
+        circle_color = "#9e9e9e"
+        line_color_left = "#9e9e9e"
+        line_color_right = "#9e9e9e"
+        shadow = '0 0 0 2px #e0e0e0'
+    else:
+        circle_color = "#00bcd4" if is_active else "#e0e0e0"
+        line_color_left = "#00bcd4" if is_active else "#e0e0e0"
+        line_color_right = "#00bcd4" if next_is_active else "#e0e0e0"
+        shadow = '0 0 0 2px #e0f7fa' if is_active else 'none'
+
+    left_line = f'<div style="flex: 1; height: 2px; background: {line_color_left}; align-self: center; {"visibility: hidden;" if is_first else ""}" ></div>'
+    right_line = f'<div style="flex: 1; height: 2px; background: {line_color_right}; align-self: center; {"visibility: hidden;" if is_last else ""}" ></div>'
+
+    html = '<div style="flex: 1; display: flex; flex-direction: column; align-items: center; justify-content: flex-start;">'
+    html += f'<div style="font-size: 13px; color: #000; margin-bottom: 8px; font-weight: 600; white-space: nowrap; height: 15px;">{stage_name}</div>'
+    html += '<div style="display: flex; align-items: center; width: 100%; height: 16px;">'
+    html += left_line
+    html += f'<div style="width: 16px; height: 16px; min-width: 16px; border-radius: 50%; background: {circle_color}; border: 3px solid #fff; box-shadow: {shadow}; flex-shrink: 0;"></div>'
+    html += right_line
+    html += '</div>'
+    html += f'<div style="font-size: 12px; color: #555; margin-top: 6px; white-space: nowrap; height: 14px; font-weight: 600;">{date or ""}</div>'
+    html += '</div>'
+    return html
+
+
+def old_stage_date(stage, current_status, status_dates):
+    if stage == 'Saved':
+        return status_dates.get('Saved', status_dates.get('Applied'))
+    elif stage == 'Applied':
+        return None if current_status == 'Saved' else status_dates.get('Applied')
+    else:
+        return status_dates.get(stage)
+
+
+def old_timeline(status, status_dates):
+    """The per-card timeline loop from render_application_card before it moved to utils/rendering.py"""
+    if status == 'Rejected':
+        stages = VALID_STATUSES
+        current_stage_idx = stages.index(status) if status in stages else 1
+        is_rejected = True
+    else:
+        stages = [s for s in VALID_STATUSES if s != 'Rejected'] + ['_SPACER_']
+        current_stage_idx = stages.index(status) if status in stages else 1
+        is_rejected = False
+
+    timeline_parts = ['<div style="display: flex; align-items: center; width: 100%; gap: 0;">']
+
+    for idx, stage in enumerate(stages):
+        if stage == '_SPACER_':
+            timeline_parts.append('<div style="flex: 1; visibility: hidden;"></div>')
+        else:
+            stage_date = format_date(old_stage_date(stage, status, status_dates))
+            is_last_visible = (idx == len(stages) - 1) or (idx < len(stages) - 1 and stages[idx + 1] == '_SPACER_')
+            timeline_parts.append(old_timeline_stage(
+                stage,
+                idx <= current_stage_idx,
+                stage_date,
+                idx == 0,
+                is_last_visible,
+                (idx + 1) <= current_stage_idx,
+                is_rejected
+            ))
+
+    timeline_parts.append('</div>')
+    return ''.join(timeline_parts)
+
+
+def old_badge(status, label=None):
+    color_style = OLD_BADGE_COLORS.get(status, 'background-color: #f5f5f5; color: #666;')
+    return f"<span style='{color_style} padding: 3px 8px; border-radius: 4px; font-size: 0.85em; font-weight: 600;'>{label or status}</span>"
+
+
+def random_cards(seed, count):
+    """(status, status_dates) pairs like the ones View Applications renders, with repeats and gaps"""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    cards = []
+    for _ in range(count):
+        status = rng.choice(VALID_STATUSES + ["Withdrawn"])
+        status_dates = {
+            stage: start + timedelta(days=rng.randint(0, 60))
+            for stage in rng.sample(VALID_STATUSES, rng.randint(0, len(VALID_STATUSES)))
+        }
+        cards.append((status, status_dates))
+    return cards
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_timeline_is_byte_identical_to_old_builder(seed):
+    rendering._render_timeline.cache_clear()
+    rendering.render_timeline_stage.cache_clear()
+    for status, status_dates in random_cards(seed, 500):
+        # Twice, so both the cold render and the cached copy are checked
+        assert rendering.render_timeline(status, status_dates) == old_timeline(status, status_dates)
+        assert rendering.render_timeline(status, status_dates) == old_timeline(status, status_dates)
+
+
+def test_timeline_reuses_cached_html():
+    rendering._render_timeline.cache_clear()
+    for status, status_dates in random_cards(0, 200) * 2:
+        rendering.render_timeline(status, status_dates)
+    assert rendering._render_timeline.cache_info().hits >= 200
+
+
+@pytest.mark.parametrize("status", VALID_STATUSES + ["Unknown"])
+def test_status_badge_is_byte_identical_to_old_markup(status):
+    assert rendering.status_badge(status) == old_badge(status)
+    assert rendering.status_badge(status, f"{status} (Ghosted 12d)") == old_badge(status, f"{status} (Ghosted 12d)")
@@ -0,0 +1,76 @@
+"""
+Vectorized dashboard analytics
+Builds one columnar frame per request from Application records and computes the
+same raw aggregates as the get_dashboard_aggregates RPC in database_setup.sql
+"""
+
+import pandas as pd
+from typing import Dict, List
+from .constants import WEEKDAYS
+from .records import Application
+
+RESPONDED_STATUSES = ["Interview", "Offer", "Rejected"]
+
+
+def _to_datetime(values) -> pd.Series:
+    """Convert already-parsed dates into datetime64, missing values become NaT"""
+    return pd.to_datetime(pd.Series(values, dtype="object"))
+
+
+def build_frame(applications: List[Application], status_history_map: Dict) -> pd.DataFrame:
+    """One row per application with status_changed_date and latest 'Applied' history date"""
+    frame = pd.DataFrame({
+        "application_id": [app.application_id for app in applications],
+        "current_status": [app.current_status for app in applications],
+        "status_changed_date": _to_datetime([app.status_changed_date for app in applications])
+    })
+
+    applied = [
+        (application_id, event.status_date)
+        for application_id, events in status_history_map.items()
+        for event in events
+        if event.status == "Applied"
+    ]
+    history = pd.DataFrame(applied, columns=["application_id", "status_date"])
+    latest_applied = (
+        history.assign(status_date=_to_datetime(history["status_date"]))
+        .groupby("application_id")["status_date"]
+        .max()
+    )
+    frame["applied_date"] = latest_applied.reindex(frame["application_id"]).to_numpy()
+    return frame
+
+
+def _iso_date(value) -> str:
+    return None if pd.isna(value) else value.date().isoformat()
+
+
+def compute_aggregates(frame: pd.DataFrame) -> Dict:
+    """Raw dashboard aggregates for a frame from build_frame, matching get_dashboard_aggregates"""
+    by_status = frame["current_status"].value_counts()
+    submitted = frame[frame["current_status"] != "Saved"]
+    changed = submitted["status_changed_date"].dropna()
+    weekdays = changed.dt.weekday.value_counts()
+
+    responded = submitted[
+        submitted["current_status"].isin(RESPONDED_STATUSES)
+        & submitted["applied_date"].notna()
+        & submitted["status_changed_date"].notna()
+    ]
+    response_days = (responded["status_changed_date"] - responded["applied_date"]).dt.days
+    pending_applied = submitted.loc[submitted["current_status"] == "Applied", "applied_date"]
+
+    return {
+        "by_status": {status: int(count) for status, count in by_status.items() if count},
+        "weekday_counts": {WEEKDAYS[day]: int(count) for day, count in weekdays.items()},
+        "first_date": _iso_date(changed.min()),
+        "last_date": _iso_date(changed.max()),
+        "response_days_sum": int(response_days.sum()),
+        "response_days_count": int(len(response_days)),
+        "oldest_pending_applied": _iso_date(pending_applied.min())
+    }
+
+
+def compute_dashboard_aggregates(applications: List[Application], status_history_map: Dict) -> Dict:
+    """Build the frame and compute its aggregates in one call"""
+    return compute_aggregates(build_frame(applications, status_history_map))
@@ -5,19 +5,83 @@ Authentication utilities for user login and session management
 import streamlit as st
 import bcrypt
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from .constants import (
+    BCRYPT_ROUNDS, AUTH_WORKERS, AUTH_MAX_PENDING, AUTH_QUEUE_TIMEOUT,
+    LOGIN_EMAIL_BURST, LOGIN_EMAIL_REFILL_SECONDS, LOGIN_IP_BURST, LOGIN_IP_REFILL_SECONDS,
+    RATE_LIMIT_MAX_KEYS, TRUSTED_PROXY_HOPS
+)
 
 logger = logging.getLogger(__name__)
 
 
-def hash_password(password: str) -> str:
-    """Hash password using bcrypt"""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+class AuthBusyError(Exception):
+    """Raised when the password hashing pool is saturated"""
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
-    """Verify password against hashed password using bcrypt"""
+class TokenBucket:
+    """Thread-safe token buckets keyed by an identifier such as an email or IP address"""
+    
+    def __init__(self, burst: int, refill_seconds: float, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.burst = burst
+        self.refill_seconds = refill_seconds
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def consume(self, key: str) -> bool:
+        """Take one token for key, returns False if its bucket is empty"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) / self.refill_seconds)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            # Least recently seen keys go first; a forgotten key simply starts with a full bucket
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed
+
+
+_email_buckets = TokenBucket(LOGIN_EMAIL_BURST, LOGIN_EMAIL_REFILL_SECONDS)
+_ip_buckets = TokenBucket(LOGIN_IP_BURST, LOGIN_IP_REFILL_SECONDS)
+
+# bcrypt releases the GIL, so a small pool bounds CPU use while the script thread waits
+_hash_executor = ThreadPoolExecutor(max_workers=AUTH_WORKERS, thread_name_prefix="bcrypt")
+_hash_slots = threading.BoundedSemaphore(AUTH_MAX_PENDING)
+
+
+def _bcrypt_rounds() -> int:
+    """Cost factor from the optional [auth] secrets section, defaulting to BCRYPT_ROUNDS"""
+    try:
+        return int(st.secrets.get("auth", {}).get("bcrypt_rounds", BCRYPT_ROUNDS))
+    except Exception:
+        return BCRYPT_ROUNDS
+
+
+def _submit(fn, *args) -> Future:
+    """Queue a bcrypt call on the pool, raises AuthBusyError if too many are already waiting"""
+    if not _hash_slots.acquire(timeout=AUTH_QUEUE_TIMEOUT):
+        raise AuthBusyError("Too many sign-in requests right now, please try again shortly")
+    try:
+        future = _hash_executor.submit(fn, *args)
+    except Exception:
+        _hash_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_slots.release())
+    return future
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _verify(password: str, hashed_password: str) -> bool:
     try:
         return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
     except Exception as e:
@@ -25,6 +89,61 @@ def verify_password(password: str, hashed_password: str) -> bool:
         return False
 
 
+def hash_password_async(password: str) -> Future:
+    """Start hashing a password on the bcrypt pool, returns a Future for the hash"""
+    return _submit(_hash, password, _bcrypt_rounds())
+
+
+def hash_password(password: str) -> str:
+    """Hash password using bcrypt on the bounded worker pool"""
+    return hash_password_async(password).result()
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Verify password against hashed password using bcrypt on the bounded worker pool"""
+    return _submit(_verify, password, hashed_password).result()
+
+
+def _trusted_proxy_hops() -> int:
+    """Proxy hop count from the optional [auth] secrets section, defaulting to TRUSTED_PROXY_HOPS"""
+    try:
+        return max(0, int(st.secrets.get("auth", {}).get("trusted_proxy_hops", TRUSTED_PROXY_HOPS)))
+    except Exception:
+        return TRUSTED_PROXY_HOPS
+
+
+def forwarded_client(forwarded_for: str, hops: int) -> str:
+    """Client address from an X-Forwarded-For value, or "" if it can't be trusted"""
+    # Each of our proxies appends the address it saw, so only the last `hops` entries are genuine;
+    # anything to their left was sent by the client and could be anything
+    entries = [entry.strip() for entry in forwarded_for.split(",") if entry.strip()]
+    if hops <= 0 or len(entries) < hops:
+        return ""
+    return entries[-hops]
+
+
+def client_ip() -> str:
+    """Best-effort client IP for the current session"""
+    try:
+        forwarded = forwarded_client(st.context.headers.get("X-Forwarded-For", ""), _trusted_proxy_hops())
+        return forwarded or st.context.ip_address or "unknown"
+    except Exception:
+        return "unknown"
+
+
+def allow_login_attempt(email: str, ip: str = None) -> bool:
+    """Throttle password attempts per email and per client IP, returns False when either is exhausted"""
+    ip = ip or client_ip()
+    # Check the IP first so one address hammering many emails can't drain their buckets
+    if not _ip_buckets.consume(ip):
+        logger.warning(f"Login rate limit hit for IP {ip}")
+        return False
+    if not _email_buckets.consume(email):
+        logger.warning(f"Login rate limit hit for {email}")
+        return False
+    return True
+
+
 def init_session_state():
     """Initialize authentication session state variables"""
     st.session_state.setdefault('authenticated', False)
@@ -0,0 +1,51 @@
+"""
+Backfill trigger-maintained rollups for existing data
+Run from the project root so .streamlit/secrets.toml is found:
+
+    python -m utils.backfill                  # every user
+    python -m utils.backfill --user-id 42     # one user's rollups (jobs.search_text is always filled for all jobs)
+    python -m utils.backfill --metrics        # also reconcile user_metrics
+"""
+
+import argparse
+import logging
+import sys
+from .database import SupabaseClient
+from .logger_config import setup_logger
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    """Fill jobs.search_text, rebuild daily_activity (and optionally user_metrics), returns a process exit code"""
+    parser = argparse.ArgumentParser(description="Backfill jobs.search_text and the daily_activity rollup")
+    parser.add_argument("--user-id", type=int, default=None, help="only rebuild this user's rows")
+    parser.add_argument("--metrics", action="store_true", help="also reconcile the user_metrics counters")
+    args = parser.parse_args(argv)
+
+    setup_logger()
+    db = SupabaseClient()
+    try:
+        # Jobs are shared by every user, so the server-side search text is backfilled regardless of --user-id
+        updated = db.backfill_job_search_text()
+        if updated is None:
+            return 1
+        print(f"jobs.search_text: {updated} rows updated")
+
+        written = db.backfill_daily_activity(args.user_id)
+        if written is None:
+            return 1
+        print(f"daily_activity: {written} rows written")
+
+        if args.metrics:
+            fixed = db.reconcile_user_metrics(args.user_id)
+            if fixed is None:
+                return 1
+            print(f"user_metrics: {fixed} drifted rows fixed")
+        return 0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
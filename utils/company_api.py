@@ -5,42 +5,237 @@ Fetch company data from Simplify Jobs API
 
 import requests
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional
+from .cache import TTLCache
+from .company_index import CompanyIndex, company_index
+from .constants import (
+    COMPANY_API_TIMEOUT, COMPANY_API_POOL_SIZE, COMPANY_API_PAGE_SIZE,
+    COMPANY_CACHE_MAX_ENTRIES, COMPANY_CACHE_TTL, COMPANY_SEARCH_WORKERS, COMPANY_SEARCH_LATENCY_BUDGET
+)
 
 logger = logging.getLogger(__name__)
 
 SIMPLIFY_API_BASE = "https://api.simplify.jobs/v2/company/"
 
+MIN_QUERY_LENGTH = 2
 
-def search_companies(query, page=0):
-    """Search companies using Simplify Jobs API, returns list of company dicts"""
-    try:
-        url = f"{SIMPLIFY_API_BASE}?page={page}&value={query}"
-        response = requests.get(url, timeout=5)
+
+def normalize_query(query) -> str:
+    """Lowercase and collapse whitespace so equivalent queries share a cache entry"""
+    return " ".join(str(query or "").lower().split())
+
+
+def merge_results(primary: List[Dict], secondary: List[Dict], limit: int) -> List[Dict]:
+    """Primary results first, then secondary ones with a name not already listed, up to limit"""
+    merged = list(primary[:limit])
+    seen = {normalize_query(c.get('name')) for c in merged}
+    for company in secondary:
+        if len(merged) >= limit:
+            break
+        name = normalize_query(company.get('name'))
+        if name not in seen:
+            seen.add(name)
+            merged.append(company)
+    return merged
+
+
+class CompanySearchClient:
+    """Simplify company search with pooled connections, result caching and request coalescing"""
+    
+    def __init__(self, base_url: str = SIMPLIFY_API_BASE, timeout: float = COMPANY_API_TIMEOUT,
+                 pool_size: int = COMPANY_API_POOL_SIZE, cache_size: int = COMPANY_CACHE_MAX_ENTRIES,
+                 cache_ttl: float = COMPANY_CACHE_TTL, index: CompanyIndex = company_index):
+        self.base_url = base_url
+        self.index = index
+        self.timeout = timeout
         
-        if response.status_code == 200:
-            data = response.json()
-            
-            if isinstance(data, dict) and 'items' in data:
-                companies = data['items']
-            elif isinstance(data, dict) and 'data' in data:
-                companies = data['data']
-            elif isinstance(data, list):
-                companies = data
-            else:
-                companies = []
-            
-            logger.info(f"Found {len(companies)} companies for query: {query}")
-            return companies
-        else:
-            logger.error(f"API request failed with status {response.status_code}")
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
+        self._cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._inflight: Dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+    
+    def search(self, query, page: int = 0) -> List[Dict]:
+        """Search companies, answering from cache or a cached shorter prefix when possible"""
+        normalized = normalize_query(query)
+        if not normalized:
             return []
+        
+        key = (normalized, page)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        if page == 0:
+            reused = self._from_prefix(normalized)
+            if reused is not None:
+                self._cache.set(key, reused)
+                return reused
+        
+        return self._fetch_coalesced(key, query, page)
+    
+    def cached_results(self, query) -> Optional[List[Dict]]:
+        """Best cached answer for query without any network call, or None if nothing applies"""
+        normalized = normalize_query(query)
+        if not normalized:
+            return None
+        cached = self._cache.peek((normalized, 0))
+        if cached is not None:
+            return cached
+        return self._from_prefix(normalized)
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters for the result cache"""
+        return self._cache.stats()
+    
+    def _from_prefix(self, normalized: str) -> Optional[List[Dict]]:
+        """Filter a cached result for a shorter prefix, if that result was complete"""
+        for length in range(len(normalized) - 1, MIN_QUERY_LENGTH - 1, -1):
+            prefix_results = self._cache.peek((normalized[:length], 0))
+            if prefix_results is None:
+                continue
+            # A full page may have been truncated by the API, so it can't answer narrower queries
+            if len(prefix_results) >= COMPANY_API_PAGE_SIZE:
+                return None
+            return [c for c in prefix_results if normalized in normalize_query(c.get('name'))]
+        return None
+    
+    def _fetch_coalesced(self, key: tuple, query, page: int) -> List[Dict]:
+        """Fetch from the API, sharing one request between concurrent callers of the same query"""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        
+        if not owner:
+            return future.result()
+        
+        try:
+            companies = self._fetch(query, page)
+            if companies is not None:
+                self._cache.set(key, companies)
+                self.index.add_many(companies)
+            future.set_result(companies or [])
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return companies or []
+    
+    def _fetch(self, query, page: int) -> Optional[List[Dict]]:
+        """Call the API, returns None on failure so errors are never cached"""
+        try:
+            response = self.session.get(
+                self.base_url,
+                params={"page": page, "value": query},
+                timeout=self.timeout
+            )
             
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching companies from API: {str(e)}")
-        return []
-    except Exception as e:
-        logger.error(f"Unexpected error in company search: {str(e)}")
-        return []
+            if response.status_code == 200:
+                data = response.json()
+                
+                if isinstance(data, dict) and 'items' in data:
+                    companies = data['items']
+                elif isinstance(data, dict) and 'data' in data:
+                    companies = data['data']
+                elif isinstance(data, list):
+                    companies = data
+                else:
+                    companies = []
+                
+                logger.info(f"Found {len(companies)} companies for query: {query}")
+                return companies
+            else:
+                logger.error(f"API request failed with status {response.status_code}")
+                return None
+        
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching companies from API: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error in company search: {str(e)}")
+            return None
+
+
+class AutocompleteSearch:
+    """Runs company lookups on a background pool so a slow API never stalls the script thread
+    
+    The local index answers directly only when it fills the result list; otherwise its matches come
+    first and cached or API results fill the rest, since the index only holds companies seen so far.
+    Each caller (one per browser session) only ever waits for its latest keystroke: a newer
+    query cancels the caller's queued lookup and makes any older result stale. Lookups that
+    exceed the latency budget keep running to warm the cache while the caller gets cached
+    results instead
+    """
+    
+    def __init__(self, client: CompanySearchClient, max_workers: int = COMPANY_SEARCH_WORKERS,
+                 latency_budget: float = COMPANY_SEARCH_LATENCY_BUDGET):
+        self.client = client
+        self.latency_budget = latency_budget
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="company-search")
+        self._latest: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+    
+    def search(self, query, caller: str, limit: int = 10) -> List[Dict]:
+        """Return up to limit results for the caller's latest query within the latency budget"""
+        local = self.client.index.search(query, limit)
+        if len(local) >= limit:
+            return local
+        
+        cached = self.client.cached_results(query)
+        if cached is not None:
+            return merge_results(local, cached, limit)
+        
+        future = self._executor.submit(self.client.search, query)
+        with self._lock:
+            previous = self._latest.get(caller)
+            self._latest[caller] = (query, future)
+        if previous is not None:
+            previous[1].cancel()
+        
+        try:
+            results = future.result(timeout=self.latency_budget)
+        except FutureTimeoutError:
+            logger.info(f"Company search for '{query}' exceeded {self.latency_budget}s, using local and cached results")
+            return merge_results(local, self.client.cached_results(query) or [], limit)
+        except Exception as e:
+            logger.error(f"Company search failed: {str(e)}")
+            return local
+        
+        with self._lock:
+            latest = self._latest.get(caller)
+            if latest is not None and latest[1] is not future:
+                return []
+            self._latest.pop(caller, None)
+        return merge_results(local, results, limit)
+
+
+company_search_client = CompanySearchClient()
+company_autocomplete = AutocompleteSearch(company_search_client)
+
+
+def search_companies(query, page=0):
+    """Search companies using Simplify Jobs API, returns list of company dicts"""
+    return company_search_client.search(query, page)
+
+
+def find_companies(query):
+    """Search the local company index, consulting the Simplify API unless it has an exact match"""
+    local = company_index.search(query)
+    normalized = normalize_query(query)
+    if any(normalize_query(c.get('name')) == normalized for c in local):
+        return local
+    return merge_results(local, search_companies(query), COMPANY_API_PAGE_SIZE)
 
 
 def get_company_by_name(company_name):
@@ -0,0 +1,112 @@
+"""
+Local company directory index
+In-memory word-prefix index over known companies for offline autocomplete
+"""
+
+import logging
+import heapq
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional
+from .constants import COMPANY_INDEX_MAX_PREFIX, DEFAULT_COMPANY_LOGO
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(name) -> str:
+    return " ".join(str(name or "").lower().split())
+
+
+class CompanyIndex:
+    """Word-prefix index of company names, holding company dicts in the Simplify API shape"""
+
+    def __init__(self, max_prefix: int = COMPANY_INDEX_MAX_PREFIX):
+        self.max_prefix = max_prefix
+        self.seeded = False
+        self._companies: Dict[str, Dict] = {}
+        self._prefixes: Dict[str, set] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._seed_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._companies)
+
+    def add(self, name: str, logo: str = None, industry: str = None, location: str = None):
+        """Add or update one company; fields that are empty keep any value already indexed"""
+        key = _normalize(name)
+        if not key:
+            return
+        if logo == DEFAULT_COMPANY_LOGO:
+            logo = None
+
+        with self._lock:
+            existing = self._companies.get(key)
+            if existing is None:
+                self._companies[key] = {"name": name, "logo": logo, "industry": industry, "location": location}
+                for word in key.split():
+                    for length in range(1, min(len(word), self.max_prefix) + 1):
+                        self._prefixes[word[:length]].add(key)
+            else:
+                for field, value in (("logo", logo), ("industry", industry), ("location", location)):
+                    if value:
+                        existing[field] = value
+
+    def add_many(self, companies: Iterable[Dict]):
+        """Add company dicts from the API ('logo') or the companies table ('logo_url')"""
+        for company in companies:
+            self.add(
+                company.get("name"),
+                company.get("logo") or company.get("logo_url"),
+                company.get("industry"),
+                company.get("location")
+            )
+
+    def seed(self, companies: Iterable[Dict]):
+        """Load the full companies table once per process"""
+        self.add_many(companies)
+        self.seeded = True
+        logger.info(f"Company index seeded with {len(self)} companies")
+
+    def seed_once(self, load: Callable[[], Optional[Iterable[Dict]]]) -> bool:
+        """Seed from load() unless already seeded; a None result leaves the index unseeded for a retry"""
+        if self.seeded:
+            return True
+        # Separate from _lock so searches keep running while the table is read
+        with self._seed_lock:
+            if self.seeded:
+                return True
+            companies = load()
+            if companies is None:
+                return False
+            self.seed(companies)
+            return True
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Companies whose words start with every word of query, best matches first"""
+        words = _normalize(query).split()
+        if not words:
+            return []
+
+        with self._lock:
+            # Intersect the candidate sets, smallest first, then verify words longer than the indexed prefix
+            candidate_sets = sorted((self._prefixes.get(w[:self.max_prefix], set()) for w in words), key=len)
+            candidates = set(candidate_sets[0])
+            for other in candidate_sets[1:]:
+                candidates &= other
+
+            long_words = [w for w in words if len(w) > self.max_prefix]
+            if long_words:
+                candidates = [
+                    key for key in candidates
+                    if all(any(part.startswith(w) for part in key.split()) for w in long_words)
+                ]
+
+            query_text = " ".join(words)
+            best = heapq.nsmallest(
+                limit, candidates,
+                key=lambda key: (key != query_text, not key.startswith(query_text), len(key), key)
+            )
+            return [dict(self._companies[key]) for key in best]
+
+
+company_index = CompanyIndex()
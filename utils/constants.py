@@ -6,4 +6,135 @@ VALID_STATUSES = ["Saved", "Applied", "Interview", "Offer", "Rejected"]
 
 JOB_TYPES = ["Full-time", "Part-time", "Internship", "Contract", "Other"]
 
-DEFAULT_COMPANY_LOGO = "https://storage.googleapis.com/simplify-imgs/company/default/logo.png"
\ No newline at end of file
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+DEFAULT_COMPANY_LOGO = "https://storage.googleapis.com/simplify-imgs/company/default/logo.png"
+
+# Status history is fetched with `in_()` filters; keep each request's id list and
+# page within PostgREST's URL length and default max-rows limits
+STATUS_HISTORY_CHUNK_SIZE = 200
+STATUS_HISTORY_PAGE_SIZE = 1000
+
+# Shared Supabase HTTP connection pool; each can be overridden under [supabase] in secrets.toml
+DB_POOL_MAX_CONNECTIONS = 20
+DB_POOL_MAX_KEEPALIVE = 10
+DB_POOL_KEEPALIVE_EXPIRY = 30.0
+DB_REQUEST_TIMEOUT = 10.0
+DB_HEALTH_CHECK_INTERVAL = 60.0
+
+# Per-user application list cache on the shared client; overridable under [supabase] in secrets.toml.
+# Its hit/miss counters are logged at most once per stats interval
+APPLICATION_CACHE_MAX_ENTRIES = 512
+APPLICATION_CACHE_TTL = 300.0
+APPLICATION_CACHE_STATS_INTERVAL = 300.0
+
+# Bulk import: rows written per batch, values per `in_()` lookup when resolving ids, and rows per lookup page
+IMPORT_BATCH_SIZE = 500
+IMPORT_LOOKUP_CHUNK_SIZE = 100
+IMPORT_LOOKUP_PAGE_SIZE = 1000
+
+# JSON array import: characters read per chunk while streaming elements, and the largest single row accepted
+IMPORT_JSON_READ_SIZE = 64 * 1024
+IMPORT_JSON_MAX_ROW_CHARS = 1024 * 1024
+
+# View Applications pagination
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+DEFAULT_PAGE_SIZE = 25
+
+# Dashboard "Waiting Longest" list, read from the stale_applications view
+STALE_APPLICATIONS_LIMIT = 5
+
+# Daily activity rollup: rows per request when paging, and how far back the dashboard chart looks
+DAILY_ACTIVITY_PAGE_SIZE = 1000
+ACTIVITY_CHART_DAYS = 182
+
+# Export: rows per keyset page read from Supabase, and the offered formats (extension, MIME type)
+EXPORT_PAGE_SIZE = 500
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'JSONL': ('jsonl', 'application/x-ndjson'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+
+# Simplify company search client; the API returns at most COMPANY_API_PAGE_SIZE results per page
+COMPANY_API_TIMEOUT = 5
+COMPANY_API_POOL_SIZE = 10
+COMPANY_API_PAGE_SIZE = 20
+COMPANY_CACHE_MAX_ENTRIES = 1024
+COMPANY_CACHE_TTL = 3600.0
+
+# Autocomplete: keystroke debounce, background lookup threads, and the longest a keystroke waits
+COMPANY_SEARCH_DEBOUNCE_MS = 300
+COMPANY_SEARCH_WORKERS = 4
+COMPANY_SEARCH_LATENCY_BUDGET = 0.8
+
+# Local company index: word prefixes longer than this are verified by scan, and seed page size
+COMPANY_INDEX_MAX_PREFIX = 8
+COMPANY_INDEX_SEED_PAGE_SIZE = 1000
+
+# Company logo cache: thumbnails on local disk, evicted least-recently-used once over the size cap
+LOGO_CACHE_DIR = ".cache/logos"
+LOGO_CACHE_MAX_BYTES = 50 * 1024 * 1024
+LOGO_THUMBNAIL_SIZE = 96
+LOGO_FETCH_TIMEOUT = 5
+LOGO_FETCH_WORKERS = 8
+LOGO_FAILURE_TTL = 600.0
+LOGO_URL_LOCK_STRIPES = 64
+# Logo downloads are untrusted: caps on body size, decoded pixels and redirect hops
+LOGO_MAX_DOWNLOAD_BYTES = 2 * 1024 * 1024
+LOGO_MAX_IMAGE_PIXELS = 4096 * 4096
+LOGO_MAX_REDIRECTS = 3
+
+# Status pill colors shared by the recent-activity lists
+STATUS_BADGE_STYLES = {
+    'Saved': 'background-color: #e3f2fd; color: #1976d2;',
+    'Applied': 'background-color: #fff3e0; color: #f57c00;',
+    'Interview': 'background-color: #f3e5f5; color: #7b1fa2;',
+    'Offer': 'background-color: #e8f5e9; color: #388e3c;',
+    'Rejected': 'background-color: #ffebee; color: #d32f2f;'
+}
+DEFAULT_BADGE_STYLE = 'background-color: #f5f5f5; color: #666;'
+
+# Distinct timelines and badges kept by the rendering caches
+RENDER_CACHE_SIZE = 1024
+
+# Password hashing: bcrypt cost factor and the bounded pool that runs it off the script thread
+BCRYPT_ROUNDS = 12
+AUTH_WORKERS = 4
+AUTH_MAX_PENDING = 64
+AUTH_QUEUE_TIMEOUT = 5.0
+
+# Login throttling: token buckets per email and per client IP (burst size, seconds per new token)
+LOGIN_EMAIL_BURST = 5
+LOGIN_EMAIL_REFILL_SECONDS = 60.0
+LOGIN_IP_BURST = 20
+LOGIN_IP_REFILL_SECONDS = 6.0
+RATE_LIMIT_MAX_KEYS = 10000
+# Reverse proxies in front of the app that append to X-Forwarded-For; overridable under [auth] in secrets.toml
+TRUSTED_PROXY_HOPS = 1
+
+# Named read shapes for SupabaseClient: the only columns fetched per table for each consumer.
+# Every applications shape keeps application_id and status_changed_date for keyset paging
+PROJECTIONS = {
+    'card': {
+        'applications': 'application_id, user_id, current_status, status_changed_date',
+        'jobs': 'title',
+        'companies': 'name, location, logo_url',
+        'status_history': 'history_id, application_id, status, status_date'
+    },
+    'dashboard': {
+        'applications': 'application_id, current_status, status_changed_date',
+        'jobs': 'title',
+        'companies': 'name',
+        'status_history': 'history_id, application_id, status, status_date'
+    },
+    'export': {
+        'applications': 'application_id, current_status, status_changed_date, notes',
+        'jobs': 'title, job_type, location, posted_date',
+        'companies': 'name, industry, location',
+        'status_history': 'history_id, application_id, status, status_date, notes'
+    },
+    'auth': {
+        'users': 'user_id, name, email, password_hash'
+    }
+}
@@ -4,11 +4,25 @@ Handles all CRUD operations and business logic
 """
 
 import streamlit as st
-from supabase import create_client, Client
-from datetime import datetime
+import httpx
+from supabase import create_client, Client, ClientOptions
+from datetime import datetime, date
 import logging
-from typing import List, Dict, Optional
-from .constants import VALID_STATUSES
+import threading
+import time
+from typing import Iterator, List, Dict, Optional
+from .constants import (
+    VALID_STATUSES, WEEKDAYS, DEFAULT_COMPANY_LOGO, STATUS_HISTORY_CHUNK_SIZE, STATUS_HISTORY_PAGE_SIZE,
+    DB_POOL_MAX_CONNECTIONS, DB_POOL_MAX_KEEPALIVE, DB_POOL_KEEPALIVE_EXPIRY,
+    DB_REQUEST_TIMEOUT, DB_HEALTH_CHECK_INTERVAL,
+    APPLICATION_CACHE_MAX_ENTRIES, APPLICATION_CACHE_TTL, APPLICATION_CACHE_STATS_INTERVAL,
+    IMPORT_LOOKUP_CHUNK_SIZE, IMPORT_LOOKUP_PAGE_SIZE,
+    COMPANY_INDEX_SEED_PAGE_SIZE, PROJECTIONS, EXPORT_PAGE_SIZE, STALE_APPLICATIONS_LIMIT,
+    DAILY_ACTIVITY_PAGE_SIZE
+)
+from .cache import TTLCache
+from .company_index import company_index
+from .records import Application, StatusEvent, parse_date
 
 logger = logging.getLogger(__name__)
 
@@ -18,29 +32,81 @@ class SupabaseClient:
     
     def __init__(self):
         try:
-            url = st.secrets["supabase"]["url"]
-            key = st.secrets["supabase"]["key"]
-            self.client: Client = create_client(url, key)
+            config = st.secrets["supabase"]
+            url = config["url"]
+            key = config["key"]
+            
+            # One bounded, thread-safe pool shared by every session using this client
+            self.http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=int(config.get("pool_max_connections", DB_POOL_MAX_CONNECTIONS)),
+                    max_keepalive_connections=int(config.get("pool_max_keepalive", DB_POOL_MAX_KEEPALIVE)),
+                    keepalive_expiry=float(config.get("pool_keepalive_expiry", DB_POOL_KEEPALIVE_EXPIRY))
+                ),
+                timeout=float(config.get("request_timeout", DB_REQUEST_TIMEOUT)),
+                follow_redirects=True,
+                http2=True
+            )
+            self.client: Client = create_client(url, key, options=ClientOptions(httpx_client=self.http_client))
+            
+            self._app_cache = TTLCache(
+                maxsize=int(config.get("cache_max_entries", APPLICATION_CACHE_MAX_ENTRIES)),
+                ttl=float(config.get("cache_ttl", APPLICATION_CACHE_TTL))
+            )
+            self._stats_lock = threading.Lock()
+            self._last_stats_log = time.monotonic()
+            self._health_lock = threading.Lock()
+            # A client that just connected counts as healthy until the first interval has passed
+            self._last_health_check = time.monotonic()
+            self._healthy = True
             logger.info("Supabase client initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Supabase client: {str(e)}")
             raise
     
+    def health_check(self) -> bool:
+        """Run a minimal query to confirm the database is reachable"""
+        try:
+            self.client.table("companies").select("company_id").limit(1).execute()
+            return True
+        except Exception as e:
+            logger.error(f"Database health check failed: {str(e)}")
+            return False
+    
+    def is_healthy(self) -> bool:
+        """Return the cached health status, re-checking at most once per DB_HEALTH_CHECK_INTERVAL"""
+        if time.monotonic() - self._last_health_check < DB_HEALTH_CHECK_INTERVAL:
+            return self._healthy
+        # One caller runs the query; everyone else keeps the last known status instead of waiting on it
+        if not self._health_lock.acquire(blocking=False):
+            return self._healthy
+        try:
+            if time.monotonic() - self._last_health_check >= DB_HEALTH_CHECK_INTERVAL:
+                self._healthy = self.health_check()
+                self._last_health_check = time.monotonic()
+            return self._healthy
+        finally:
+            self._health_lock.release()
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        self.http_client.close()
+        logger.info("Supabase client closed")
+    
     
     def create_user_with_password(self, name: str, email: str, password_hash: str) -> Optional[int]:
         """Create new user with hashed password, returns user_id or None if exists"""
         try:
-            result = self.client.table("users").select("user_id").eq("email", email).execute()
-            
-            if result.data:
-                logger.warning(f"User already exists with email: {email}")
-                return None
-            
-            result = self.client.table("users").insert({
+            # ON CONFLICT (email) DO NOTHING RETURNING user_id: a taken email comes back as no rows
+            result = self.client.table("users").upsert({
                 "name": name,
                 "email": email,
                 "password_hash": password_hash
-            }).execute()
+            }, on_conflict="email", ignore_duplicates=True).execute()
+            
+            if not result.data:
+                logger.warning(f"User already exists with email: {email}")
+                return None
             
             logger.info(f"Created new user with authentication: {email}")
             return result.data[0]["user_id"]
@@ -48,10 +114,19 @@ class SupabaseClient:
             logger.error(f"Error in create_user_with_password: {str(e)}")
             return None
     
+    def email_exists(self, email: str) -> bool:
+        """Check whether an account already uses this email"""
+        try:
+            result = self.client.table("users").select("user_id").eq("email", email).limit(1).execute()
+            return bool(result.data)
+        except Exception as e:
+            logger.error(f"Error in email_exists: {str(e)}")
+            return False
+    
     def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Fetch user data by email"""
         try:
-            result = self.client.table("users").select("*").eq("email", email).execute()
+            result = self.client.table("users").select(self.projection("auth", "users")).eq("email", email).execute()
             
             if result.data:
                 return result.data[0]
@@ -61,50 +136,74 @@ class SupabaseClient:
             return None
     
     def get_or_create_company(self, name: str, industry: str = None, location: str = None, logo_url: str = None) -> Optional[int]:
-        """Get existing company or create new one"""
+        """Get existing company or create new one; an existing company's details are never changed"""
         try:
-            result = self.client.table("companies").select("company_id").eq("name", name).execute()
-            
-            if result.data:
-                return result.data[0]["company_id"]
+            company_data = {"name": name}
+            if industry:
+                company_data["industry"] = industry
+            if location:
+                company_data["location"] = location
+            # The column default is already the placeholder logo
+            if logo_url and logo_url != DEFAULT_COMPANY_LOGO:
+                company_data["logo_url"] = logo_url
             
-            result = self.client.table("companies").insert({
-                "name": name,
-                "industry": industry,
-                "location": location,
-                "logo_url": logo_url
-            }).execute()
+            # DO NOTHING on conflict, like the bulk import path: a new company comes back in this one request,
+            # and only an existing one needs a lookup
+            result = self.client.table("companies").upsert(
+                company_data, on_conflict="name", ignore_duplicates=True, default_to_null=False
+            ).execute()
+            if not result.data:
+                result = self.client.table("companies").select(
+                    "company_id, name, industry, location, logo_url"
+                ).eq("name", name).limit(1).execute()
             
-            logger.info(f"Created new company: {name}")
+            company_index.add_many(result.data)
             return result.data[0]["company_id"]
         except Exception as e:
             logger.error(f"Error in get_or_create_company: {str(e)}")
             return None
     
+    def get_all_companies(self) -> Optional[List[Dict]]:
+        """Fetch every company's name and details, paged, for seeding the local company index; None on failure"""
+        try:
+            companies = []
+            offset = 0
+            while True:
+                result = self.client.table("companies").select(
+                    "name, industry, location, logo_url"
+                ).order("company_id").range(offset, offset + COMPANY_INDEX_SEED_PAGE_SIZE - 1).execute()
+                companies.extend(result.data)
+                if len(result.data) < COMPANY_INDEX_SEED_PAGE_SIZE:
+                    break
+                offset += COMPANY_INDEX_SEED_PAGE_SIZE
+            return companies
+        except Exception as e:
+            logger.error(f"Error in get_all_companies: {str(e)}")
+            return None
+    
     def get_or_create_job(self, company_id: int, title: str, job_type: str = None, 
                           location: str = None, posted_date: datetime = None) -> Optional[int]:
-        """Get existing job or create new one"""
+        """Get existing job or create new one; an existing job's details are never changed"""
         try:
-            result = self.client.table("jobs").select("job_id").eq(
-                "company_id", company_id
-            ).eq("title", title).execute()
-            
-            if result.data:
-                return result.data[0]["job_id"]
-            
             job_data = {
                 "company_id": company_id,
-                "title": title,
-                "job_type": job_type,
-                "location": location
+                "title": title
             }
-            
+            if job_type:
+                job_data["job_type"] = job_type
+            if location:
+                job_data["location"] = location
             if posted_date:
                 job_data["posted_date"] = posted_date.isoformat()
             
-            result = self.client.table("jobs").insert(job_data).execute()
+            result = self.client.table("jobs").upsert(
+                job_data, on_conflict="company_id,title", ignore_duplicates=True, default_to_null=False
+            ).execute()
+            if not result.data:
+                result = self.client.table("jobs").select("job_id").eq(
+                    "company_id", company_id
+                ).eq("title", title).limit(1).execute()
             
-            logger.info(f"Created new job: {title} at company_id {company_id}")
             return result.data[0]["job_id"]
         except Exception as e:
             logger.error(f"Error in get_or_create_job: {str(e)}")
@@ -135,29 +234,317 @@ class SupabaseClient:
                 self.log_status_change(application_id, "Saved", status_date, "")
                 self.log_status_change(application_id, current_status, status_date, notes or "")
             
+            self.invalidate_applications(user_id)
             logger.info(f"Created application {application_id}")
             return True
         except Exception as e:
             logger.error(f"Error creating application: {str(e)}")
             return False
     
-    def get_all_applications(self, user_id: int = None, status_filter: str = None) -> List[Dict]:
-        """Get all applications for a user with joined data"""
+    def create_application_full(self, user_id: int, company_name: str, job_title: str, status_date,
+                                current_status: str, industry: str = None, company_location: str = None,
+                                logo_url: str = None, job_type: str = None, job_location: str = None,
+                                posted_date=None, notes: str = None) -> Optional[int]:
+        """Create company, job, application and status history in one transactional RPC, returns application_id"""
         try:
-            query = self.client.table("applications").select(
-                "*, jobs(*, companies(*)), users(*)"
+            if current_status not in VALID_STATUSES:
+                logger.error(f"Invalid status: {current_status}")
+                return None
+            
+            result = self.client.rpc("create_application_full", {
+                "p_user_id": user_id,
+                "p_company_name": company_name,
+                "p_job_title": job_title,
+                "p_status_date": status_date.isoformat() if hasattr(status_date, 'isoformat') else status_date,
+                "p_current_status": current_status,
+                "p_industry": industry,
+                "p_company_location": company_location,
+                "p_logo_url": logo_url,
+                "p_job_type": job_type,
+                "p_job_location": job_location,
+                "p_posted_date": posted_date.isoformat() if hasattr(posted_date, 'isoformat') else posted_date,
+                "p_notes": notes
+            }).execute()
+            
+            application_id = result.data
+            company_index.add(company_name, logo_url, industry, company_location)
+            self.invalidate_applications(user_id)
+            logger.info(f"Created application {application_id} via create_application_full")
+            return application_id
+        except Exception as e:
+            logger.error(f"Error in create_application_full: {str(e)}")
+            return None
+    
+    def get_or_create_companies_bulk(self, companies: List[Dict]) -> Dict[str, int]:
+        """Insert any missing companies in one request and return {name: company_id} for all of them"""
+        try:
+            if not companies:
+                return {}
+            
+            # DO NOTHING on conflict so an import never overwrites details of existing companies
+            self.client.table("companies").upsert(
+                companies, on_conflict="name", ignore_duplicates=True, default_to_null=False
+            ).execute()
+            
+            names = [c["name"] for c in companies]
+            company_ids = {}
+            for start in range(0, len(names), IMPORT_LOOKUP_CHUNK_SIZE):
+                result = self.client.table("companies").select("company_id, name").in_(
+                    "name", names[start:start + IMPORT_LOOKUP_CHUNK_SIZE]
+                ).execute()
+                company_ids.update({row["name"]: row["company_id"] for row in result.data})
+            
+            company_index.add_many(c for c in companies if c["name"] in company_ids)
+            logger.info(f"Resolved {len(company_ids)} companies in bulk")
+            return company_ids
+        except Exception as e:
+            logger.error(f"Error in get_or_create_companies_bulk: {str(e)}")
+            return {}
+    
+    def get_or_create_jobs_bulk(self, jobs: List[Dict]) -> Dict[tuple, int]:
+        """Insert any missing jobs in one request and return {(company_id, title): job_id} for all of them"""
+        try:
+            if not jobs:
+                return {}
+            
+            self.client.table("jobs").upsert(
+                jobs, on_conflict="company_id,title", ignore_duplicates=True, default_to_null=False
+            ).execute()
+            
+            wanted = sorted({(j["company_id"], j["title"]) for j in jobs})
+            job_ids = {}
+            # Chunk the (company_id, title) pairs so both in_() lists stay short; sorting keeps each chunk's
+            # companies few. Other pairs from the cross product are dropped, and paging covers the rare
+            # chunk whose cross product exceeds PostgREST's max rows
+            for start in range(0, len(wanted), IMPORT_LOOKUP_CHUNK_SIZE):
+                chunk = set(wanted[start:start + IMPORT_LOOKUP_CHUNK_SIZE])
+                company_ids = list({company_id for company_id, _ in chunk})
+                titles = list({title for _, title in chunk})
+                offset = 0
+                while True:
+                    result = self.client.table("jobs").select("job_id, company_id, title").in_(
+                        "company_id", company_ids
+                    ).in_("title", titles).order("job_id").range(
+                        offset, offset + IMPORT_LOOKUP_PAGE_SIZE - 1
+                    ).execute()
+                    job_ids.update({
+                        (row["company_id"], row["title"]): row["job_id"]
+                        for row in result.data if (row["company_id"], row["title"]) in chunk
+                    })
+                    if len(result.data) < IMPORT_LOOKUP_PAGE_SIZE:
+                        break
+                    offset += IMPORT_LOOKUP_PAGE_SIZE
+            
+            logger.info(f"Resolved {len(job_ids)} jobs in bulk")
+            return job_ids
+        except Exception as e:
+            logger.error(f"Error in get_or_create_jobs_bulk: {str(e)}")
+            return {}
+    
+    def create_applications_bulk(self, user_id: int, applications: List[Dict]) -> List[int]:
+        """Insert applications and their status history in batch requests, returns new application_ids in order"""
+        try:
+            if not applications:
+                return []
+            
+            result = self.client.table("applications").insert([{
+                "job_id": app["job_id"],
+                "user_id": user_id,
+                "status_changed_date": app["status_changed_date"],
+                "current_status": app["current_status"],
+                "notes": app.get("notes")
+            } for app in applications]).execute()
+            
+            application_ids = [row["application_id"] for row in result.data]
+            
+            history_rows = []
+            for application_id, app in zip(application_ids, applications):
+                status = app["current_status"]
+                notes = app.get("notes") or ""
+                if status == "Saved":
+                    history_rows.append({"application_id": application_id, "status": "Saved",
+                                         "status_date": app["status_changed_date"], "notes": notes})
+                else:
+                    history_rows.append({"application_id": application_id, "status": "Saved",
+                                         "status_date": app["status_changed_date"], "notes": ""})
+                    history_rows.append({"application_id": application_id, "status": status,
+                                         "status_date": app["status_changed_date"], "notes": notes})
+            try:
+                self.client.table("status_history").insert(history_rows).execute()
+            except Exception:
+                # Don't leave applications without history behind when the second insert fails
+                self.client.table("applications").delete().in_("application_id", application_ids).execute()
+                raise
+            
+            self.invalidate_applications(user_id)
+            logger.info(f"Created {len(application_ids)} applications in bulk")
+            return application_ids
+        except Exception as e:
+            logger.error(f"Error in create_applications_bulk: {str(e)}")
+            return []
+    
+    def get_all_applications(self, user_id: int = None, status_filter: str = None,
+                             include_history: bool = False, history_limit: int = None,
+                             limit: int = None, after: tuple = None, search: str = None,
+                             statuses: List[str] = None, job_types: List[str] = None,
+                             shape: str = "card") -> List[Application]:
+        """Get applications for a user with joined data as Application records, newest first
+        
+        Pass limit and the (status_changed_date, application_id) of the last row seen as
+        after to read one keyset page at a time; include_history embeds status history.
+        search, statuses and job_types are applied by PostgREST, not in Python.
+        shape names a PROJECTIONS entry; fields outside it keep their record defaults
+        """
+        try:
+            filters = self._filter_key(status_filter, search, statuses, job_types)
+            key = ("applications", user_id, filters, include_history, history_limit, limit, after, shape)
+            return self._app_cache.get_or_load(
+                key,
+                lambda: self._fetch_applications(user_id, filters, include_history, history_limit, limit, after, shape)
             )
-            if user_id is not None:
-                query = query.eq("user_id", user_id)
-            if status_filter and status_filter != "All":
-                query = query.eq("current_status", status_filter)
-            result = query.order("status_changed_date", desc=True).execute()
-            return result.data
         except Exception as e:
             logger.error(f"Error fetching applications: {str(e)}")
             return []
     
-    def update_application_status(self, application_id: int, new_status: str, status_date, notes: str = None) -> bool:
+    def count_applications(self, user_id: int = None, status_filter: str = None, search: str = None,
+                           statuses: List[str] = None, job_types: List[str] = None) -> int:
+        """Count applications matching the same filters as get_all_applications"""
+        try:
+            filters = self._filter_key(status_filter, search, statuses, job_types)
+            
+            def load():
+                columns = "application_id, jobs!inner(job_id)" if self._filters_jobs(filters) else "application_id"
+                query = self.client.table("applications").select(columns, count="exact", head=True)
+                return self._filter_applications(query, user_id, filters).execute().count or 0
+            
+            return self._app_cache.get_or_load(("applications", user_id, "count", filters), load)
+        except Exception as e:
+            logger.error(f"Error counting applications: {str(e)}")
+            return 0
+    
+    @staticmethod
+    def page_cursor(applications: List[Application]) -> Optional[tuple]:
+        """Keyset cursor for the page after the given rows, or None if there are none"""
+        if not applications:
+            return None
+        last = applications[-1]
+        return (last.status_changed_date.isoformat(), last.application_id)
+    
+    def iter_application_pages(self, user_id: int, shape: str = "export", include_history: bool = False,
+                               page_size: int = EXPORT_PAGE_SIZE) -> Iterator[List[Application]]:
+        """Yield every application for a user one keyset page at a time, bypassing the list cache"""
+        filters = self._filter_key(None, None, None, None)
+        after = None
+        while True:
+            try:
+                page = self._fetch_applications(user_id, filters, include_history, None, page_size, after, shape)
+            except Exception as e:
+                # A silently short export is worse than a failed one, so let the caller see this
+                logger.error(f"Error reading application page after {after}: {str(e)}")
+                raise
+            if page:
+                yield page
+            if len(page) < page_size:
+                break
+            after = self.page_cursor(page)
+    
+    @staticmethod
+    def projection(shape: str, table: str) -> str:
+        """Column list for a table in a named PROJECTIONS shape"""
+        try:
+            return PROJECTIONS[shape][table]
+        except KeyError:
+            raise ValueError(f"No {table} columns in projection '{shape}'")
+    
+    def _application_columns(self, shape: str, include_history: bool, inner: bool) -> str:
+        """Embedded select for applications -> jobs -> companies (and status_history) in a shape"""
+        jobs = "jobs!inner" if inner else "jobs"
+        columns = (
+            f"{self.projection(shape, 'applications')}, "
+            f"{jobs}({self.projection(shape, 'jobs')}, companies({self.projection(shape, 'companies')}))"
+        )
+        if include_history:
+            columns += f", status_history({self.projection(shape, 'status_history')})"
+        return columns
+    
+    @staticmethod
+    def _filter_key(status_filter: str, search: str, statuses: List[str], job_types: List[str]) -> tuple:
+        """Normalize filter arguments into a hashable (search, statuses, job_types) tuple"""
+        statuses = set(statuses or [])
+        if status_filter and status_filter != "All":
+            statuses.add(status_filter)
+        search = search.strip().lower() if search else ""
+        return (search, tuple(sorted(statuses)), tuple(sorted(job_types or [])))
+    
+    @staticmethod
+    def _filters_jobs(filters: tuple) -> bool:
+        search, _, job_types = filters
+        return bool(search or job_types)
+    
+    def _filter_applications(self, query, user_id: int, filters: tuple):
+        search, statuses, job_types = filters
+        if user_id is not None:
+            query = query.eq("user_id", user_id)
+        if statuses:
+            query = query.in_("current_status", statuses)
+        if job_types:
+            query = query.in_("jobs.job_type", job_types)
+        if search:
+            # jobs.search_text is lower(company name || ' ' || title), kept current by triggers
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_").replace("*", "")
+            query = query.ilike("jobs.search_text", f"%{escaped}%")
+        return query
+    
+    def _fetch_applications(self, user_id: int, filters: tuple, include_history: bool,
+                            history_limit: int, limit: int, after: tuple, shape: str) -> List[Application]:
+        # !inner turns the embed into a join so filters on jobs remove non-matching applications
+        columns = self._application_columns(shape, include_history, self._filters_jobs(filters))
+        
+        query = self._filter_applications(self.client.table("applications").select(columns), user_id, filters)
+        if after is not None:
+            after_date, after_id = after
+            query = query.or_(
+                f"status_changed_date.lt.{after_date},"
+                f"and(status_changed_date.eq.{after_date},application_id.lt.{int(after_id)})"
+            )
+        if include_history:
+            query = query.order("status_date", desc=True, foreign_table="status_history").order(
+                "history_id", desc=True, foreign_table="status_history"
+            )
+            if history_limit is not None:
+                query = query.limit(history_limit, foreign_table="status_history")
+        query = query.order("status_changed_date", desc=True).order("application_id", desc=True)
+        if limit is not None:
+            query = query.limit(limit)
+        return [Application.from_row(row) for row in query.execute().data]
+    
+    def invalidate_applications(self, user_id: int = None):
+        """Drop cached application lists for a user, or for everyone when user_id is unknown"""
+        if user_id is None:
+            removed = self._app_cache.invalidate(lambda key: key[0] == "applications")
+        else:
+            removed = self._app_cache.invalidate(lambda key: key[0] == "applications" and key[1] in (user_id, None))
+        logger.debug(f"Invalidated {removed} cached application queries for user {user_id}")
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters for the application list cache"""
+        return self._app_cache.stats()
+    
+    def log_cache_stats(self) -> bool:
+        """Log the application cache counters, at most once per APPLICATION_CACHE_STATS_INTERVAL"""
+        with self._stats_lock:
+            if time.monotonic() - self._last_stats_log < APPLICATION_CACHE_STATS_INTERVAL:
+                return False
+            self._last_stats_log = time.monotonic()
+        stats = self.cache_stats()
+        logger.info(
+            f"Application cache: {stats['hits']} hits, {stats['misses']} misses (hit rate {stats['hit_rate']}), "
+            f"{stats['evictions']} evictions, {stats['size']}/{stats['maxsize']} entries"
+        )
+        return True
+    
+    def update_application_status(self, application_id: int, new_status: str, status_date, notes: str = None,
+                                  user_id: int = None) -> bool:
         """Update application status and log the change"""
         try:
             if new_status not in VALID_STATUSES:
@@ -171,33 +558,60 @@ class SupabaseClient:
             
             self.log_status_change(application_id, new_status, status_date, notes)
             
+            self.invalidate_applications(user_id)
             logger.info(f"Updated application {application_id} to status {new_status}")
             return True
         except Exception as e:
             logger.error(f"Error updating application status: {str(e)}")
             return False
     
-    def delete_application(self, application_id: int) -> bool:
+    def delete_application(self, application_id: int, user_id: int = None) -> bool:
         """Delete application and cascade to status_history"""
         try:
             self.client.table("applications").delete().eq("application_id", application_id).execute()
             
+            self.invalidate_applications(user_id)
             logger.info(f"Deleted application {application_id}")
             return True
         except Exception as e:
             logger.error(f"Error deleting application: {str(e)}")
             return False
     
-    def calculate_ghosted_days(self, status_changed_date_str: str) -> int:
+    def calculate_ghosted_days(self, status_changed_date) -> int:
         """Calculate days since status was last changed"""
         try:
-            status_changed_date = datetime.fromisoformat(status_changed_date_str.replace('Z', '+00:00'))
-            days_passed = (datetime.now(status_changed_date.tzinfo) - status_changed_date).days
-            return days_passed
+            return (date.today() - parse_date(status_changed_date)).days
         except Exception as e:
             logger.error(f"Error calculating ghosted days: {str(e)}")
             return 0
     
+    def get_stale_applications(self, user_id: int, limit: int = STALE_APPLICATIONS_LIMIT) -> List[Application]:
+        """Pending (Applied or Interview) applications that have waited longest, from the stale_applications view"""
+        try:
+            def load():
+                result = self.client.table("stale_applications").select(
+                    "application_id, current_status, status_changed_date, title, company_name, logo_url"
+                ).eq("user_id", user_id).order("status_changed_date").order("application_id").limit(limit).execute()
+                # The view is already flat, so build records directly rather than through from_row
+                return [
+                    Application(
+                        application_id=row["application_id"],
+                        current_status=row["current_status"],
+                        status_changed_date=parse_date(row["status_changed_date"]),
+                        user_id=user_id,
+                        title=row["title"],
+                        company_name=row["company_name"],
+                        logo_url=row["logo_url"]
+                    )
+                    for row in result.data
+                ]
+            
+            # Keyed like the application lists so every write invalidates it too
+            return self._app_cache.get_or_load(("applications", user_id, "stale", limit), load)
+        except Exception as e:
+            logger.error(f"Error fetching stale applications: {str(e)}")
+            return []
+    
     
     def log_status_change(self, application_id: int, status: str, status_date, notes: str = None):
         """Log a status change in history"""
@@ -213,20 +627,48 @@ class SupabaseClient:
         except Exception as e:
             logger.error(f"Error logging status change: {str(e)}")
     
-    def get_status_history(self, application_id: int) -> List[Dict]:
+    def get_status_history_bulk(self, application_ids: List[int], shape: str = "dashboard") -> Dict[int, List[StatusEvent]]:
+        """Get status history for many applications, grouped by application_id"""
+        history_map = {app_id: [] for app_id in application_ids}
+        ids = list(history_map)
+        try:
+            columns = self.projection(shape, "status_history")
+            for start in range(0, len(ids), STATUS_HISTORY_CHUNK_SIZE):
+                chunk = ids[start:start + STATUS_HISTORY_CHUNK_SIZE]
+                offset = 0
+                while True:
+                    result = self.client.table("status_history").select(columns).in_(
+                        "application_id", chunk
+                    ).order("status_date", desc=True).order("history_id", desc=True).range(
+                        offset, offset + STATUS_HISTORY_PAGE_SIZE - 1
+                    ).execute()
+                    
+                    for row in result.data:
+                        history_map.setdefault(row["application_id"], []).append(StatusEvent.from_row(row))
+                    
+                    if len(result.data) < STATUS_HISTORY_PAGE_SIZE:
+                        break
+                    offset += STATUS_HISTORY_PAGE_SIZE
+            
+            return history_map
+        except Exception as e:
+            logger.error(f"Error fetching bulk status history: {str(e)}")
+            return {app_id: [] for app_id in ids}
+    
+    def get_status_history(self, application_id: int) -> List[StatusEvent]:
         """Get status history for an application"""
         try:
-            result = self.client.table("status_history").select("*").eq(
+            result = self.client.table("status_history").select(self.projection("card", "status_history")).eq(
                 "application_id", application_id
             ).order("status_date", desc=True).execute()
             
-            return result.data
+            return [StatusEvent.from_row(row) for row in result.data]
         except Exception as e:
             logger.error(f"Error fetching status history: {str(e)}")
             return []
     
     
-    def get_application_stats(self, user_id: int = None, applications: List[Dict] = None) -> Dict:
+    def get_application_stats(self, user_id: int = None, applications: List[Application] = None) -> Dict:
         """Get application summary statistics"""
         try:
             if applications is None:
@@ -234,25 +676,26 @@ class SupabaseClient:
                 if user_id is not None:
                     query = query.eq("user_id", user_id)
                 result = query.execute()
-                applications = result.data
+                statuses = [row["current_status"] for row in result.data]
+            else:
+                statuses = [app.current_status for app in applications]
             
             stats = {
-                "total": len(applications),
+                "total": len(statuses),
                 "by_status": {}
             }
             for status in VALID_STATUSES:
-                count = sum(1 for app in applications if app["current_status"] == status)
-                stats["by_status"][status] = count
+                stats["by_status"][status] = statuses.count(status)
             return stats
         except Exception as e:
             logger.error(f"Error fetching application stats: {str(e)}")
             return {"total": 0, "by_status": {}}
     
-    def get_performance_metrics(self, user_id: int = None, applications: List[Dict] = None, status_history_map: Dict = None) -> Dict:
+    def get_performance_metrics(self, user_id: int = None, applications: List[Application] = None, status_history_map: Dict = None) -> Dict:
         """Calculate response time and longest waiting period"""
         try:
             if applications is None:
-                applications = self.get_all_applications(user_id)
+                applications = self.get_all_applications(user_id, shape="dashboard")
             
             if not applications:
                 return {"response_time": 0.0, "longest_waiting": 0}
@@ -260,25 +703,25 @@ class SupabaseClient:
             response_times = []
             max_waiting_days = 0
             
+            if status_history_map is None:
+                status_history_map = {}
+            missing_ids = [a.application_id for a in applications if a.application_id not in status_history_map]
+            if missing_ids:
+                status_history_map = {**status_history_map, **self.get_status_history_bulk(missing_ids)}
+            
             for app in applications:
-                current_status = app['current_status']
-                app_id = app['application_id']
+                current_status = app.current_status
+                status_history = status_history_map.get(app.application_id, [])
                 
-                if status_history_map and app_id in status_history_map:
-                    status_history = status_history_map[app_id]
-                else:
-                    status_history = self.get_status_history(app_id)
-                
-                applied_status = next((s for s in status_history if s['status'] == 'Applied'), None)
-                if applied_status:
-                    applied_date = datetime.fromisoformat(applied_status['status_date'].replace('Z', '+00:00'))
+                applied_status = next((s for s in status_history if s.status == 'Applied'), None)
+                if applied_status and applied_status.status_date:
+                    applied_date = applied_status.status_date
                     
                     if current_status == 'Applied':
-                        days_waiting = (datetime.now(applied_date.tzinfo) - applied_date).days
+                        days_waiting = (date.today() - applied_date).days
                         max_waiting_days = max(max_waiting_days, days_waiting)
-                    elif current_status in ['Interview', 'Offer', 'Rejected']:
-                        current_date = datetime.fromisoformat(app['status_changed_date'].replace('Z', '+00:00'))
-                        response_time_days = (current_date - applied_date).days
+                    elif current_status in ['Interview', 'Offer', 'Rejected'] and app.status_changed_date:
+                        response_time_days = (app.status_changed_date - applied_date).days
                         response_times.append(response_time_days)
             
             avg_response_time = sum(response_times) / len(response_times) if response_times else 0
@@ -291,11 +734,11 @@ class SupabaseClient:
             logger.error(f"Error calculating performance metrics: {str(e)}")
             return {"response_time": 0.0, "longest_waiting": 0}
     
-    def get_volume_metrics(self, user_id: int = None, applications: List[Dict] = None) -> Dict:
+    def get_volume_metrics(self, user_id: int = None, applications: List[Application] = None) -> Dict:
         """Calculate application volume and submission rates"""
         try:
             if applications is None:
-                applications = self.get_all_applications(user_id)
+                applications = self.get_all_applications(user_id, shape="dashboard")
             
             if not applications:
                 return {
@@ -310,42 +753,31 @@ class SupabaseClient:
             
             total_apps = len(applications)
             
+            dates = [app.status_changed_date for app in applications if app.status_changed_date is not None]
+            
             day_counts = {}
-            for app in applications:
-                try:
-                    date = datetime.fromisoformat(app['status_changed_date'].replace('Z', '+00:00'))
-                    day_name = date.strftime('%A')
-                    day_counts[day_name] = day_counts.get(day_name, 0) + 1
-                except:
-                    continue
+            for changed_date in dates:
+                day_name = WEEKDAYS[changed_date.weekday()]
+                day_counts[day_name] = day_counts.get(day_name, 0) + 1
             
             most_active_day = max(day_counts, key=day_counts.get) if day_counts else "N/A"
             most_active_count = day_counts.get(most_active_day, 0) if day_counts else 0
             
-            if applications:
-                dates = []
-                for app in applications:
-                    try:
-                        date = datetime.fromisoformat(app['status_changed_date'].replace('Z', '+00:00'))
-                        dates.append(date)
-                    except:
-                        continue
+            if dates:
+                oldest = min(dates)
+                newest = max(dates)
+                days_span = max(1, (newest - oldest).days + 1)
+                rate_per_day = total_apps / days_span
                 
-                if dates:
-                    oldest = min(dates)
-                    newest = max(dates)
-                    days_span = max(1, (newest - oldest).days + 1)
-                    rate_per_day = total_apps / days_span
-                    
-                    return {
-                        "total_applications": total_apps,
-                        "most_active_day": most_active_day,
-                        "most_active_count": most_active_count,
-                        "rate_per_day": round(rate_per_day, 1),
-                        "rate_per_week": round(rate_per_day * 7, 1),
-                        "rate_per_month": round(rate_per_day * 30, 1),
-                        "rate_per_year": round(rate_per_day * 365, 1)
-                    }
+                return {
+                    "total_applications": total_apps,
+                    "most_active_day": most_active_day,
+                    "most_active_count": most_active_count,
+                    "rate_per_day": round(rate_per_day, 1),
+                    "rate_per_week": round(rate_per_day * 7, 1),
+                    "rate_per_month": round(rate_per_day * 30, 1),
+                    "rate_per_year": round(rate_per_day * 365, 1)
+                }
             
             return {
                 "total_applications": total_apps,
@@ -361,11 +793,62 @@ class SupabaseClient:
             return {"total_applications": 0, "most_active_day": "N/A", "most_active_count": 0,
                     "rate_per_day": 0, "rate_per_week": 0, "rate_per_month": 0, "rate_per_year": 0}
     
-    def get_conversion_funnel(self, user_id: int = None, applications: List[Dict] = None) -> Dict:
+    def get_daily_activity(self, user_id: int, since: date = None, statuses: List[str] = None) -> List[Dict]:
+        """Per-day status history counts from the daily_activity rollup, oldest day first"""
+        try:
+            def load():
+                rows = []
+                offset = 0
+                while True:
+                    query = self.client.table("daily_activity").select("day, status, event_count").eq("user_id", user_id)
+                    if since is not None:
+                        query = query.gte("day", since.isoformat())
+                    if statuses:
+                        query = query.in_("status", statuses)
+                    result = query.order("day").order("status").range(
+                        offset, offset + DAILY_ACTIVITY_PAGE_SIZE - 1
+                    ).execute()
+                    rows.extend(
+                        {"day": parse_date(row["day"]), "status": row["status"], "count": row["event_count"]}
+                        for row in result.data
+                    )
+                    if len(result.data) < DAILY_ACTIVITY_PAGE_SIZE:
+                        break
+                    offset += DAILY_ACTIVITY_PAGE_SIZE
+                return rows
+            
+            key = ("applications", user_id, "activity", since, tuple(sorted(statuses or [])))
+            return self._app_cache.get_or_load(key, load)
+        except Exception as e:
+            logger.error(f"Error fetching daily activity: {str(e)}")
+            return []
+    
+    def backfill_daily_activity(self, user_id: int = None) -> Optional[int]:
+        """Rebuild the daily_activity rollup from status_history, returns the number of rows written"""
+        try:
+            result = self.client.rpc("backfill_daily_activity", {"p_user_id": user_id}).execute()
+            self.invalidate_applications(user_id)
+            logger.info(f"Backfilled {result.data} daily_activity rows")
+            return result.data
+        except Exception as e:
+            logger.error(f"Error in backfill_daily_activity: {str(e)}")
+            return None
+    
+    def backfill_job_search_text(self) -> Optional[int]:
+        """Fill jobs.search_text for jobs written before its trigger existed, returns the number updated"""
+        try:
+            result = self.client.rpc("backfill_job_search_text", {}).execute()
+            logger.info(f"Backfilled search_text on {result.data} jobs")
+            return result.data
+        except Exception as e:
+            logger.error(f"Error in backfill_job_search_text: {str(e)}")
+            return None
+    
+    def get_conversion_funnel(self, user_id: int = None, applications: List[Application] = None) -> Dict:
         """Get conversion funnel percentages"""
         try:
             if applications is None:
-                applications = self.get_all_applications(user_id)
+                applications = self.get_all_applications(user_id, shape="dashboard")
             
             if not applications:
                 return {
@@ -375,7 +858,7 @@ class SupabaseClient:
             
             status_counts = {}
             for app in applications:
-                status = app.get('current_status')
+                status = app.current_status
                 status_counts[status] = status_counts.get(status, 0) + 1
             
             applied_count = sum(status_counts.get(s, 0) for s in ['Applied', 'Interview', 'Offer', 'Rejected'])
@@ -395,107 +878,210 @@ class SupabaseClient:
             logger.error(f"Error calculating conversion funnel: {str(e)}")
             return {"applied_to_interview": 0.0, "interview_to_offer": 0.0}
     
-    def get_sankey_data(self, user_id: int = None, applications: List[Dict] = None, status_history_map: Dict = None) -> Dict:
+    def get_sankey_data(self, user_id: int = None, applications: List[Application] = None, status_history_map: Dict = None) -> Dict:
         """Get data for Sankey diagram showing application flow"""
         try:
             if applications is None:
-                applications = self.get_all_applications(user_id)
-            
-            if not applications:
-                return {
-                    "labels": ["APPLIED (0)", "REJECTED (0)", "GHOSTED (0)", "OFFER (0)", "INTERVIEWING (0)"],
-                    "sources": [],
-                    "targets": [],
-                    "values": [],
-                    "colors": [],
-                    "counts": {"applied": 0, "rejected": 0, "ghosted": 0, "interviewing": 0, "offer": 0}
-                }
-            
-            applied_apps = [a for a in applications if a.get('current_status') != 'Saved']
-            
-            if not applied_apps:
-                return {
-                    "labels": ["APPLIED (0)", "REJECTED (0)", "GHOSTED (0)", "OFFER (0)", "INTERVIEWING (0)"],
-                    "sources": [],
-                    "targets": [],
-                    "values": [],
-                    "colors": [],
-                    "counts": {"applied": 0, "rejected": 0, "ghosted": 0, "interviewing": 0, "offer": 0}
-                }
+                applications = self.get_all_applications(user_id, shape="dashboard")
             
             status_counts = {}
-            for app in applied_apps:
-                status = app.get('current_status')
-                status_counts[status] = status_counts.get(status, 0) + 1
-            
-            rejected_count = status_counts.get('Rejected', 0)
-            applied_current = status_counts.get('Applied', 0)
-            interview_current = status_counts.get('Interview', 0)
-            offer_count = status_counts.get('Offer', 0)
-            
-            total_applied = len(applied_apps)
-            total_interviewed = interview_current + offer_count
-            ghosted_count = applied_current + interview_current
-            
-            labels = [
-                f"APPLIED ({total_applied})",
-                f"REJECTED ({rejected_count})",
-                f"GHOSTED ({ghosted_count})",
-                f"OFFER ({offer_count})",
-                f"INTERVIEWING ({total_interviewed})"
-            ]
-            
-            GHOSTED_COLOR = 'rgba(184, 161, 214, 0.5)'
-            REJECTED_COLOR = 'rgba(255, 107, 107, 0.5)'
-            INTERVIEWING_COLOR = 'rgba(77, 182, 172, 0.5)'
-            OFFER_COLOR = 'rgba(124, 179, 66, 0.5)'
-            
-            sources, targets, values, colors = [], [], [], []
-            
-            if applied_current > 0:
-                sources.append(0)
-                targets.append(2)
-                values.append(applied_current)
-                colors.append(GHOSTED_COLOR)
-            
-            if rejected_count > 0:
-                sources.append(0)
-                targets.append(1)
-                values.append(rejected_count)
-                colors.append(REJECTED_COLOR)
-            
-            if total_interviewed > 0:
-                sources.append(0)
-                targets.append(4)
-                values.append(total_interviewed)
-                colors.append(INTERVIEWING_COLOR)
-            
-            if offer_count > 0:
-                sources.append(4)
-                targets.append(3)
-                values.append(offer_count)
-                colors.append(OFFER_COLOR)
-            
-            if interview_current > 0:
-                sources.append(4)
-                targets.append(2)
-                values.append(interview_current)
-                colors.append(GHOSTED_COLOR)
+            for app in applications:
+                status = app.current_status
+                if status != 'Saved':
+                    status_counts[status] = status_counts.get(status, 0) + 1
             
-            return {
-                "labels": labels,
-                "sources": sources,
-                "targets": targets,
-                "values": values,
-                "colors": colors,
-                "counts": {
-                    "applied": total_applied,
-                    "rejected": rejected_count,
-                    "ghosted": ghosted_count,
-                    "offer": offer_count,
-                    "interviewing": total_interviewed
-                }
-            }
+            return build_sankey_data(status_counts)
         except Exception as e:
             logger.error(f"Error generating Sankey data: {str(e)}")
             return {"labels": [], "sources": [], "targets": [], "values": [], "colors": [], "counts": {}}
+    
+    def get_dashboard_metrics(self, user_id: int = None, applications: List[Application] = None, status_history_map: Dict = None) -> Dict:
+        """Get every dashboard metric from the get_dashboard_aggregates RPC, computing locally as a fallback"""
+        aggregates = None
+        if user_id is not None and applications is None:
+            try:
+                result = self.client.rpc("get_dashboard_aggregates", {"p_user_id": user_id}).execute()
+                aggregates = result.data
+            except Exception as e:
+                logger.warning(f"Dashboard aggregates RPC failed, computing locally: {str(e)}")
+        
+        if aggregates is None:
+            if applications is None:
+                applications = self.get_all_applications(user_id, include_history=True, shape="dashboard")
+            if status_history_map is None:
+                status_history_map = {a.application_id: a.status_history for a in applications if a.status_history is not None}
+                missing_ids = [a.application_id for a in applications if a.application_id not in status_history_map]
+                if missing_ids:
+                    status_history_map.update(self.get_status_history_bulk(missing_ids))
+            # pandas is only needed on this fallback path, so don't pay its import cost up front
+            from .analytics import compute_dashboard_aggregates
+            aggregates = compute_dashboard_aggregates(applications, status_history_map)
+        
+        return build_dashboard_metrics(aggregates)
+    
+    def reconcile_user_metrics(self, user_id: int = None) -> Optional[int]:
+        """Recompute trigger-maintained user_metrics from scratch, returns the number of drifted rows fixed"""
+        try:
+            result = self.client.rpc("reconcile_user_metrics", {"p_user_id": user_id}).execute()
+            fixed = result.data
+            if fixed:
+                logger.warning(f"Reconciled {fixed} drifted user_metrics rows")
+            return fixed
+        except Exception as e:
+            logger.error(f"Error in reconcile_user_metrics: {str(e)}")
+            return None
+
+
+# No on_release close: a replaced client may still be mid-request in another session's run or in a
+# deferred download callable, so its pool is left to be garbage collected once nothing references it
+@st.cache_resource(show_spinner=False, validate=lambda db: db.is_healthy())
+def get_db_client() -> SupabaseClient:
+    """Process-wide SupabaseClient shared by all sessions; rebuilt if a health check fails"""
+    return SupabaseClient()
+
+
+def build_dashboard_metrics(aggregates: Dict) -> Dict:
+    """Turn raw dashboard aggregates into the stats, performance, volume, conversion and Sankey dicts"""
+    by_status = {status: aggregates['by_status'].get(status, 0) for status in VALID_STATUSES}
+    applied_total = sum(count for status, count in by_status.items() if status != 'Saved')
+    ghosted_count = by_status['Applied'] + by_status['Interview']
+    interviewed = by_status['Interview'] + by_status['Offer']
+    
+    stats = {"total": sum(by_status.values()), "by_status": by_status}
+    ghost_rate = round((ghosted_count / applied_total * 100), 1) if applied_total > 0 else 0.0
+    
+    if applied_total == 0:
+        return {
+            "stats": stats,
+            "ghost_rate": ghost_rate,
+            "performance": {"response_time": 0.0, "longest_waiting": 0},
+            "volume": {
+                "total_applications": 0,
+                "most_active_day": "N/A",
+                "most_active_count": 0,
+                "rate_per_day": 0,
+                "rate_per_week": 0,
+                "rate_per_month": 0,
+                "rate_per_year": 0
+            },
+            "conversion": {"applied_to_interview": 0.0, "interview_to_offer": 0.0},
+            "sankey": build_sankey_data(by_status)
+        }
+    
+    response_count = aggregates['response_days_count']
+    avg_response_time = aggregates['response_days_sum'] / response_count if response_count else 0
+    
+    longest_waiting = 0
+    oldest_pending = parse_date(aggregates.get('oldest_pending_applied'))
+    if oldest_pending is not None:
+        longest_waiting = max(0, (date.today() - oldest_pending).days)
+    
+    weekday_counts = aggregates['weekday_counts']
+    most_active_day = max(
+        (day for day in WEEKDAYS if day in weekday_counts),
+        key=lambda day: weekday_counts[day],
+        default="N/A"
+    )
+    most_active_count = weekday_counts.get(most_active_day, 0)
+    
+    rate_per_day = 0
+    first_date = parse_date(aggregates.get('first_date'))
+    last_date = parse_date(aggregates.get('last_date'))
+    if first_date is not None and last_date is not None:
+        days_span = max(1, (last_date - first_date).days + 1)
+        rate_per_day = applied_total / days_span
+    
+    return {
+        "stats": stats,
+        "ghost_rate": ghost_rate,
+        "performance": {
+            "response_time": round(avg_response_time, 1),
+            "longest_waiting": longest_waiting
+        },
+        "volume": {
+            "total_applications": applied_total,
+            "most_active_day": most_active_day,
+            "most_active_count": most_active_count,
+            "rate_per_day": round(rate_per_day, 1),
+            "rate_per_week": round(rate_per_day * 7, 1),
+            "rate_per_month": round(rate_per_day * 30, 1),
+            "rate_per_year": round(rate_per_day * 365, 1)
+        },
+        "conversion": {
+            "applied_to_interview": round(interviewed / applied_total * 100, 0),
+            "interview_to_offer": round((by_status['Offer'] / interviewed * 100) if interviewed > 0 else 0.0, 0)
+        },
+        "sankey": build_sankey_data(by_status)
+    }
+
+
+def build_sankey_data(status_counts: Dict) -> Dict:
+    """Build Sankey nodes and links from per-status counts of non-Saved applications"""
+    rejected_count = status_counts.get('Rejected', 0)
+    applied_current = status_counts.get('Applied', 0)
+    interview_current = status_counts.get('Interview', 0)
+    offer_count = status_counts.get('Offer', 0)
+    
+    total_applied = applied_current + interview_current + offer_count + rejected_count
+    total_interviewed = interview_current + offer_count
+    ghosted_count = applied_current + interview_current
+    
+    labels = [
+        f"APPLIED ({total_applied})",
+        f"REJECTED ({rejected_count})",
+        f"GHOSTED ({ghosted_count})",
+        f"OFFER ({offer_count})",
+        f"INTERVIEWING ({total_interviewed})"
+    ]
+    
+    GHOSTED_COLOR = 'rgba(184, 161, 214, 0.5)'
+    REJECTED_COLOR = 'rgba(255, 107, 107, 0.5)'
+    INTERVIEWING_COLOR = 'rgba(77, 182, 172, 0.5)'
+    OFFER_COLOR = 'rgba(124, 179, 66, 0.5)'
+    
+    sources, targets, values, colors = [], [], [], []
+    
+    if applied_current > 0:
+        sources.append(0)
+        targets.append(2)
+        values.append(applied_current)
+        colors.append(GHOSTED_COLOR)
+    
+    if rejected_count > 0:
+        sources.append(0)
+        targets.append(1)
+        values.append(rejected_count)
+        colors.append(REJECTED_COLOR)
+    
+    if total_interviewed > 0:
+        sources.append(0)
+        targets.append(4)
+        values.append(total_interviewed)
+        colors.append(INTERVIEWING_COLOR)
+    
+    if offer_count > 0:
+        sources.append(4)
+        targets.append(3)
+        values.append(offer_count)
+        colors.append(OFFER_COLOR)
+    
+    if interview_current > 0:
+        sources.append(4)
+        targets.append(2)
+        values.append(interview_current)
+        colors.append(GHOSTED_COLOR)
+    
+    return {
+        "labels": labels,
+        "sources": sources,
+        "targets": targets,
+        "values": values,
+        "colors": colors,
+        "counts": {
+            "applied": total_applied,
+            "rejected": rejected_count,
+            "ghosted": ghosted_count,
+            "offer": offer_count,
+            "interviewing": total_interviewed
+        }
+    }
@@ -0,0 +1,112 @@
+"""
+Export of applications to CSV, JSON Lines or Parquet
+Reads one keyset page at a time, so only one page of records is held while the file is written
+"""
+
+import csv
+import io
+import json
+import logging
+from typing import BinaryIO, Dict, Iterable, Iterator, List
+from .constants import EXPORT_FORMATS
+from .records import Application
+
+logger = logging.getLogger(__name__)
+
+# Headers match the importer's aliases, so an export can be imported again
+EXPORT_COLUMNS = [
+    "Company", "Title", "Status", "Status Date", "Industry", "Company Location",
+    "Job Type", "Job Location", "Posted Date", "Notes"
+]
+HISTORY_COLUMN = "Status History"
+
+
+def export_row(app: Application, include_history: bool) -> Dict:
+    """Flatten one application into an export row, dates kept as date objects"""
+    row = {
+        "Company": app.company_name,
+        "Title": app.title,
+        "Status": app.current_status,
+        "Status Date": app.status_changed_date,
+        "Industry": app.industry,
+        "Company Location": app.company_location,
+        "Job Type": app.job_type,
+        "Job Location": app.job_location,
+        "Posted Date": app.posted_date,
+        "Notes": app.notes
+    }
+    if include_history:
+        # Oldest first, the order the stages happened in
+        row[HISTORY_COLUMN] = [
+            {"status": event.status, "date": event.status_date, "notes": event.notes}
+            for event in reversed(app.status_history or [])
+        ]
+    return row
+
+
+def _format_history(history: List[Dict]) -> str:
+    return "; ".join(f"{event['status']} {event['date'] or ''}".strip() for event in history)
+
+
+def _write_csv(pages: Iterable[List[Dict]], out: BinaryIO, columns: List[str]):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.DictWriter(text, fieldnames=columns)
+    writer.writeheader()
+    for rows in pages:
+        for row in rows:
+            if HISTORY_COLUMN in row:
+                row[HISTORY_COLUMN] = _format_history(row[HISTORY_COLUMN])
+            writer.writerow(row)
+    text.flush()
+    text.detach()
+
+
+def _json_default(value):
+    return value.isoformat()
+
+
+def _write_jsonl(pages: Iterable[List[Dict]], out: BinaryIO, columns: List[str]):
+    for rows in pages:
+        out.write("".join(json.dumps(row, default=_json_default) + "\n" for row in rows).encode("utf-8"))
+
+
+def _write_parquet(pages: Iterable[List[Dict]], out: BinaryIO, columns: List[str]):
+    # pyarrow ships with Streamlit, but only this format needs it
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"Status Date": pa.date32(), "Posted Date": pa.date32()}
+    history_type = pa.list_(pa.struct([("status", pa.string()), ("date", pa.date32()), ("notes", pa.string())]))
+    schema = pa.schema([
+        (column, history_type if column == HISTORY_COLUMN else types.get(column, pa.string()))
+        for column in columns
+    ])
+    # One row group per page keeps only a page of rows in Arrow buffers at a time
+    with pq.ParquetWriter(out, schema) as writer:
+        for rows in pages:
+            writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+
+
+WRITERS = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+
+
+def export_pages(db, user_id: int, include_history: bool = False) -> Iterator[List[Dict]]:
+    """Yield export rows for every application of a user, one Supabase page at a time"""
+    for page in db.iter_application_pages(user_id, shape="export", include_history=include_history):
+        yield [export_row(app, include_history) for app in page]
+
+
+def build_export(db, user_id: int, file_format: str, include_history: bool = False) -> bytes:
+    """Write a user's applications in one of EXPORT_FORMATS and return the file contents"""
+    extension, _ = EXPORT_FORMATS[file_format]
+    columns = EXPORT_COLUMNS + [HISTORY_COLUMN] if include_history else EXPORT_COLUMNS
+    # st.download_button keeps the finished file in memory anyway, so there is nothing to gain from spooling to disk
+    out = io.BytesIO()
+    try:
+        WRITERS[extension](export_pages(db, user_id, include_history), out, columns)
+    except Exception as e:
+        logger.error(f"Export failed for user {user_id}: {str(e)}")
+        raise
+    data = out.getvalue()
+    logger.info(f"Built {file_format} export for user {user_id}: {len(data)} bytes")
+    return data
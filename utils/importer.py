@@ -0,0 +1,285 @@
+"""
+Bulk import of applications from CSV or JSON files
+Streams rows in batches so large spreadsheets never need to be held in memory at once
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import date
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from dateutil import parser as date_parser
+from .constants import VALID_STATUSES, JOB_TYPES, IMPORT_BATCH_SIZE, IMPORT_JSON_READ_SIZE, IMPORT_JSON_MAX_ROW_CHARS
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ["csv", "json", "jsonl"]
+
+# Accepted header spellings, normalized to lowercase with underscores
+COLUMN_ALIASES = {
+    "company": "company_name",
+    "company_name": "company_name",
+    "title": "job_title",
+    "job_title": "job_title",
+    "role": "job_title",
+    "status": "current_status",
+    "current_status": "current_status",
+    "status_date": "status_date",
+    "date": "status_date",
+    "industry": "industry",
+    "location": "company_location",
+    "company_location": "company_location",
+    "job_type": "job_type",
+    "type": "job_type",
+    "job_location": "job_location",
+    "posted_date": "posted_date",
+    "job_posted_date": "posted_date",
+    "notes": "notes",
+    "logo_url": "logo_url",
+}
+
+# Column sizes from database_setup.sql, checked up front so one bad row can't fail a whole batch
+MAX_LENGTHS = {
+    "company_name": 200,
+    "job_title": 150,
+    "industry": 100,
+    "company_location": 100,
+    "job_location": 100,
+    "logo_url": 500,
+}
+
+
+class _JSONStream:
+    """Text read from a file chunk by chunk, keeping only what has not been decoded yet"""
+
+    def __init__(self, text):
+        self.text = text
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read one more chunk, returns False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.text.read(IMPORT_JSON_READ_SIZE)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return not self.eof
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it, or "" at end of file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def decode(self, decoder: json.JSONDecoder):
+        """Decode the next JSON value, reading more text until it is complete"""
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, self.pos)
+                # A number or literal ending exactly at the buffer edge may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if len(self.buffer) - self.pos > IMPORT_JSON_MAX_ROW_CHARS:
+                raise ValueError(f"JSON row exceeds {IMPORT_JSON_MAX_ROW_CHARS} characters")
+            self.fill()
+
+
+def _read_json(text) -> Iterator:
+    """Yield the elements of a top-level JSON array one at a time, or a lone top-level object"""
+    stream, decoder = _JSONStream(text), json.JSONDecoder()
+    first = stream.peek()
+    if first != "[":
+        if first:
+            yield stream.decode(decoder)
+        if stream.peek():
+            raise ValueError("Unexpected data after the JSON value")
+        return
+
+    stream.pos += 1
+    if stream.peek() == "]":
+        stream.pos += 1
+    else:
+        while True:
+            yield stream.decode(decoder)
+            separator = stream.peek()
+            stream.pos += 1
+            if separator == "]":
+                break
+            if separator != ",":
+                raise ValueError("Expected ',' or ']' between JSON array elements")
+            stream.peek()
+    if stream.peek():
+        raise ValueError("Unexpected data after the JSON array")
+
+
+def read_rows(file, file_format: str) -> Iterator[Dict]:
+    """Yield raw row dicts from an uploaded CSV, JSON array or JSON Lines file"""
+    if file_format == "csv":
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        yield from csv.DictReader(text)
+    elif file_format == "jsonl":
+        text = io.TextIOWrapper(file, encoding="utf-8-sig")
+        for line in text:
+            if line.strip():
+                yield json.loads(line)
+    elif file_format == "json":
+        # Decoded element by element, so a large array is never held in memory at once
+        yield from _read_json(io.TextIOWrapper(file, encoding="utf-8-sig"))
+    else:
+        raise ValueError(f"Unsupported import format: {file_format}")
+
+
+def _normalize_keys(row: Dict) -> Dict:
+    normalized = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        column = COLUMN_ALIASES.get(str(key).strip().lower().replace(" ", "_"))
+        if column:
+            normalized[column] = value.strip() if isinstance(value, str) else value
+    return normalized
+
+
+def _parse_date(value) -> Optional[date]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, date):
+        return value
+    return date_parser.parse(str(value)).date()
+
+
+def parse_row(row: Dict) -> Dict:
+    """Validate one raw row and return a clean record, raises ValueError describing the first problem"""
+    row = _normalize_keys(row)
+
+    if not row.get("company_name"):
+        raise ValueError("Company name is required")
+    if not row.get("job_title"):
+        raise ValueError("Job title is required")
+    for column, max_length in MAX_LENGTHS.items():
+        if row.get(column) and len(str(row[column])) > max_length:
+            raise ValueError(f"{column} exceeds {max_length} characters")
+
+    status = row.get("current_status") or "Applied"
+    status = next((s for s in VALID_STATUSES if s.lower() == str(status).lower()), None)
+    if status is None:
+        raise ValueError(f"Invalid status: {row.get('current_status')}")
+
+    job_type = row.get("job_type") or None
+    if job_type:
+        job_type = next((t for t in JOB_TYPES if t.lower() == str(job_type).lower()), None)
+        if job_type is None:
+            raise ValueError(f"Invalid job type: {row.get('job_type')}")
+
+    try:
+        status_date = _parse_date(row.get("status_date")) or date.today()
+        posted_date = _parse_date(row.get("posted_date"))
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid date: {str(e)}")
+    if posted_date and posted_date > status_date:
+        raise ValueError("Job posted date cannot be after the application date")
+
+    return {
+        "company_name": row["company_name"],
+        "industry": row.get("industry") or None,
+        "company_location": row.get("company_location") or None,
+        "logo_url": row.get("logo_url") or None,
+        "job_title": row["job_title"],
+        "job_type": job_type,
+        "job_location": row.get("job_location") or None,
+        "posted_date": posted_date.isoformat() if posted_date else None,
+        "status_date": status_date.isoformat(),
+        "current_status": status,
+        "notes": row.get("notes") or None,
+    }
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_applications(db, user_id: int, file, file_format: str, batch_size: int = IMPORT_BATCH_SIZE,
+                        on_progress: Callable[[int, int], None] = None) -> Dict:
+    """Import applications for a user in batches, returns counts and per-row errors"""
+    company_ids = {}
+    job_ids = {}
+    processed = 0
+    imported = 0
+    errors = []
+
+    # Row numbers are 1-based data rows, matching what users see below the header in a spreadsheet
+    for batch in _batches(enumerate(read_rows(file, file_format), start=1), batch_size):
+        records = []
+        for row_number, raw in batch:
+            try:
+                records.append((row_number, parse_row(raw)))
+            except (ValueError, AttributeError) as e:
+                errors.append({"row": row_number, "error": str(e)})
+        processed += len(batch)
+
+        new_companies = {}
+        for _, record in records:
+            name = record["company_name"]
+            if name not in company_ids and name not in new_companies:
+                company = {"name": name}
+                for column, field in (("industry", "industry"), ("location", "company_location"), ("logo_url", "logo_url")):
+                    if record[field]:
+                        company[column] = record[field]
+                new_companies[name] = company
+        if new_companies:
+            company_ids.update(db.get_or_create_companies_bulk(list(new_companies.values())))
+
+        new_jobs = {}
+        for _, record in records:
+            company_id = company_ids.get(record["company_name"])
+            key = (company_id, record["job_title"])
+            if company_id is not None and key not in job_ids and key not in new_jobs:
+                job = {"company_id": company_id, "title": record["job_title"]}
+                for column, field in (("job_type", "job_type"), ("location", "job_location"), ("posted_date", "posted_date")):
+                    if record[field]:
+                        job[column] = record[field]
+                new_jobs[key] = job
+        if new_jobs:
+            job_ids.update(db.get_or_create_jobs_bulk(list(new_jobs.values())))
+
+        pending = []
+        for row_number, record in records:
+            job_id = job_ids.get((company_ids.get(record["company_name"]), record["job_title"]))
+            if job_id is None:
+                errors.append({"row": row_number, "error": "Could not create company or job"})
+                continue
+            pending.append((row_number, {
+                "job_id": job_id,
+                "status_changed_date": record["status_date"],
+                "current_status": record["current_status"],
+                "notes": record["notes"]
+            }))
+
+        if pending:
+            application_ids = db.create_applications_bulk(user_id, [app for _, app in pending])
+            if len(application_ids) == len(pending):
+                imported += len(application_ids)
+            else:
+                errors.extend({"row": row_number, "error": "Database rejected this batch"} for row_number, _ in pending)
+
+        if on_progress:
+            on_progress(processed, imported)
+
+    logger.info(f"Imported {imported} of {processed} rows for user {user_id} ({len(errors)} errors)")
+    return {"processed": processed, "imported": imported, "errors": sorted(errors, key=lambda e: e["row"])}
@@ -0,0 +1,234 @@
+"""
+Company logo cache
+Downloads each logo once, stores a resized thumbnail on disk and serves cards from it
+"""
+
+import hashlib
+import io
+import ipaddress
+import logging
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from PIL import Image
+from .cache import TTLCache
+from .constants import (
+    DEFAULT_COMPANY_LOGO, LOGO_CACHE_DIR, LOGO_CACHE_MAX_BYTES, LOGO_THUMBNAIL_SIZE,
+    LOGO_FETCH_TIMEOUT, LOGO_FETCH_WORKERS, LOGO_FAILURE_TTL, LOGO_URL_LOCK_STRIPES,
+    LOGO_MAX_DOWNLOAD_BYTES, LOGO_MAX_IMAGE_PIXELS, LOGO_MAX_REDIRECTS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BlockedAddressError(Exception):
+    """Raised when a logo URL resolves to an address the server must not connect to"""
+
+
+def is_web_url(url: str) -> bool:
+    """True for absolute http(s) URLs with a host"""
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and bool(parts.hostname)
+
+
+def is_public_address(address: str) -> bool:
+    """True if the server may connect to this IP: not private, loopback, link-local or otherwise reserved"""
+    return ipaddress.ip_address(address.split("%")[0]).is_global
+
+
+def _check_peer(sock, host: str):
+    # Checked on the connected socket, so every redirect hop and any DNS answer is covered before a byte is sent
+    address = sock.getpeername()[0]
+    if not is_public_address(address):
+        sock.close()
+        raise BlockedAddressError(f"{host} resolves to non-public address {address}")
+
+
+class _PublicHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        sock = super()._new_conn()
+        _check_peer(sock, self.host)
+        return sock
+
+
+class _PublicHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        sock = super()._new_conn()
+        _check_peer(sock, self.host)
+        return sock
+
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class PublicOnlyAdapter(HTTPAdapter):
+    """Transport adapter that refuses connections to non-public addresses"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PublicHTTPConnectionPool,
+            "https": _PublicHTTPSConnectionPool
+        }
+
+
+class LogoCache:
+    """Disk cache of logo thumbnails keyed by URL hash, with size-based least-recently-used eviction"""
+
+    def __init__(self, directory: str = LOGO_CACHE_DIR, max_bytes: int = LOGO_CACHE_MAX_BYTES,
+                 thumbnail_size: int = LOGO_THUMBNAIL_SIZE, timeout: float = LOGO_FETCH_TIMEOUT,
+                 workers: int = LOGO_FETCH_WORKERS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.thumbnail_size = thumbnail_size
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        # Environment proxies would make every peer the proxy, defeating the address check
+        self.session.trust_env = False
+        self.session.max_redirects = LOGO_MAX_REDIRECTS
+        adapter = PublicOnlyAdapter()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="logo-fetch")
+        # Hosts that fail or serve something Pillow can't read are retried only after the TTL
+        self._failures = TTLCache(maxsize=1024, ttl=LOGO_FAILURE_TTL)
+        # A fixed set of locks, so the same URL is never fetched twice at once without keeping one per URL forever
+        self._url_locks = [threading.Lock() for _ in range(LOGO_URL_LOCK_STRIPES)]
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def get(self, url: str) -> str:
+        """Local thumbnail path for url, or a web URL for the browser to load if it can't be cached"""
+        # Rows without a logo and rows using the placeholder all share one cached asset
+        url = url or DEFAULT_COMPANY_LOGO
+        # st.image treats anything that isn't a URL as a server-side file path, so never hand one back
+        if not is_web_url(url):
+            logger.warning(f"Ignoring logo that is not an http(s) URL: {url!r}")
+            url = DEFAULT_COMPANY_LOGO
+        path = self._path(url)
+
+        if self._touch(path):
+            return path
+        if self._failures.peek(url):
+            return url
+
+        with self._url_lock(url):
+            if not os.path.exists(path) and not self._download(url, path):
+                self._failures.set(url, True)
+                return url
+        return path
+
+    def prefetch(self, urls: Iterable[str]):
+        """Download any missing logos in parallel so a page of cards doesn't fetch them one by one"""
+        missing = {url or DEFAULT_COMPANY_LOGO for url in urls}
+        missing = [url for url in missing if not os.path.exists(self._path(url))]
+        if missing:
+            list(self._executor.map(self.get, missing))
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.png")
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        return self._url_locks[hash(url) % len(self._url_locks)]
+
+    def _touch(self, path: str) -> bool:
+        """Mark a cached file as recently used, returns False if it isn't cached"""
+        try:
+            os.utime(path)
+            return True
+        except OSError:
+            return False
+
+    def _download(self, url: str, path: str) -> bool:
+        """Fetch, resize and atomically store one logo"""
+        try:
+            image = Image.open(io.BytesIO(self._fetch(url)))
+            # Checked here rather than through Image.MAX_IMAGE_PIXELS, which would change Pillow for the whole process
+            if image.width * image.height > LOGO_MAX_IMAGE_PIXELS:
+                raise ValueError(f"image is {image.width}x{image.height} pixels")
+            image.thumbnail((self.thumbnail_size, self.thumbnail_size))
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    image.save(f, format="PNG", optimize=True)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+
+            self._record_write(os.path.getsize(path))
+            return True
+        except Exception as e:
+            logger.warning(f"Could not cache logo {url}: {str(e)}")
+            return False
+
+    def _fetch(self, url: str) -> bytes:
+        """Download a logo body, refusing anything over LOGO_MAX_DOWNLOAD_BYTES"""
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            declared = response.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > LOGO_MAX_DOWNLOAD_BYTES:
+                raise ValueError(f"response is {declared} bytes")
+
+            # Counted after content decoding, so a compressed body can't expand past the cap either
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body += chunk
+                if len(body) > LOGO_MAX_DOWNLOAD_BYTES:
+                    raise ValueError(f"response exceeds {LOGO_MAX_DOWNLOAD_BYTES} bytes")
+            return bytes(body)
+
+    def _record_write(self, size: int):
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        """(path, size, mtime) for every cached thumbnail"""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".png"):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        """Delete least recently used thumbnails until the cache is back under 90% of its cap"""
+        target = self.max_bytes * 0.9
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+                total -= size
+                evicted += 1
+            except OSError:
+                pass
+        self._total_bytes = total
+        logger.info(f"Evicted {evicted} cached logos, {total} bytes remain")
+
+
+logo_cache = LogoCache()
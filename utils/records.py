@@ -0,0 +1,101 @@
+"""
+Typed application records
+Rows from Supabase are converted once on load, parsing every date a single time
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_date(value: str) -> Optional[date]:
+    try:
+        # Dates and timestamps both start with YYYY-MM-DD in their own offset
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def parse_date(value) -> Optional[date]:
+    """Parse an ISO date or timestamp string from Supabase, returning None if missing or malformed"""
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        return None
+    return _parse_iso_date(value)
+
+
+def format_date(value: Optional[date]) -> str:
+    """Format a date as MM/DD/YY, or an empty string if it is missing"""
+    return value.strftime('%m/%d/%y') if value else ''
+
+
+@dataclass(slots=True)
+class StatusEvent:
+    """One status_history row"""
+    application_id: int
+    status: str
+    status_date: Optional[date]
+    history_id: Optional[int] = None
+    notes: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "StatusEvent":
+        return cls(
+            application_id=row.get("application_id"),
+            status=row["status"],
+            status_date=parse_date(row.get("status_date")),
+            history_id=row.get("history_id"),
+            notes=row.get("notes")
+        )
+
+
+@dataclass(slots=True)
+class Application:
+    """One application with its job and company flattened in"""
+    application_id: int
+    current_status: str
+    status_changed_date: Optional[date]
+    user_id: Optional[int] = None
+    job_id: Optional[int] = None
+    notes: Optional[str] = None
+    title: str = ''
+    job_type: Optional[str] = None
+    job_location: Optional[str] = None
+    posted_date: Optional[date] = None
+    company_name: str = ''
+    industry: Optional[str] = None
+    company_location: Optional[str] = None
+    logo_url: Optional[str] = None
+    status_history: Optional[List[StatusEvent]] = None
+
+    @classmethod
+    def from_row(cls, row: Dict) -> "Application":
+        """Build from an applications row with embedded jobs(companies) and optional status_history"""
+        job = row.get("jobs") or {}
+        company = job.get("companies") or {}
+        history = row.get("status_history")
+        return cls(
+            application_id=row["application_id"],
+            current_status=row["current_status"],
+            status_changed_date=parse_date(row.get("status_changed_date")),
+            user_id=row.get("user_id"),
+            job_id=row.get("job_id"),
+            notes=row.get("notes"),
+            title=job.get("title", ''),
+            job_type=job.get("job_type"),
+            job_location=job.get("location"),
+            posted_date=parse_date(job.get("posted_date")),
+            company_name=company.get("name", ''),
+            industry=company.get("industry"),
+            company_location=company.get("location"),
+            logo_url=company.get("logo_url"),
+            status_history=[StatusEvent.from_row(h) for h in history] if history is not None else None
+        )
+
+    @property
+    def days_since_change(self) -> int:
+        """Days since the current status was set"""
+        return (date.today() - self.status_changed_date).days if self.status_changed_date else 0
@@ -0,0 +1,99 @@
+"""
+Cached HTML fragments
+Timelines and status badges depend only on a few small values, so identical
+ones are rendered once and reused across cards, reruns and sessions
+"""
+
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Tuple
+from .constants import VALID_STATUSES, STATUS_BADGE_STYLES, DEFAULT_BADGE_STYLE, RENDER_CACHE_SIZE
+from .records import format_date
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_timeline_stage(stage_name, is_active, date=None, is_first=False, is_last=False, next_is_active=False, is_rejected=False):
+    """Render a single stage in the application timeline"""
+    if is_rejected:
+        circle_color = "#9e9e9e"
+        line_color_left = "#9e9e9e"
+        line_color_right = "#9e9e9e"
+        shadow = '0 0 0 2px #e0e0e0'
+    else:
+        circle_color = "#00bcd4" if is_active else "#e0e0e0"
+        line_color_left = "#00bcd4" if is_active else "#e0e0e0"
+        line_color_right = "#00bcd4" if next_is_active else "#e0e0e0"
+        shadow = '0 0 0 2px #e0f7fa' if is_active else 'none'
+    
+    left_line = f'<div style="flex: 1; height: 2px; background: {line_color_left}; align-self: center; {"visibility: hidden;" if is_first else ""}" ></div>'
+    right_line = f'<div style="flex: 1; height: 2px; background: {line_color_right}; align-self: center; {"visibility: hidden;" if is_last else ""}" ></div>'
+    
+    html = '<div style="flex: 1; display: flex; flex-direction: column; align-items: center; justify-content: flex-start;">'
+    html += f'<div style="font-size: 13px; color: #000; margin-bottom: 8px; font-weight: 600; white-space: nowrap; height: 15px;">{stage_name}</div>'
+    html += '<div style="display: flex; align-items: center; width: 100%; height: 16px;">'
+    html += left_line
+    html += f'<div style="width: 16px; height: 16px; min-width: 16px; border-radius: 50%; background: {circle_color}; border: 3px solid #fff; box-shadow: {shadow}; flex-shrink: 0;"></div>'
+    html += right_line
+    html += '</div>'
+    html += f'<div style="font-size: 12px; color: #555; margin-top: 6px; white-space: nowrap; height: 14px; font-weight: 600;">{date or ""}</div>'
+    html += '</div>'
+    return html
+
+
+def get_stage_date(stage, current_status, status_dates):
+    """Get the appropriate date for a timeline stage"""
+    if stage == 'Saved':
+        return status_dates.get('Saved', status_dates.get('Applied'))
+    elif stage == 'Applied':
+        return None if current_status == 'Saved' else status_dates.get('Applied')
+    else:
+        return status_dates.get(stage)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render_timeline(status: str, stage_dates: Tuple[date, ...]) -> str:
+    """Timeline HTML for a status and the date of each stage in VALID_STATUSES order"""
+    if status == 'Rejected':
+        stages = VALID_STATUSES
+        current_stage_idx = stages.index(status) if status in stages else 1
+        is_rejected = True
+    else:
+        stages = [s for s in VALID_STATUSES if s != 'Rejected'] + ['_SPACER_']
+        current_stage_idx = stages.index(status) if status in stages else 1
+        is_rejected = False
+    
+    timeline_parts = ['<div style="display: flex; align-items: center; width: 100%; gap: 0;">']
+    
+    for idx, stage in enumerate(stages):
+        if stage == '_SPACER_':
+            timeline_parts.append('<div style="flex: 1; visibility: hidden;"></div>')
+        else:
+            is_last_visible = (idx == len(stages) - 1) or (idx < len(stages) - 1 and stages[idx + 1] == '_SPACER_')
+            timeline_parts.append(render_timeline_stage(
+                stage, 
+                idx <= current_stage_idx,
+                format_date(stage_dates[VALID_STATUSES.index(stage)]),
+                idx == 0,
+                is_last_visible,
+                (idx + 1) <= current_stage_idx,
+                is_rejected
+            ))
+    
+    timeline_parts.append('</div>')
+    return ''.join(timeline_parts)
+
+
+def render_timeline(status: str, status_dates: Dict[str, date]) -> str:
+    """Timeline HTML for an application, reused for every card with the same status and stage dates"""
+    stage_dates = tuple(get_stage_date(stage, status, status_dates) for stage in VALID_STATUSES)
+    return _render_timeline(status, stage_dates)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def status_badge(status: str, label: str = None) -> str:
+    """Colored status pill, label defaults to the status itself"""
+    style = STATUS_BADGE_STYLES.get(status, DEFAULT_BADGE_STYLE)
+    return (
+        f"<span style='{style} padding: 3px 8px; border-radius: 4px; font-size: 0.85em; font-weight: 600;'>"
+        f"{label or status}</span>"
+    )